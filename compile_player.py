@@ -0,0 +1,77 @@
+"""
+CLI for compiling a deterministic player into a move table.
+
+The table is written in the format documented in
+royal_game.modules.policy_table and played by royal_game/players/compiled.py.
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+import click
+
+from royal_game.modules.policy_table import compile_policy
+from royal_game.modules.transitions import all_states, reachable_states
+from royal_game.players.compiled import DEFAULT_TABLE
+
+logging.basicConfig(format="%(levelname)s: %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@click.command()
+@click.argument("player")
+@click.option(
+    "-o", "--output", default=DEFAULT_TABLE, type=click.Path(dir_okay=False, path_type=Path)
+)
+@click.option(
+    "-s",
+    "--root",
+    "roots",
+    multiple=True,
+    type=int,
+    help=(
+        "Compile the states reachable from this seed with white to move. "
+        "May be repeated. Defaults to the initial board."
+    ),
+)
+@click.option(
+    "-a",
+    "--all-states",
+    "all_states_flag",
+    is_flag=True,
+    help="Compile every legal state instead of roots.",
+)
+@click.option(
+    "--symmetric",
+    is_flag=True,
+    help="Only compile white to move, for players that treat both colors alike.",
+)
+@click.option("-j", "--processes", default=None, type=int, help="Number of worker processes.")
+@click.option(
+    "--block-size", default=10_000, type=int, help="Number of states per worker task."
+)
+def main(
+    player: str,
+    output: Path,
+    roots: Iterable[int],
+    all_states_flag: bool,
+    symmetric: bool,
+    processes: Optional[int],
+    block_size: int,
+):
+    """Record the move PLAYER selects in every reachable position and dice roll."""
+    start = time.perf_counter()
+    states = all_states() if all_states_flag else reachable_states(roots or [122138132480])
+    logger.info("Compiling %s over %d states.", player, len(states))
+
+    table = compile_policy(player, states, symmetric, processes, block_size)
+    table.save(output)
+    logger.info(
+        "Wrote %d decisions to %s in %.1f sec.", len(table), output, time.perf_counter() - start
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,27 @@
 """Display board from input seeds."""
 
 import logging
+import sys
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TextIO
 
 import click
+import numpy as np
 
+from royal_game._constants import (
+    black_grid_iter,
+    board_order_iter,
+    public_grid_iter,
+    start_end_grid_iter,
+    white_grid_iter,
+)
 from royal_game._exceptions import BoardError
 from royal_game.modules.board import Board
+from royal_game.modules.grid import Grid, StartEndGrid
+from royal_game.modules.grid_status import GridStatus
+from royal_game.modules.state_space import SeedError, validate_batch
 
 logging.basicConfig(format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
@@ -30,19 +44,223 @@ def process_input(seed: str, decimal: bool) -> Board | None:
         return board
 
 
+# error code of lines that are not a seed in the chosen encoding, after those of SeedError
+UNPARSABLE = max(SeedError) + 1
+
+_ROSETTES = {
+    name: is_rosette
+    for name, is_rosette in chain(white_grid_iter(), black_grid_iter(), public_grid_iter())
+}
+
+
+def _grid_decoders() -> list[tuple[str, int, int, int]]:
+    """Return (name, bit offset, mask, multiplier) to decode each grid of board_order_iter."""
+    decoders = {}
+    for offset, (name, _) in enumerate(chain(white_grid_iter(), black_grid_iter())):
+        # occupied private grids hold the color of their row
+        decoders[name] = (offset, 0b1, 1 if name[0] == "W" else 2)
+    for i, (name, _) in enumerate(public_grid_iter()):
+        decoders[name] = (12 + 2 * i, 0b11, 1)
+    for i, name in enumerate(start_end_grid_iter()):
+        decoders[name] = (28 + 3 * i, 0b111, 1)
+    return [(name, *decoders[name]) for name in board_order_iter()]
+
+
+_GRID_DECODERS = _grid_decoders()
+
+
+@lru_cache(maxsize=None)
+def grid_glyph(name: str, value: int) -> tuple[str, str, str]:
+    """Return the three lines drawn for a grid holding a status or number of pieces."""
+    if name in _ROSETTES:
+        grid = Grid(name, _ROSETTES[name], GridStatus(value))
+    else:
+        grid = StartEndGrid(name, value)
+    top, middle, bottom, _ = str(grid).split("\n")
+    return top, middle, bottom
+
+
+def render_seed(seed: int) -> str:
+    """
+    Draw a board like Board.__repr__ without constructing it.
+
+    The seed must not hold 0b11 in a public grid.
+    """
+    glyphs = [
+        grid_glyph(name, ((seed >> offset) & mask) * multiplier)
+        for name, offset, mask, multiplier in _GRID_DECODERS
+    ]
+    rows = []
+    for start in range(0, 24, 8):
+        top, middle, bottom = zip(*glyphs[start : start + 8])
+        rows.append(f"{' '.join(top)} \n{' '.join(middle)}\n{' '.join(bottom)}\n")
+    return "".join(rows)
+
+
+def parse_chunk(lines: list[str], decimal: bool) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse the non-blank lines of a chunk.
+
+    Return their indices within the chunk, their seeds as uint64 and an
+    error code for each: SeedError.out_of_range for values that do not fit
+    64 bits, UNPARSABLE for lines that are not a seed and 0 otherwise.
+    """
+    indices = np.array([i for i, line in enumerate(lines) if line.strip()], dtype=np.int64)
+    tokens = [lines[i].strip() for i in indices.tolist()]
+    if decimal:
+        try:
+            values = np.array(tokens).astype(np.int64) if tokens else np.empty(0, np.int64)
+        except (ValueError, OverflowError):
+            pass
+        else:
+            codes = np.where(values < 0, SeedError.out_of_range, 0).astype(np.uint8)
+            return indices, np.maximum(values, 0).astype(np.uint64), codes
+
+    # rare for decimal input, so find the bad lines one at a time
+    seeds = np.zeros(len(tokens), dtype=np.uint64)
+    codes = np.zeros(len(tokens), dtype=np.uint8)
+    for i, token in enumerate(tokens):
+        try:
+            value = int(token, 10 if decimal else 2)
+        except ValueError:
+            codes[i] = UNPARSABLE
+            continue
+        if 0 <= value < 2**64:
+            seeds[i] = value
+        else:
+            codes[i] = SeedError.out_of_range
+    return indices, seeds, codes
+
+
+def error_name(code: int) -> str:
+    """Return the name of an error code of parse_chunk or validate_batch."""
+    return "unparsable" if code == UNPARSABLE else SeedError(code).name
+
+
+def bulk_display(
+    fin: TextIO,
+    decimal: bool,
+    show: str,
+    sample: float,
+    limit: Optional[int],
+    max_positions: int,
+    chunk_size: int,
+    rng: np.random.Generator,
+    out: TextIO,
+) -> dict[str, int]:
+    """
+    Validate every seed of a stream, draw a subset of them and report invalid ones.
+
+    Lines are read, validated and counted chunk_size at a time, and only the
+    boards that are drawn are handled one by one. Return the number of seeds
+    by error name.
+    """
+    counts = np.zeros(UNPARSABLE + 1, dtype=np.int64)
+    positions: dict[int, list[int]] = {}
+    rendered = 0
+    line_offset = 1
+    while lines := list(islice(fin, chunk_size)):
+        indices, seeds, codes = parse_chunk(lines, decimal)
+        parsed = codes == 0
+        codes[parsed] = validate_batch(seeds[parsed])
+        line_nums = indices + line_offset
+        line_offset += len(lines)
+
+        counts += np.bincount(codes, minlength=len(counts))
+        for code in np.unique(codes[codes != SeedError.valid]).tolist():
+            first = positions.setdefault(code, [])
+            if len(first) < max_positions:
+                first.extend(line_nums[codes == code][: max_positions - len(first)].tolist())
+
+        if show == "none" or (limit is not None and rendered >= limit):
+            continue
+        valid = codes == SeedError.valid
+        selected = {"all": True, "valid": valid, "invalid": ~valid}[show]
+        # only piece counts can be wrong on a board that can still be drawn
+        drawable = np.isin(
+            codes, (SeedError.valid, SeedError.white_pieces, SeedError.black_pieces)
+        )
+        chosen = np.flatnonzero(selected & drawable & (rng.random(len(codes)) < sample))
+        if limit is not None:
+            chosen = chosen[: limit - rendered]
+        for i in chosen.tolist():
+            seed = int(seeds[i])
+            out.write(f"{seed} (line {line_nums[i]}, {error_name(codes[i])}):\n")
+            out.write(render_seed(seed))
+        rendered += len(chosen)
+
+    out.write(f"{'SEED VALIDATION':_^60}\n")
+    for code in np.argsort(-counts, kind="stable").tolist():
+        if counts[code]:
+            first = positions.get(code, [])
+            more = ", ..." if first and counts[code] > len(first) else ""
+            listed = f"  lines {', '.join(map(str, first))}{more}" if first else ""
+            out.write(f"{error_name(code):<16}{counts[code]:>12}{listed}\n")
+    return {error_name(code): int(count) for code, count in enumerate(counts) if count}
+
+
 @click.command()
 @click.option("--decimal/--binary", "-d/-b", default=True)
+@click.option(
+    "--bulk",
+    is_flag=True,
+    help="Validate the whole input file in vectorized chunks and report invalid seeds.",
+)
+@click.option(
+    "--show",
+    default="invalid",
+    type=click.Choice(["invalid", "valid", "all", "none"]),
+    help="Which seeds to draw in bulk mode.",
+)
+@click.option(
+    "--sample",
+    default=1.0,
+    type=click.FloatRange(0, 1),
+    help="Fraction of the shown seeds to draw in bulk mode.",
+)
+@click.option("--limit", default=None, type=int, help="Draw at most this many boards.")
+@click.option("-r", "--random-seed", default=None, type=int, help="Seed for --sample.")
+@click.option(
+    "--max-positions",
+    default=10,
+    type=int,
+    help="Number of line numbers listed per type of invalid seed.",
+)
+@click.option("--chunk-size", default=65536, type=int, help="Lines validated at a time.")
 @click.argument("in_file", required=False, type=click.Path(exists=True, path_type=Path))
-def main(decimal: bool, in_file: Optional[Path]):
+def main(
+    decimal: bool,
+    bulk: bool,
+    show: str,
+    sample: float,
+    limit: Optional[int],
+    random_seed: Optional[int],
+    max_positions: int,
+    chunk_size: int,
+    in_file: Optional[Path],
+):
     """
     Accept seed input from user or file and display the corresponding boards.
 
-    If an input file is provided, decimal encoding is assumed. The file should
-    contain one seed per line.
+    If an input file is provided, decimal encoding is assumed unless --bulk is
+    given. The file should contain one seed per line.
 
     Warnings are shown for invalid boards but the program will not terminate.
+
+    With --bulk, the file is streamed and validated in chunks, only the boards
+    selected by --show, --sample and --limit are drawn, and the number of
+    seeds and the first line numbers of each type of error are reported.
     """
-    if in_file is not None:
+    if bulk:
+        if in_file is None:
+            raise click.BadParameter("requires an input file.", param_hint="--bulk")
+        rng = np.random.default_rng(random_seed)
+        with open(in_file, "r") as fin:
+            bulk_display(
+                fin, decimal, show, sample, limit, max_positions, chunk_size, rng, sys.stdout
+            )
+
+    elif in_file is not None:
         decimal = True
         with open(in_file, "r") as fin:
             seeds = [line.strip() for line in fin.readlines()]
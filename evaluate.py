@@ -0,0 +1,207 @@
+"""
+CLI for estimating win probabilities of many positions.
+
+Plays a fixed pair of players from every seed in the input file across a
+process pool. Sampling for a seed stops early once its confidence interval
+is narrow enough.
+"""
+
+import logging
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from royal_game._exceptions import BoardError, PlayerNotFound
+from royal_game.modules.board import Board
+from royal_game.modules.game import Game
+from royal_game.modules.registry import load_player
+from royal_game.modules.shared_table import (
+    install_handles,
+    published_handles,
+    share_player_tables,
+)
+from royal_game.modules.stats import wilson_interval, z_score
+
+logging.basicConfig(format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SeedEstimate:
+    """Running win count of the white player from one starting seed."""
+
+    seed: int
+    wins: int = 0
+    num_games: int = 0
+    pending_games: int = 0
+    batches_submitted: int = 0
+    done: bool = False
+
+    def interval(self, z: float) -> tuple[float, float]:
+        """Return the Wilson interval of the white win probability."""
+        return wilson_interval(self.wins, self.num_games, z)
+
+
+def read_seeds(in_file: Path) -> list[int]:
+    """Read one decimal seed per line and drop invalid boards with a warning."""
+    seeds = []
+    with open(in_file, "r") as fin:
+        for line_num, line in enumerate(fin, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                seed = int(line, 10)
+                _ = Board(seed)
+            except (ValueError, BoardError) as e:
+                logger.warning("Skipping line %d: %s", line_num, e)
+                continue
+            seeds.append(seed)
+    return seeds
+
+
+def play_batch(
+    white_player: str, black_player: str, seed: int, num_games: int, batch_seed: str
+) -> int:
+    """Play a batch of games from seed and return the number of white wins."""
+    random.seed(batch_seed)
+    white_class, black_class = load_player(white_player), load_player(black_player)
+    return sum(Game(white_class(), black_class(), seed).play() for _ in range(num_games))
+
+
+def output_estimates(estimates: list[SeedEstimate], z: float) -> None:
+    """Format per-seed win probabilities nicely."""
+    print(f"{'POSITION EVALUATION':_^96}")
+    print(
+        "".join(f"{title:^16}" for title in ("seed", "games", "white wins", "p", "low", "high"))
+    )
+    for estimate in estimates:
+        low, high = estimate.interval(z)
+        p = estimate.wins / estimate.num_games if estimate.num_games else float("nan")
+        print(
+            f"{estimate.seed:^16}{estimate.num_games:^16}{estimate.wins:^16}"
+            f"{p:^16.4f}{low:^16.4f}{high:^16.4f}"
+        )
+
+
+@click.command()
+@click.argument("white_player")
+@click.argument("black_player")
+@click.argument("seed_file", type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "-n",
+    "--num-games",
+    default=1000,
+    type=int,
+    help="Maximum number of games to simulate from each seed.",
+)
+@click.option(
+    "-m",
+    "--min-games",
+    default=100,
+    type=int,
+    help="Number of games to simulate from each seed before stopping early.",
+)
+@click.option(
+    "-w",
+    "--half-width",
+    default=0.02,
+    type=float,
+    help="Stop sampling a seed once its confidence interval half-width is this small.",
+)
+@click.option("-c", "--confidence", default=0.95, type=float, help="Confidence level.")
+@click.option("--batch-size", default=50, type=int, help="Number of games per worker task.")
+@click.option("-j", "--processes", default=None, type=int, help="Number of worker processes.")
+@click.option(
+    "-r",
+    "--random-seed",
+    default=None,
+    type=int,
+    help="Optionally set a random seed for reproducibility.",
+)
+def main(
+    white_player: str,
+    black_player: str,
+    seed_file: Path,
+    num_games: int,
+    min_games: int,
+    half_width: float,
+    confidence: float,
+    batch_size: int,
+    processes: Optional[int],
+    random_seed: Optional[int],
+):
+    """
+    Evaluate the white win probability of every seed in SEED_FILE.
+
+    SEED_FILE should contain one decimal seed per line. White is always the
+    side to move in the starting position. WHITE_PLAYER and BLACK_PLAYER are
+    player names or files in royal_game/players.
+    """
+    try:
+        player_classes = [load_player(player) for player in (white_player, black_player)]
+    except PlayerNotFound as e:
+        raise click.BadParameter(str(e)) from e
+    # loaded once here and attached to by every worker, see Player.share_tables
+    share_player_tables(player_classes)
+    z = z_score(confidence)
+    if random_seed is None:
+        random_seed = random.randrange(2**32)
+    estimates = [SeedEstimate(seed) for seed in read_seeds(seed_file)]
+    processes = processes or os.cpu_count() or 1
+    pending: dict[Future, tuple[SeedEstimate, int]] = {}
+
+    def submit_next(executor: ProcessPoolExecutor) -> bool:
+        # pick the unfinished seed with the fewest games played or in flight
+        candidates = [
+            estimate
+            for estimate in estimates
+            if not estimate.done and estimate.num_games + estimate.pending_games < num_games
+        ]
+        if not candidates:
+            return False
+        estimate = min(candidates, key=lambda e: e.num_games + e.pending_games)
+        size = min(batch_size, num_games - estimate.num_games - estimate.pending_games)
+        batch_seed = f"{random_seed}:{estimate.seed}:{estimate.batches_submitted}"
+        future = executor.submit(
+            play_batch, white_player, black_player, estimate.seed, size, batch_seed
+        )
+        estimate.pending_games += size
+        estimate.batches_submitted += 1
+        pending[future] = (estimate, size)
+        return True
+
+    with ProcessPoolExecutor(
+        max_workers=processes, initializer=install_handles, initargs=(published_handles(),)
+    ) as executor:
+        # keep two batches per worker in flight so no worker waits on the parent
+        while len(pending) < 2 * processes and submit_next(executor):
+            pass
+
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                estimate, size = pending.pop(future)
+                estimate.wins += future.result()
+                estimate.num_games += size
+                estimate.pending_games -= size
+
+                low, high = estimate.interval(z)
+                if estimate.num_games >= min_games and (high - low) / 2 <= half_width:
+                    estimate.done = True
+                if estimate.num_games >= num_games:
+                    estimate.done = True
+
+            while len(pending) < 2 * processes and submit_next(executor):
+                pass
+
+    output_estimates(estimates, z)
+
+
+if __name__ == "__main__":
+    main()
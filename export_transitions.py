@@ -0,0 +1,56 @@
+"""
+CLI for exporting the transition graph of the game.
+
+The output directory holds memory-mappable sparse arrays whose layout is
+documented in royal_game.modules.transitions.
+"""
+
+import logging
+from pathlib import Path
+from typing import Iterable, Optional
+
+import click
+
+from royal_game.modules.symmetry import canonicalize
+from royal_game.modules.transitions import all_states, build_transitions, reachable_states
+
+logging.basicConfig(format="%(levelname)s: %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@click.command()
+@click.argument("out_dir", type=click.Path(file_okay=False, path_type=Path))
+@click.option(
+    "-s",
+    "--root",
+    "roots",
+    multiple=True,
+    type=int,
+    help=(
+        "Only export the states reachable from this seed with white to move. "
+        "May be repeated. Exports every legal state if omitted."
+    ),
+)
+@click.option("-b", "--black-to-move", is_flag=True, help="Roots have black to move instead.")
+@click.option("-j", "--processes", default=None, type=int, help="Number of worker processes.")
+@click.option(
+    "--block-size", default=100_000, type=int, help="Number of states per worker task."
+)
+def main(
+    out_dir: Path,
+    roots: Iterable[int],
+    black_to_move: bool,
+    processes: Optional[int],
+    block_size: int,
+):
+    """Build the per-roll successor arrays of every state and write them to OUT_DIR."""
+    if roots:
+        states = reachable_states(canonicalize(root, not black_to_move)[0] for root in roots)
+    else:
+        states = all_states()
+    logger.info("Exporting transitions of %d states to %s.", len(states), out_dir)
+    build_transitions(states, out_dir, processes, block_size)
+
+
+if __name__ == "__main__":
+    main()
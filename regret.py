@@ -0,0 +1,213 @@
+"""
+CLI for measuring where players lose win probability.
+
+Decisions are scored against a table of exact win probabilities solved
+over a transition graph exported by export_transitions.py. The scoring is
+documented in royal_game.modules.regret.
+"""
+
+import json
+import logging
+import random
+import time
+from itertools import permutations
+from pathlib import Path
+from typing import Iterable, Optional
+
+import click
+
+from royal_game.modules.registry import load_player
+from royal_game.modules.regret import (
+    MOVE_TYPES,
+    PHASES,
+    RegretStats,
+    analyze_games,
+    analyze_samples,
+    solve_values,
+)
+from royal_game.modules.transitions import load_transitions
+
+logging.basicConfig(format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+DEFAULT_VALUES = Path("values.npz")
+
+
+def output_regret(stats: RegretStats) -> None:
+    """Print regret per player, then per player and move type, then per player and phase."""
+    totals = stats.totals()
+    print(f"{'REGRET BY PLAYER':_^120}")
+    columns = ["decisions", "optimal", "mean regret", "max regret", "blunders", "regret/game"]
+    print("".join(f"{column:^20}" for column in [""] + columns))
+    for i, name in enumerate(stats.players):
+        decisions = max(totals["decisions"][i], 1)
+        per_game = f"{totals['regret'][i] / stats.games[i]:.4f}" if stats.games[i] else "/"
+        print(
+            f"{name:^20}{totals['decisions'][i]:^20}"
+            f"{totals['optimal'][i] / decisions:^20.1%}"
+            f"{totals['regret'][i] / decisions:^20.5f}{totals['max_regret'][i]:^20.4f}"
+            f"{totals['blunders'][i]:^20}{per_game:^20}"
+        )
+
+    for axis, labels in ((1, MOVE_TYPES), (2, PHASES)):
+        totals = stats.totals(axis)
+        title = "MEAN REGRET BY " + ("MOVE TYPE" if axis == 1 else "PHASE")
+        print(f"{title:_^120}")
+        print("".join(f"{label:^20}" for label in ("",) + labels))
+        for i, name in enumerate(stats.players):
+            cells = [
+                (
+                    f"{totals['regret'][i][j] / totals['decisions'][i][j]:.5f}"
+                    f" ({totals['decisions'][i][j]})"
+                    if totals["decisions"][i][j]
+                    else "/"
+                )
+                for j in range(len(labels))
+            ]
+            print(f"{name:^20}" + "".join(f"{cell:^20}" for cell in cells))
+
+
+@click.group()
+def main():
+    """Score the decisions of players against exact win probabilities."""
+    logger.setLevel(logging.INFO)
+
+
+@main.command()
+@click.argument(
+    "transitions_dir", type=click.Path(exists=True, file_okay=False, path_type=Path)
+)
+@click.option(
+    "-o", "--output", default=DEFAULT_VALUES, type=click.Path(dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--tolerance", default=1e-10, type=float, help="Largest estimated error at convergence."
+)
+def solve(transitions_dir: Path, output: Path, tolerance: float):
+    """Solve the win probability of every state of the graph in TRANSITIONS_DIR."""
+    start = time.perf_counter()
+    table = solve_values(load_transitions(transitions_dir), tolerance)
+    table.save(output)
+    logger.info(
+        "Wrote %d values to %s in %.1f sec.", len(table), output, time.perf_counter() - start
+    )
+
+
+@main.command()
+@click.argument("players", nargs=-1)
+@click.option(
+    "-v",
+    "--values",
+    "values_path",
+    default=DEFAULT_VALUES,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Value table written by the solve command.",
+)
+@click.option(
+    "--samples",
+    "samples_dir",
+    default=None,
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="Score the shards of a selfplay.py run instead of playing games.",
+)
+@click.option("-n", "--num-games", default=1000, type=int, help="Number of games to play.")
+@click.option(
+    "-s",
+    "--board-seed",
+    default=122138132480,
+    type=int,
+    help="Use a non-default initial board.",
+)
+@click.option(
+    "-r",
+    "--random-seed",
+    default=None,
+    type=int,
+    help="Seed of the games, the run seed of selfplay.py replays its games.",
+)
+@click.option(
+    "-p",
+    "--self-play",
+    is_flag=True,
+    help="Also pair every player with itself when more than one player is given.",
+)
+@click.option(
+    "--blunder-threshold",
+    default=0.05,
+    type=float,
+    help="Regret from which a decision counts as a blunder.",
+)
+@click.option(
+    "--chunk-size",
+    default=100,
+    type=int,
+    help="Number of games, or thousands of samples, per worker task.",
+)
+@click.option("-j", "--processes", default=None, type=int, help="Number of worker processes.")
+@click.option(
+    "--json", "json_path", default=None, type=click.Path(dir_okay=False, path_type=Path)
+)
+def analyze(
+    players: Iterable[str],
+    values_path: Path,
+    samples_dir: Optional[Path],
+    num_games: int,
+    board_seed: int,
+    random_seed: Optional[int],
+    self_play: bool,
+    blunder_threshold: float,
+    chunk_size: int,
+    processes: Optional[int],
+    json_path: Optional[Path],
+):
+    """
+    Play games between PLAYERS and report the win probability each loses by its moves.
+
+    Games cycle through the pairings of selfplay.py. Every state reached must
+    be in the value table, so the transition graph it was solved over has to
+    cover the initial board.
+    """
+    start = time.perf_counter()
+    if samples_dir is not None:
+        if players:
+            raise click.UsageError("PLAYERS cannot be given with --samples.")
+        with open(samples_dir / "manifest.json", "r") as fin:
+            shards = [samples_dir / shard["file"] for shard in json.load(fin)["shards"]]
+        stats = analyze_samples(
+            shards, values_path, 1000 * chunk_size, processes, blunder_threshold
+        )
+    else:
+        if not players:
+            raise click.UsageError("Either PLAYERS or --samples is required.")
+        player_classes = list(dict.fromkeys(load_player(player) for player in players))
+        indices = range(len(player_classes))
+        pairings = list(permutations(indices, 2))
+        if self_play or len(player_classes) == 1:
+            pairings += [(i, i) for i in indices]
+        if random_seed is None:
+            random_seed = random.randrange(2**32)
+        stats = analyze_games(
+            player_classes,
+            pairings,
+            num_games,
+            random_seed,
+            values_path,
+            board_seed,
+            chunk_size,
+            processes,
+            blunder_threshold,
+        )
+
+    output_regret(stats)
+    logger.info(
+        "Scored %d decisions in %.1f sec.",
+        stats.decisions.sum(),
+        time.perf_counter() - start,
+    )
+    if json_path is not None:
+        with open(json_path, "w") as fout:
+            json.dump(stats.to_dict(), fout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
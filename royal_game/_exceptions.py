@@ -38,6 +38,35 @@ class InvalidPlayer(GameError):
         super().__init__(message)
 
 
+class PlayerNotFound(GameError):
+    def __init__(self, player: str) -> None:
+        message = f"Unable to find player {player} in royal_game/players or installed plugins."
+        super().__init__(message)
+
+
+class MarkovChainError(Exception):
+    pass
+
+
+class StateLimitExceeded(MarkovChainError):
+    def __init__(self, max_states: int) -> None:
+        message = f"More than {max_states} states are reachable under the given players."
+        super().__init__(message)
+
+
+class TunerError(Exception):
+    pass
+
+
+class OpponentMismatch(TunerError):
+    def __init__(self, checkpoint_file, expected: list[str], actual: list[str]) -> None:
+        message = (
+            f"{checkpoint_file} was tuned against {', '.join(expected)}, "
+            f"not {', '.join(actual)}."
+        )
+        super().__init__(message)
+
+
 class MoveError(Exception):
     pass
 
@@ -0,0 +1,223 @@
+"""
+Expectimax search over many root positions at once.
+
+Nodes are canonical white-to-move seeds (see royal_game.modules.symmetry)
+valued by the win probability of the side to move. The tree is expanded
+breadth first: every depth level is an array of distinct seeds, the
+children of a whole level are generated with bit operations on that array
+for every dice roll, and the next level is the set of distinct children.
+Leaves are scored by a vectorized evaluator, then values are backed up
+level by level, maximizing over the moves of each roll and weighting the
+rolls by their probabilities. Depth counts dice rolls, including rolls of
+0 and rolls without moves, which pass the turn.
+
+Move generation follows Board.get_available_moves. A move is identified
+by its source position along the mover's path (see Move.path_position):
+0 is the start and 1-14 are the grids in the order pieces pass them, so
+every (node, dice roll) pair has one move slot per position.
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from royal_game.modules.game import dice_probabilities
+from royal_game.modules.symmetry import swap_colors_batch
+
+NUM_SLOTS = 15
+
+# path positions of the rosettes, 8 is shared by both colors
+_ROSETTES = (4, 8, 14)
+_CENTER_ROSETTE = 8
+
+_WS, _WE, _BS = (np.uint64(1 << offset) for offset in (28, 31, 34))
+
+
+def _grid_bits(position: int) -> tuple[np.uint64, np.uint64, np.uint64]:
+    """Return the mask of a path position and the bits of a white and a black piece on it."""
+    if position <= 4 or position >= 13:
+        bit = np.uint64(1 << (position - 1 if position <= 4 else position - 9))
+        return bit, bit, np.uint64(0)
+    offset = 12 + 2 * (position - 5)
+    return np.uint64(0b11 << offset), np.uint64(1 << offset), np.uint64(2 << offset)
+
+
+_GRIDS = {position: _grid_bits(position) for position in range(1, 15)}
+
+
+def _end_counts(seeds: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return the number of white and black pieces at the end."""
+    return (
+        (seeds >> np.uint64(31)) & np.uint64(0b111),
+        (seeds >> np.uint64(37)) & np.uint64(0b111),
+    )
+
+
+def is_end_batch(seeds: np.ndarray) -> np.ndarray:
+    """Return which seeds are end states."""
+    white_end, black_end = _end_counts(seeds)
+    return (white_end == 7) | (black_end == 7)
+
+
+def move_slots(seeds: np.ndarray, dice_roll: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Generate the moves of a dice roll for an array of canonical seeds.
+
+    Return (n, NUM_SLOTS) arrays marking the available moves, holding the
+    canonical child of each and whether it gives the mover an extra turn.
+    Children of unavailable moves are undefined. Seeds must not be end
+    states.
+    """
+    seeds = np.asarray(seeds, dtype=np.uint64)
+    own = {position: (seeds & mask) == white for position, (mask, white, _) in _GRIDS.items()}
+    other = {
+        position: (seeds & mask) == black
+        for position, (mask, _, black) in _GRIDS.items()
+        if black
+    }
+    empty = {position: (seeds & mask) == 0 for position, (mask, _, _) in _GRIDS.items()}
+
+    available = np.zeros((len(seeds), NUM_SLOTS), dtype=bool)
+    children = np.zeros((len(seeds), NUM_SLOTS), dtype=np.uint64)
+    extra_turn = np.zeros((len(seeds), NUM_SLOTS), dtype=bool)
+    for position in range(NUM_SLOTS):
+        target = position + dice_roll
+        if target > 15:
+            break
+        if position == 0:
+            # start pieces only enter onto the private grids, where black cannot be
+            movable = (seeds >> np.uint64(28)) & np.uint64(0b111) != 0
+            removed = seeds - _WS
+        else:
+            mask = _GRIDS[position][0]
+            movable = own[position]
+            removed = seeds & ~mask
+
+        if target == 15:
+            available[:, position] = movable
+            children[:, position] = removed + _WE
+            continue
+
+        mask, white, _ = _GRIDS[target]
+        placed = (removed & ~mask) | white
+        if target in other:
+            captured = other[target]
+            if target == _CENTER_ROSETTE:
+                # a piece cannot capture on the center rosette and lands past it
+                nine_mask, nine_white, _ = _GRIDS[9]
+                jump = captured & empty[9]
+                available[:, position] = movable & (empty[target] | jump)
+                children[:, position] = np.where(
+                    jump, (removed & ~nine_mask) | nine_white, placed
+                )
+                extra_turn[:, position] = ~captured
+                continue
+            placed = placed + np.where(captured, _BS, np.uint64(0))
+        available[:, position] = movable & ~own[target]
+        children[:, position] = placed
+        extra_turn[:, position] = target in _ROSETTES
+
+    children = np.where(extra_turn, children, swap_colors_batch(children))
+    return available, children, extra_turn
+
+
+@dataclass
+class _Level:
+    """Expansion of the distinct nodes of one depth level."""
+
+    seeds: np.ndarray
+    terminal: np.ndarray
+    # indices into the next level of the color-swapped seed of expanded nodes
+    passes: np.ndarray
+    # per dice roll: flat indices of available moves into (expanded, NUM_SLOTS),
+    # indices of their children into the next level and their extra turn flags
+    moves: dict[int, tuple[np.ndarray, np.ndarray, np.ndarray]]
+
+
+def _expand(seeds: np.ndarray) -> tuple[_Level, np.ndarray]:
+    """Expand the non-terminal seeds of a level and return it with the next level."""
+    terminal = is_end_batch(seeds)
+    expanded = seeds[~terminal]
+    swapped = swap_colors_batch(expanded)
+    generated = {}
+    for dice_roll in range(1, 5):
+        available, children, extra_turn = move_slots(expanded, dice_roll)
+        flat = np.flatnonzero(available)
+        generated[dice_roll] = (flat, children.ravel()[flat], extra_turn.ravel()[flat])
+
+    next_seeds = np.unique(
+        np.concatenate([swapped] + [children for _, children, _ in generated.values()])
+    )
+    moves = {
+        dice_roll: (flat, np.searchsorted(next_seeds, children), extra_turn)
+        for dice_roll, (flat, children, extra_turn) in generated.items()
+    }
+    return _Level(seeds, terminal, np.searchsorted(next_seeds, swapped), moves), next_seeds
+
+
+def _terminal_values(seeds: np.ndarray) -> np.ndarray:
+    """Return 1 for end states won by the side to move and 0 otherwise."""
+    white_end, _ = _end_counts(seeds)
+    return (white_end == 7).astype(np.float64)
+
+
+def _back_up(level: _Level, next_values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return the values of a level from those of the next, with the best slot of every roll.
+
+    Best slots are -1 for terminal nodes and rolls without moves.
+    """
+    num_expanded = len(level.passes)
+    pass_values = 1 - next_values[level.passes]
+    expanded_values = dice_probabilities[0] * pass_values
+    best_slots = np.full((num_expanded, 4), -1, dtype=np.int8)
+    for dice_roll, (flat, children, extra_turn) in level.moves.items():
+        child_values = next_values[children]
+        slot_values = np.full(num_expanded * NUM_SLOTS, -np.inf)
+        slot_values[flat] = np.where(extra_turn, child_values, 1 - child_values)
+        slot_values = slot_values.reshape(num_expanded, NUM_SLOTS)
+        # ties go to the lowest path position
+        best = np.argmax(slot_values, axis=1)
+        best_values = slot_values[np.arange(num_expanded), best]
+        has_moves = best_values > -np.inf
+        best_slots[has_moves, dice_roll - 1] = best[has_moves]
+        expanded_values += dice_probabilities[dice_roll] * np.where(
+            has_moves, best_values, pass_values
+        )
+
+    values = _terminal_values(level.seeds)
+    values[~level.terminal] = expanded_values
+    slots = np.full((len(level.seeds), 4), -1, dtype=np.int8)
+    slots[~level.terminal] = best_slots
+    return values, slots
+
+
+def expectimax(
+    roots: np.ndarray, depth: int, evaluate: Callable[[np.ndarray], np.ndarray]
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Search canonical roots depth dice rolls deep.
+
+    evaluate maps an array of canonical seeds to the win probabilities of
+    the side to move, for example ValueNetwork.evaluate or
+    ValueTable.values, and is called once on the distinct non-terminal
+    leaves. Return the value of every root and an (n, 4) array of the path
+    position of the best move for each dice roll of 1-4, -1 if there is
+    none.
+    """
+    roots = np.asarray(roots, dtype=np.uint64)
+    seeds, inverse = np.unique(roots, return_inverse=True)
+    levels = []
+    for _ in range(depth):
+        level, seeds = _expand(seeds)
+        levels.append(level)
+
+    values = _terminal_values(seeds)
+    leaves = ~is_end_batch(seeds)
+    if leaves.any():
+        values[leaves] = evaluate(seeds[leaves])
+    slots = np.full((len(seeds), 4), -1, dtype=np.int8)
+    for level in reversed(levels):
+        values, slots = _back_up(level, values)
+    return values[inverse], slots[inverse]
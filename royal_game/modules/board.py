@@ -25,6 +25,39 @@ from royal_game.modules.grid_status import GridStatus
 from royal_game.modules.move import Move
 
 
+def _decode_tables() -> tuple[list, list, list, list]:
+    """
+    Return lookup tables that decode each segment of a seed at once.
+
+    The white and black tables map the 6 bits of a private row to the
+    statuses of its grids and the number of pieces on them. The public
+    table maps 8 bits, half of the public row, to the statuses of its four
+    grids and the numbers of white and black pieces on them, or to None if
+    a grid holds the invalid status 0b11. The start/end table maps bits
+    28-39 to the WS, WE, BS and BE piece counts.
+    """
+    empty, white, black = GridStatus.empty, GridStatus.white, GridStatus.black
+    white_rows, black_rows = [], []
+    for bits in range(1 << 6):
+        occupied = [bool(bits >> offset & 1) for offset in range(6)]
+        white_rows.append((tuple(white if o else empty for o in occupied), sum(occupied)))
+        black_rows.append((tuple(black if o else empty for o in occupied), sum(occupied)))
+
+    public_halves = []
+    for bits in range(1 << 8):
+        values = [bits >> offset & 0b11 for offset in range(0, 8, 2)]
+        public_halves.append(
+            None
+            if 0b11 in values
+            else (tuple(map(GridStatus, values)), values.count(1), values.count(2))
+        )
+
+    start_end_counts = [
+        tuple(bits >> offset & 0b111 for offset in range(0, 12, 3)) for bits in range(1 << 12)
+    ]
+    return white_rows, black_rows, public_halves, start_end_counts
+
+
 class Board:
     """
     Stores game state and implements game logic.
@@ -48,56 +81,46 @@ class Board:
     white_rosettes = set(["W4", "8", "W14"])
     black_rosettes = set(["B4", "8", "B14"])
 
-    def __init__(self, seed: int = 122138132480, no_verify: bool = False) -> None:
-        self.board: dict[str, Grid] = {}
-        white_total = 0
-        black_total = 0
-
-        # initialize the white row
-        offset = 0
-        for name, is_rosette in white_grid_iter():
-            status_bit = (seed & (0b1 << offset)) >> offset
-            offset += 1
-
-            if status_bit:
-                white_total += 1
-
-            # simplified expression since GridStatus(1) indicates white
-            self.board[name] = Grid(name, is_rosette, GridStatus(status_bit))
-
-        # initialize the black row
-        for name, is_rosette in black_grid_iter():
-            status_bit = (seed & (0b1 << offset)) >> offset
-            offset += 1
+    # (grid name, bit offset) pairs of the layout above, so __int__ need not rebuild them
+    _private_offsets = tuple(
+        (name, offset)
+        for offset, (name, _) in enumerate(chain(white_grid_iter(), black_grid_iter()))
+    )
+    _public_offsets = tuple(
+        (name, 12 + 2 * i) for i, (name, _) in enumerate(public_grid_iter())
+    )
+    _start_end_offsets = tuple(
+        (name, 28 + 3 * i) for i, name in enumerate(start_end_grid_iter())
+    )
+
+    # (grid name, is rosette) pairs of the grids decoded by the row tables, in seed order
+    _grids = tuple(chain(white_grid_iter(), black_grid_iter(), public_grid_iter()))
+    _start_end_names = tuple(start_end_grid_iter())
+    _white_rows, _black_rows, _public_halves, _start_end_counts = _decode_tables()
 
-            if status_bit:
-                black_total += 1
-
-            self.board[name] = Grid(
-                name, is_rosette, GridStatus(2) if status_bit else GridStatus(0)
+    def __init__(self, seed: int = 122138132480, no_verify: bool = False) -> None:
+        # each segment of the seed is decoded with one lookup, see _decode_tables
+        white_row, white_total = Board._white_rows[seed & 0x3F]
+        black_row, black_total = Board._black_rows[(seed >> 6) & 0x3F]
+        low = Board._public_halves[(seed >> 12) & 0xFF]
+        high = Board._public_halves[(seed >> 20) & 0xFF]
+        if low is None or high is None:
+            # a public grid holding 0b11, rejected as by GridStatus
+            GridStatus(0b11)
+        counts = Board._start_end_counts[(seed >> 28) & 0xFFF]
+
+        self.board: dict[str, Grid] = {
+            name: Grid(name, is_rosette, status)
+            for (name, is_rosette), status in zip(
+                Board._grids, white_row + black_row + low[0] + high[0]
             )
-
-        # initialize public row
-        for name, is_rosette in public_grid_iter():
-            status_bit = (seed & (0b11 << offset)) >> offset
-
-            if status_bit == 1:
-                white_total += 1
-            elif status_bit == 2:
-                black_total += 1
-
-            offset += 2
-            self.board[name] = Grid(name, is_rosette, GridStatus(status_bit))
-
-        # offset = 28 now
-        for name in start_end_grid_iter():
-            num_pieces = (seed & (0b111 << offset)) >> offset
-            offset += 3
+        }
+        for name, num_pieces in zip(Board._start_end_names, counts):
             self.board[name] = StartEndGrid(name, num_pieces)
 
         if not no_verify:
-            white_total += self.board["WS"].num_pieces + self.board["WE"].num_pieces
-            black_total += self.board["BS"].num_pieces + self.board["BE"].num_pieces
+            white_total += low[1] + high[1] + counts[0] + counts[1]
+            black_total += low[2] + high[2] + counts[2] + counts[3]
 
             if white_total != 7:
                 raise InvalidNumberofPieces("white", white_total)
@@ -105,6 +128,12 @@ class Board:
             if black_total != 7:
                 raise InvalidNumberofPieces("black", black_total)
 
+    def clone(self) -> "Board":
+        """Return an independent copy of the board without a round trip through its seed."""
+        board = Board.__new__(Board)
+        board.board = {name: grid.clone() for name, grid in self.board.items()}
+        return board
+
     def __repr__(self):
         fmt = ""
         unformatted = ""
@@ -133,20 +162,24 @@ class Board:
         Grid objects are converted to integers based on the value of their status.
         This is the desired behavior for the public grids but not the private grids.
         """
+        board = self.board
         board_int = 0
-        offset = 0
-
-        for name, _ in chain(white_grid_iter(), black_grid_iter()):
-            board_int += int(self.board[name].status is not GridStatus.empty) << offset
-            offset += 1
-
-        for name, _ in public_grid_iter():
-            board_int += (int(self.board[name])) << offset
-            offset += 2
 
-        for name in start_end_grid_iter():
-            board_int += (int(self.board[name])) << offset
-            offset += 3
+        # enum attribute lookups and .value are slow, compare against local names
+        empty, white, black = GridStatus.empty, GridStatus.white, GridStatus.black
+        for name, offset in Board._private_offsets:
+            if board[name].status is not empty:
+                board_int |= 1 << offset
+
+        for name, offset in Board._public_offsets:
+            status = board[name].status
+            if status is white:
+                board_int |= 1 << offset
+            elif status is black:
+                board_int |= 2 << offset
+
+        for name, offset in Board._start_end_offsets:
+            board_int |= board[name].num_pieces << offset
 
         return board_int
 
@@ -0,0 +1,84 @@
+"""
+Checkpoints of long tournament runs.
+
+Every game of a tournament is seeded from the run seed, its pairing and its
+index, so the random state of a pairing is fully determined by which of its
+games have been played. A checkpoint therefore stores the run settings, the
+ranges of completed games of every pairing, and the span of the results
+file holding their results. Resuming truncates the results file to the
+checkpointed span, rebuilds the aggregates from it and plays only the
+missing games, which reproduces the results of an uninterrupted run.
+"""
+
+import json
+from bisect import bisect_left
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+FORMAT_VERSION = 1
+
+
+class CompletedGames:
+    """Completed game indices of one pairing, stored as sorted disjoint ranges."""
+
+    def __init__(self, ranges: list[list[int]] = ()) -> None:
+        self.ranges = [list(r) for r in ranges]
+
+    def add(self, games: range) -> None:
+        """Mark games as completed, merging adjacent ranges."""
+        start, stop = games.start, games.stop
+        i = bisect_left(self.ranges, [start, stop])
+        # absorb neighbours that touch the new range
+        if i > 0 and self.ranges[i - 1][1] >= start:
+            i -= 1
+            start = self.ranges[i][0]
+        j = i
+        while j < len(self.ranges) and self.ranges[j][0] <= stop:
+            stop = max(stop, self.ranges[j][1])
+            j += 1
+        self.ranges[i:j] = [[start, stop]]
+
+    def missing(self, num_games: int) -> list[range]:
+        """Return the ranges of games not completed yet."""
+        missing, previous = [], 0
+        for start, stop in self.ranges:
+            if start > previous:
+                missing.append(range(previous, start))
+            previous = stop
+        if previous < num_games:
+            missing.append(range(previous, num_games))
+        return missing
+
+    @property
+    def count(self) -> int:
+        """Number of completed games."""
+        return sum(stop - start for start, stop in self.ranges)
+
+
+@dataclass
+class TournamentCheckpoint:
+    """Progress of a tournament run and the span of the results file it has written."""
+
+    settings: dict
+    completed: list[list[list[int]]]
+    results_start: int
+    results_stop: int
+    version: int = FORMAT_VERSION
+
+    def save(self, path: Path) -> None:
+        """Write the checkpoint atomically so an interrupted save keeps the previous one."""
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "w") as fout:
+            json.dump(asdict(self), fout)
+        temp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "TournamentCheckpoint":
+        """Load a checkpoint saved with save."""
+        with open(path, "r") as fin:
+            checkpoint = cls(**json.load(fin))
+        if checkpoint.version != FORMAT_VERSION:
+            raise ValueError(
+                f"{path} has checkpoint format {checkpoint.version}, expected {FORMAT_VERSION}."
+            )
+        return checkpoint
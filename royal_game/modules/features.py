@@ -0,0 +1,145 @@
+"""
+Vectorized board features for heuristics and learned evaluators.
+
+Every function takes an array of board seeds and decodes the bit fields
+documented in royal_game.modules.board directly, without building Board
+objects. Features are reported for both colors, white first; combine with
+royal_game.modules.symmetry to express them relative to the side to move.
+
+Each color moves along a path of 14 grids, numbered 1-14 from the point
+where pieces enter the board:
+
+    entry:  1-4   (W1...W4 or B1...B4, private)
+    public: 5-12  (shared, 8 is the center rosette)
+    exit:   13-14 (W13, W14 or B13, B14, private)
+"""
+
+import numpy as np
+
+# path positions of the rosettes, 8 is shared by both colors
+PRIVATE_ROSETTES = (4, 14)
+CENTER_ROSETTE = 8
+
+FEATURE_NAMES = tuple(
+    f"{color}_{name}"
+    for color in ("white", "black")
+    for name in (
+        "start",
+        "end",
+        "entry",
+        "public",
+        "exit",
+        "rosette_4",
+        "rosette_8",
+        "rosette_14",
+        "threatened_1",
+        "threatened_2",
+        "threatened_3",
+        "threatened_4",
+        "pip_count",
+    )
+)
+
+
+def start_end_counts(seeds: np.ndarray) -> np.ndarray:
+    """Return an (n, 4) array of the WS, WE, BS and BE piece counts."""
+    seeds = np.atleast_1d(np.asarray(seeds, dtype=np.uint64))
+    return np.stack(
+        [(seeds >> np.uint64(28 + 3 * i)) & np.uint64(0b111) for i in range(4)], axis=1
+    ).astype(np.uint8)
+
+
+def _occupancy_rows(seeds: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return (14, n) white and black occupancy so each path position is contiguous."""
+    white = np.empty((14, len(seeds)), dtype=np.uint8)
+    black = np.empty((14, len(seeds)), dtype=np.uint8)
+
+    # private grids are bits 0-5 for W1...W4, W13, W14 and bits 6-11 for black
+    for row, bit in zip((0, 1, 2, 3, 12, 13), range(6)):
+        white[row] = (seeds >> np.uint64(bit)) & np.uint64(1)
+        black[row] = (seeds >> np.uint64(bit + 6)) & np.uint64(1)
+    for row in range(4, 12):
+        status = (seeds >> np.uint64(12 + 2 * (row - 4))) & np.uint64(0b11)
+        white[row] = status == 1
+        black[row] = status == 2
+    return white, black
+
+
+def path_occupancy(seeds: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return (n, 14) arrays marking the white and black pieces along their paths.
+
+    Column i corresponds to path position i + 1.
+    """
+    white, black = _occupancy_rows(np.atleast_1d(np.asarray(seeds, dtype=np.uint64)))
+    return white.T, black.T
+
+
+def threatened(defender: np.ndarray, attacker: np.ndarray) -> np.ndarray:
+    """
+    Return an (n, 4) array counting the defender's pieces capturable by each roll of 1-4.
+
+    defender and attacker are (n, 14) path occupancy arrays. Only pieces on
+    public grids other than the center rosette can be captured.
+    """
+    return _threatened_rows(
+        np.ascontiguousarray(defender.T), np.ascontiguousarray(attacker.T)
+    ).T
+
+
+def _threatened_rows(defender: np.ndarray, attacker: np.ndarray) -> np.ndarray:
+    """Return (4, n) threat counts from (14, n) occupancy rows."""
+    counts = np.zeros((4, defender.shape[1]), dtype=np.uint8)
+    for dice_roll in range(1, 5):
+        for position in range(5, 13):
+            if position == CENTER_ROSETTE:
+                continue
+            counts[dice_roll - 1] += defender[position - 1] & attacker[position - dice_roll - 1]
+    return counts
+
+
+def pip_count(occupancy: np.ndarray, start: np.ndarray) -> np.ndarray:
+    """Return the total number of steps a color needs to move all pieces to the end."""
+    remaining = np.arange(14, 0, -1, dtype=np.int32)
+    return occupancy.astype(np.int32) @ remaining + 15 * start.astype(np.int32)
+
+
+def contact_possible(seeds: np.ndarray) -> np.ndarray:
+    """
+    Return which seeds can still see a capture.
+
+    Pieces of both colors meet only on the public grids, which a color has
+    left behind for good once all of its remaining pieces are on its exit
+    grids, so the rest of such a game is a pure race.
+    """
+    seeds = np.atleast_1d(np.asarray(seeds, dtype=np.uint64))
+    counts = start_end_counts(seeds)
+    white, black = path_occupancy(seeds)
+    white_behind = counts[:, 0].astype(np.int32) + white[:, :12].sum(axis=1)
+    black_behind = counts[:, 2].astype(np.int32) + black[:, :12].sum(axis=1)
+    return (white_behind > 0) & (black_behind > 0)
+
+
+def extract_features(seeds: np.ndarray, dtype: type = np.float32) -> np.ndarray:
+    """Return an (n, len(FEATURE_NAMES)) feature matrix for an array of seeds."""
+    seeds = np.atleast_1d(np.asarray(seeds, dtype=np.uint64))
+    counts = start_end_counts(seeds)
+    white, black = _occupancy_rows(seeds)
+    remaining = np.arange(14, 0, -1, dtype=dtype)
+
+    # features are written column by column into a transposed buffer
+    features = np.empty((len(FEATURE_NAMES), len(seeds)), dtype=dtype)
+    half = len(FEATURE_NAMES) // 2
+    for offset, own, other, start, end in ((0, white, black, 0, 1), (half, black, white, 2, 3)):
+        own_values = own.astype(dtype)
+        features[offset] = counts[:, start]
+        features[offset + 1] = counts[:, end]
+        features[offset + 2] = own_values[0:4].sum(axis=0)
+        features[offset + 3] = own_values[4:12].sum(axis=0)
+        features[offset + 4] = own_values[12:14].sum(axis=0)
+        features[offset + 5] = own[PRIVATE_ROSETTES[0] - 1]
+        features[offset + 6] = own[CENTER_ROSETTE - 1]
+        features[offset + 7] = own[PRIVATE_ROSETTES[1] - 1]
+        features[offset + 8 : offset + 12] = _threatened_rows(own, other)
+        features[offset + 12] = remaining @ own_values + 15 * features[offset]
+    return features.T
@@ -1,18 +1,36 @@
 """Implements game loop."""
 
 import logging
-from random import choices
+from random import Random, choices
+from time import perf_counter
 from typing import Optional
 
 from royal_game._exceptions import InvalidPlayer
 from royal_game.modules.board import Board
+from royal_game.modules.move import Move
+from royal_game.modules.move_cache import MoveCache
 from royal_game.modules.player import Player
 
-logging.basicConfig(
-    filename="games.log", filemode="w", level=logging.DEBUG, format="%(levelname)s: %(message)s"
-)
 logger = logging.getLogger(__name__)
 
+# probabilities of rolling 0-4 with four binary dice
+dice_probabilities = (1 / 16, 1 / 4, 3 / 8, 1 / 4, 1 / 16)
+
+
+def configure_game_log(filename: str = "games.log") -> None:
+    """
+    Write the full debug output of every game to filename, truncating it first.
+
+    Games only log at the debug level, so nothing is written anywhere
+    unless this is called.
+    """
+    handler = logging.FileHandler(filename, mode="w")
+    handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    # keep per-move output out of the console
+    logger.propagate = False
+
 
 class Game:
     """
@@ -20,10 +38,33 @@ class Game:
 
     Each player should inherit from the Player class and
     implements select_move.
+
+    An optional MoveCache can be shared between games to memoize
+    move generation.
+
+    The number of moves made and captures are counted in plies and
+    captures.
+
+    If record_history is set, every selected move is appended to history
+    as (board seed, white_turn, dice_roll, move) before it is made.
+
+    If record_decision_times is set, the seconds spent in select_move are
+    appended to decision_times[0] for white and decision_times[1] for black.
+
+    Dice are rolled from the global random state unless a dedicated
+    dice_rng is given. Two games sharing a dice_rng seed see the same
+    sequence of rolls regardless of the random choices players make.
     """
 
     def __init__(
-        self, player1: Player, player2: Player, board_seed: Optional[int] = 122138132480
+        self,
+        player1: Player,
+        player2: Player,
+        board_seed: Optional[int] = 122138132480,
+        move_cache: Optional[MoveCache] = None,
+        record_history: bool = False,
+        dice_rng: Optional[Random] = None,
+        record_decision_times: bool = False,
     ):
         if "select_move" not in dir(player1):
             raise InvalidPlayer(player1)
@@ -35,6 +76,16 @@ class Game:
         self.player2 = player2
         self.board = Board(seed=board_seed)
         self.white_turn = True
+        self.plies = 0
+        self.captures = 0
+        self.move_cache = move_cache
+        self.roll = choices if dice_rng is None else dice_rng.choices
+        self.history: Optional[list[tuple[int, bool, int, Move]]] = (
+            [] if record_history else None
+        )
+        self.decision_times: Optional[tuple[list[float], list[float]]] = (
+            ([], []) if record_decision_times else None
+        )
 
     def __repr__(self):
         return (
@@ -50,9 +101,7 @@ class Game:
 
         while not self.board.is_end_state():
             current_player = self.player1 if self.white_turn else self.player2
-            dice_roll = choices(
-                [0, 1, 2, 3, 4], weights=[1 / 16, 1 / 4, 3 / 8, 1 / 4, 1 / 16], k=1
-            )[0]
+            dice_roll = self.roll([0, 1, 2, 3, 4], weights=dice_probabilities, k=1)[0]
 
             if dice_roll == 0:
                 logger.debug(
@@ -62,7 +111,12 @@ class Game:
                 continue
             logger.debug("%s rolled a %d.", current_player, dice_roll)
 
-            available_moves = self.board.get_available_moves(self.white_turn, dice_roll)
+            if self.move_cache is None:
+                available_moves = self.board.get_available_moves(self.white_turn, dice_roll)
+            else:
+                available_moves = self.move_cache.get_available_moves(
+                    self.board, self.white_turn, dice_roll
+                )
 
             if not available_moves:
                 logger.debug(
@@ -72,11 +126,24 @@ class Game:
                 self.white_turn = not self.white_turn
                 continue
 
-            move_selected = current_player.select_move(
-                self.board, available_moves, self.white_turn
-            )
+            if self.decision_times is None:
+                move_selected = current_player.select_move(
+                    self.board, available_moves, self.white_turn
+                )
+            else:
+                start = perf_counter()
+                move_selected = current_player.select_move(
+                    self.board, available_moves, self.white_turn
+                )
+                self.decision_times[not self.white_turn].append(perf_counter() - start)
 
+            if self.history is not None:
+                self.history.append(
+                    (int(self.board), self.white_turn, dice_roll, move_selected)
+                )
             self.board.make_move(move_selected)
+            self.plies += 1
+            self.captures += move_selected.is_capture
             logger.debug("%s %s", current_player, move_selected)
             logger.debug("\n%s", self.board)
 
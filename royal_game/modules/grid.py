@@ -8,6 +8,9 @@ from royal_game.modules.grid_status import GridStatus
 class Grid:
     """Base class that represents non-start/end grids."""
 
+    # boards build one grid per square, slots make that cheaper
+    __slots__ = ("status", "name", "is_rosette")
+
     def __init__(
         self, name: str, is_rosette: bool, status: GridStatus = GridStatus.empty
     ) -> None:
@@ -31,10 +34,16 @@ class Grid:
     def __int__(self) -> int:
         return self.status.value
 
+    def clone(self) -> "Grid":
+        """Return a copy of the grid."""
+        return Grid(self.name, self.is_rosette, self.status)
+
 
 class StartEndGrid(Grid):
     """Starting grid."""
 
+    __slots__ = ("num_pieces",)
+
     def __init__(self, name: str, num_pieces: int = 7) -> None:
         super().__init__(name, is_rosette=False)
         if num_pieces < 0 or num_pieces > 7:
@@ -49,3 +58,7 @@ class StartEndGrid(Grid):
 
     def __int__(self) -> int:
         return self.num_pieces
+
+    def clone(self) -> "StartEndGrid":
+        """Return a copy of the grid."""
+        return StartEndGrid(self.name, self.num_pieces)
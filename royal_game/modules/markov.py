@@ -0,0 +1,225 @@
+"""
+Exact evaluation of a matchup as an absorbing Markov chain.
+
+Once both policies are fixed, a game is a Markov chain over
+(board seed, white_turn) pairs whose absorbing states are the end states.
+Each transition corresponds to one dice roll, so the expected number of
+steps before absorption is the expected game length in rolls, including
+passed turns.
+
+Policies are taken from Player.move_distribution, which must describe the
+exact choice probabilities of the player. The default implementation only
+fits deterministic players.
+"""
+
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from royal_game._exceptions import StateLimitExceeded
+from royal_game.modules.board import Board
+from royal_game.modules.game import dice_probabilities
+from royal_game.modules.player import Player
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MarkovChain:
+    """
+    Sparse transition system between the transient states of a matchup.
+
+    Transient states are numbered in discovery order starting from the
+    initial state. Transitions into end states are folded into white_win
+    and black_win, the one-step absorption probabilities of each state.
+    """
+
+    states: list[tuple[int, bool]]
+    rows: np.ndarray
+    cols: np.ndarray
+    probs: np.ndarray
+    white_win: np.ndarray
+    black_win: np.ndarray
+
+    @property
+    def num_states(self) -> int:
+        """Number of transient states."""
+        return len(self.states)
+
+    @property
+    def num_transitions(self) -> int:
+        """Number of stored transitions between transient states."""
+        return len(self.probs)
+
+    def step(self, values: np.ndarray) -> np.ndarray:
+        """Return the expected value of values after one transition from each state."""
+        return np.bincount(
+            self.rows, weights=self.probs * values[self.cols], minlength=self.num_states
+        )
+
+
+@dataclass
+class ExactResult:
+    """Solution of a matchup from its initial state."""
+
+    white_win_probability: float
+    expected_length: float
+    num_states: int
+    num_transitions: int
+
+
+def build_chain(
+    white_player: Player,
+    black_player: Player,
+    board_seed: int = 122138132480,
+    max_states: Optional[int] = None,
+) -> MarkovChain:
+    """
+    Explore every state reachable from board_seed with white to move.
+
+    board_seed must not be an end state.
+    """
+    index: dict[tuple[int, bool], int] = {}
+    states: list[tuple[int, bool]] = []
+    rows: list[int] = []
+    cols: list[int] = []
+    probs: list[float] = []
+    white_win: list[float] = []
+    black_win: list[float] = []
+    queue: deque[tuple[int, bool]] = deque()
+
+    def discover(state: tuple[int, bool]) -> int:
+        if state not in index:
+            if max_states is not None and len(states) >= max_states:
+                raise StateLimitExceeded(max_states)
+            index[state] = len(states)
+            states.append(state)
+            white_win.append(0.0)
+            black_win.append(0.0)
+            queue.append(state)
+        return index[state]
+
+    def add_transition(row: int, seed: int, white_turn: bool, prob: float) -> None:
+        # check the WE and BE counts without decoding the board
+        if (seed >> 31) & 0b111 == 7:
+            white_win[row] += prob
+        elif (seed >> 37) & 0b111 == 7:
+            black_win[row] += prob
+        else:
+            rows.append(row)
+            cols.append(discover((seed, white_turn)))
+            probs.append(prob)
+
+    discover((board_seed, True))
+    while queue:
+        seed, white_turn = queue.popleft()
+        row = index[(seed, white_turn)]
+        board = Board(seed)
+        player = white_player if white_turn else black_player
+
+        add_transition(row, seed, not white_turn, dice_probabilities[0])
+        for dice_roll in range(1, 5):
+            available_moves = board.get_available_moves(white_turn, dice_roll)
+            if not available_moves:
+                add_transition(row, seed, not white_turn, dice_probabilities[dice_roll])
+                continue
+
+            for move, move_prob in player.move_distribution(board, available_moves, white_turn):
+                child = board.clone()
+                child.make_move(move)
+                add_transition(
+                    row,
+                    int(child),
+                    white_turn if move.is_rosette else not white_turn,
+                    dice_probabilities[dice_roll] * move_prob,
+                )
+
+    return MarkovChain(
+        states,
+        np.array(rows, dtype=np.int64),
+        np.array(cols, dtype=np.int64),
+        np.array(probs, dtype=np.float64),
+        np.array(white_win, dtype=np.float64),
+        np.array(black_win, dtype=np.float64),
+    )
+
+
+def remaining_error(change: float, previous_change: float) -> float:
+    """
+    Estimate the distance to the fixed point of a contracting iteration.
+
+    change and previous_change are the largest changes of the last two
+    steps. Their ratio estimates the factor rho by which every step
+    shrinks the distance, so the remaining steps add up to about
+    change * rho / (1 - rho). While changes do not shrink, the estimate is
+    infinite. It is no strict bound, since the ratio of two changes only
+    approaches rho as the iteration settles.
+    """
+    if change == 0:
+        return 0.0
+    if change >= previous_change:
+        return np.inf
+    rho = change / previous_change
+    return change * rho / (1 - rho)
+
+
+def solve_chain(
+    chain: MarkovChain, tolerance: float = 1e-12, max_iterations: int = 1_000_000
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Solve for the white win probability and expected remaining length of every state.
+
+    Both are fixed points of a linear system whose transient transition
+    matrix has spectral radius below one, so they are found by iterating.
+    A change of delta per step can leave up to delta / (1 - rho) to go for
+    spectral radius rho, which is close to one for long games, so iteration
+    stops once the remaining_error estimate is within tolerance, relative to
+    the magnitude for expected lengths. A warning is logged if that takes
+    more than max_iterations.
+    """
+    win_probability = np.zeros(chain.num_states)
+    expected_length = np.zeros(chain.num_states)
+    win_change = length_change = 0.0
+    for _ in range(max_iterations):
+        next_win_probability = chain.white_win + chain.step(win_probability)
+        next_expected_length = 1 + chain.step(expected_length)
+        previous_win_change, previous_length_change = win_change, length_change
+        win_change = np.max(np.abs(next_win_probability - win_probability), initial=0)
+        length_change = np.max(np.abs(next_expected_length - expected_length), initial=0)
+        win_error = remaining_error(win_change, previous_win_change)
+        length_error = remaining_error(length_change, previous_length_change)
+        # the expected length is compared relative to its magnitude
+        converged = win_error <= tolerance and length_error <= tolerance * max(
+            1.0, np.max(next_expected_length, initial=0)
+        )
+        win_probability, expected_length = next_win_probability, next_expected_length
+        if converged:
+            break
+    else:
+        logger.warning("Markov chain did not converge within %d iterations.", max_iterations)
+    return win_probability, expected_length
+
+
+def evaluate_exact(
+    white_player: Player,
+    black_player: Player,
+    board_seed: int = 122138132480,
+    max_states: Optional[int] = None,
+    tolerance: float = 1e-12,
+) -> ExactResult:
+    """Compute the exact white win probability and expected game length."""
+    board = Board(board_seed)
+    if board.is_end_state():
+        return ExactResult(float(board.board["WE"].num_pieces == 7), 0.0, 0, 0)
+
+    chain = build_chain(white_player, black_player, board_seed, max_states)
+    win_probability, expected_length = solve_chain(chain, tolerance)
+    return ExactResult(
+        float(win_probability[0]),
+        float(expected_length[0]),
+        chain.num_states,
+        chain.num_transitions,
+    )
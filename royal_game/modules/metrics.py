@@ -0,0 +1,191 @@
+"""
+Live tournament metrics in the Prometheus text exposition format.
+
+Workers time every select_move call and bin the latencies into one
+Histogram per player for each chunk of games they play, so only a few
+bucket counts per chunk cross process boundaries. The parent merges chunks
+into a TournamentMetrics, and MetricsServer serves its current state over
+HTTP from a background thread:
+
+    royal_game_games_completed_total    counter per pairing
+    royal_game_games_remaining          gauge
+    royal_game_games_per_second         gauge, since the start of the run
+    royal_game_moves_per_second         gauge, since the start of the run
+    royal_game_worker_utilization       gauge, time spent in games per worker
+    royal_game_eta_seconds              gauge, NaN until every pairing is measured
+    royal_game_decision_seconds         histogram per player
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterable, Optional
+
+from royal_game.modules.results import GameResult
+
+# upper bounds in seconds, from instant heuristics to deep searches
+LATENCY_BUCKETS = (1e-5, 3e-5, 1e-4, 3e-4, 1e-3, 3e-3, 1e-2, 3e-2, 0.1, 0.3, 1.0, 3.0)
+
+
+def _value(value: float) -> str:
+    return "NaN" if value != value else repr(value)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """Observation counts per bucket, with a final bucket for values above all bounds."""
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+
+    def observe(self, values: Iterable[float]) -> None:
+        """Add observations."""
+        for value in values:
+            self.counts[bisect_left(self.bounds, value)] += 1
+            self.total += value
+
+    def merge(self, other: "Histogram") -> None:
+        """Add the observations of a histogram with the same bounds."""
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.total += other.total
+
+    @property
+    def count(self) -> int:
+        """Number of observations."""
+        return sum(self.counts)
+
+    def render(self, name: str, labels: str) -> list[str]:
+        """Return the sample lines of the histogram."""
+        lines, cumulative = [], 0
+        for bound, count in zip((*self.bounds, "+Inf"), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {_value(self.total)}")
+        lines.append(f"{name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+class TournamentMetrics:
+    """
+    Aggregated progress of a tournament run, safe to render from another thread.
+
+    num_games is the number of games the run has to play, and
+    remaining_seconds optionally estimates the work left in games that have
+    not been handed to a worker yet.
+    """
+
+    def __init__(
+        self,
+        pairing_names: list[str],
+        num_games: int,
+        num_workers: int,
+        remaining_seconds: Optional[Callable[[], Optional[float]]] = None,
+    ) -> None:
+        self.pairing_names = pairing_names
+        self.num_games = num_games
+        self.num_workers = num_workers
+        self.remaining_seconds = remaining_seconds
+        self.start = time.monotonic()
+        self.games_completed = [0] * len(pairing_names)
+        self.moves = 0
+        self.busy_seconds = 0.0
+        self.decision_seconds: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, results: list[GameResult], latencies: dict[str, Histogram]) -> None:
+        """Add a finished chunk of games and the decision latencies of its players."""
+        with self._lock:
+            for result in results:
+                self.games_completed[result.pairing] += 1
+                self.moves += result.plies
+                self.busy_seconds += result.duration
+            for name, histogram in latencies.items():
+                self.decision_seconds.setdefault(name, Histogram(histogram.bounds)).merge(
+                    histogram
+                )
+
+    def render(self) -> str:
+        """Return the current metrics in the Prometheus text format."""
+        with self._lock:
+            elapsed = max(time.monotonic() - self.start, 1e-9)
+            games = sum(self.games_completed)
+            remaining = self.remaining_seconds() if self.remaining_seconds is not None else None
+            eta = remaining / self.num_workers if remaining is not None else float("nan")
+
+            lines = [
+                "# HELP royal_game_games_completed_total Games completed per pairing.",
+                "# TYPE royal_game_games_completed_total counter",
+            ]
+            for name, completed in zip(self.pairing_names, self.games_completed):
+                lines.append(
+                    f'royal_game_games_completed_total{{pairing="{_label(name)}"}} {completed}'
+                )
+            for name, help_text, value in (
+                (
+                    "games_remaining",
+                    "Games not completed yet.",
+                    self.num_games - games,
+                ),
+                ("games_per_second", "Games completed per second.", games / elapsed),
+                ("moves_per_second", "Moves made per second.", self.moves / elapsed),
+                (
+                    "worker_utilization",
+                    "Fraction of worker time spent playing games.",
+                    self.busy_seconds / (self.num_workers * elapsed),
+                ),
+                ("eta_seconds", "Estimated seconds until the run finishes.", eta),
+            ):
+                lines.append(f"# HELP royal_game_{name} {help_text}")
+                lines.append(f"# TYPE royal_game_{name} gauge")
+                lines.append(f"royal_game_{name} {_value(value)}")
+
+            lines.append("# HELP royal_game_decision_seconds Time spent selecting a move.")
+            lines.append("# TYPE royal_game_decision_seconds histogram")
+            for name, histogram in self.decision_seconds.items():
+                lines.extend(
+                    histogram.render("royal_game_decision_seconds", f'player="{_label(name)}"')
+                )
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serves metrics.render() at /metrics from a daemon thread."""
+
+    def __init__(self, metrics: TournamentMetrics, port: int, host: str = "127.0.0.1") -> None:
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def port(self) -> int:
+        """Port the server listens on, useful when started on port 0."""
+        return self.server.server_address[1]
+
+    def __enter__(self) -> "MetricsServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
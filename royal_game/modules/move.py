@@ -72,6 +72,20 @@ class Move:
     def __hash__(self) -> int:
         return hash((self.grid1, self.grid2))
 
+    @property
+    def path_position(self) -> int:
+        """
+        Position along the mover's path that the move starts from.
+
+        Onboard moves start from position 0 and grids are numbered 1-14 in the
+        order pieces pass them. Since each position holds at most one piece,
+        this identifies a move among the available moves of a turn, and the
+        identifier is the same for both colors.
+        """
+        if self.is_onboard:
+            return 0
+        return int(self.grid1.lstrip("WB"))
+
     def verify_move(self) -> None:
         """Check move validity."""
         try:
@@ -0,0 +1,70 @@
+"""Optional memoization layer for move generation."""
+
+from collections import OrderedDict
+
+from royal_game.modules.board import Board
+from royal_game.modules.move import Move
+
+
+class MoveCache:
+    """
+    Bounded LRU cache of available moves.
+
+    Entries are keyed by (board seed, white_turn, dice_roll) and hold the
+    tuple returned by Board.get_available_moves. The same tuple is returned
+    on every hit, so callers must not mutate the cached moves.
+
+    hits, misses and evictions are cumulative counters that can be used
+    to size the cache for a given workload.
+    """
+
+    def __init__(self, maxsize: int = 65536) -> None:
+        if maxsize <= 0:
+            raise ValueError(f"Cache size must be positive, got {maxsize}.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache: OrderedDict[tuple[int, bool, int], tuple[Move, ...]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __repr__(self) -> str:
+        return (
+            f"MoveCache(size={len(self)}/{self.maxsize}, hits={self.hits}, "
+            f"misses={self.misses}, evictions={self.evictions})"
+        )
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get_available_moves(
+        self, board: Board, white_turn: bool, dice_roll: int
+    ) -> tuple[Move, ...]:
+        """Drop-in replacement for board.get_available_moves."""
+        key = (int(board), white_turn, dice_roll)
+        moves = self._cache.get(key)
+
+        if moves is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return moves
+
+        self.misses += 1
+        moves = board.get_available_moves(white_turn, dice_roll)
+        self._cache[key] = moves
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+        return moves
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
@@ -20,3 +20,27 @@ class Player:
     ) -> Move:
         """All subclasses must implement this method."""
         pass
+
+    @classmethod
+    def share_tables(cls) -> dict:
+        """
+        Return the large tables instances use, as SharedTables by key.
+
+        Called once per run in the parent process before any instance is
+        created, so that workers can attach to the tables with
+        royal_game.modules.shared_table.get_shared(key) instead of loading
+        them. The default shares nothing.
+        """
+        return {}
+
+    def move_distribution(
+        self, board: Board, available_moves: Iterable[Move], white_turn: bool
+    ) -> list[tuple[Move, float]]:
+        """
+        Return the probability of selecting each move.
+
+        Moves that are never selected may be omitted. The default treats
+        select_move as deterministic, so players that select moves randomly
+        should override this to support exact evaluation.
+        """
+        return [(self.select_move(board, available_moves, white_turn), 1.0)]
@@ -0,0 +1,191 @@
+"""
+Compiled move tables of deterministic players.
+
+A player is compiled by asking it for a move in every (board seed, side to
+move, dice roll) with more than one available move, and storing the path
+position (see Move.path_position) of the chosen move under the key
+
+    seed << 3 | (black to move) << 2 | (dice roll - 1)
+
+Keys are kept in an ascending uint64 array next to a uint8 array of path
+positions, so a lookup is a binary search of a few dozen steps at most.
+Players that choose randomly are compiled to their most likely move, the
+first one among ties.
+
+Color-symmetric players can be compiled for white to move only, in which
+case black's positions are looked up on the color-swapped board. Path
+positions are the same for both colors, so no move translation is needed.
+"""
+
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from royal_game.modules.board import Board
+from royal_game.modules.move import Move
+from royal_game.modules.player import Player
+from royal_game.modules.registry import load_player
+from royal_game.modules.shared_table import SharedTable
+from royal_game.modules.symmetry import swap_colors
+from royal_game.modules.transitions import is_end_seed
+
+FORMAT_VERSION = 1
+
+
+def policy_key(seed: int, white_turn: bool, dice_roll: int) -> int:
+    """Return the table key of a decision."""
+    return (seed << 3) | ((not white_turn) << 2) | (dice_roll - 1)
+
+
+def dice_roll_of(available_moves: Iterable[Move]) -> int:
+    """
+    Infer the dice roll from the moves available for it.
+
+    A move onto the occupied center rosette lands on 9 instead, so moves to
+    9 are only used when there is nothing else to go by. Two moves can only
+    both land on 9 if one of them is such a move, from right behind the other.
+    """
+    to_nine = []
+    for move in available_moves:
+        if move.grid2 == "9":
+            to_nine.append(move.path_position)
+            continue
+        destination = 15 if move.is_ascension else int(move.grid2.lstrip("WB"))
+        return destination - move.path_position
+    return 9 - max(to_nine)
+
+
+def preferred_move(
+    player: Player, board: Board, available_moves: Iterable[Move], white_turn: bool
+) -> Move:
+    """Return the move a player is most likely to select."""
+    distribution = player.move_distribution(board, available_moves, white_turn)
+    # max keeps the first of several equally likely moves
+    return max(distribution, key=lambda pair: pair[1])[0]
+
+
+@dataclass
+class PolicyTable:
+    """Path position of the chosen move by decision key."""
+
+    keys: np.ndarray
+    moves: np.ndarray
+    player: str
+    symmetric: bool = False
+
+    def __post_init__(self) -> None:
+        self.keys = np.ascontiguousarray(self.keys, dtype=np.uint64)
+        self.moves = np.ascontiguousarray(self.moves, dtype=np.uint8)
+        # bisecting memoryviews of the arrays avoids numpy's per-call overhead
+        self._keys = memoryview(self.keys)
+        self._moves = memoryview(self.moves)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def lookup(self, seed: int, white_turn: bool, dice_roll: int) -> Optional[int]:
+        """Return the path position of the compiled move, None if the decision is missing."""
+        if self.symmetric and not white_turn:
+            seed, white_turn = swap_colors(seed), True
+        key = policy_key(seed, white_turn, dice_roll)
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return self._moves[index]
+        return None
+
+    def share(self) -> SharedTable:
+        """Copy the table into shared memory."""
+        return SharedTable.create(
+            {"keys": self.keys, "moves": self.moves},
+            {"player": self.player, "symmetric": self.symmetric},
+        )
+
+    @classmethod
+    def from_shared(cls, table: SharedTable) -> "PolicyTable":
+        """Return a table backed by shared memory without copying it."""
+        return cls(table["keys"], table["moves"], **table.metadata)
+
+    def save(self, path: Path) -> None:
+        """Write the table to a .npz file."""
+        np.savez(
+            path,
+            keys=self.keys,
+            moves=self.moves,
+            player=np.array(self.player),
+            symmetric=np.array(self.symmetric),
+            version=np.array(FORMAT_VERSION),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "PolicyTable":
+        """Load a table saved with save."""
+        with np.load(path) as data:
+            version = int(data["version"])
+            if version != FORMAT_VERSION:
+                raise ValueError(
+                    f"{path} has policy table format {version}, expected {FORMAT_VERSION}."
+                )
+            return cls(
+                data["keys"], data["moves"], str(data["player"]), bool(data["symmetric"])
+            )
+
+
+def _compile_block(
+    player_name: str, seeds: np.ndarray, symmetric: bool
+) -> tuple[np.ndarray, np.ndarray]:
+    player = load_player(player_name)()
+    keys, moves = [], []
+    for seed in seeds.tolist():
+        if is_end_seed(seed):
+            continue
+        # canonical seeds stand for themselves with white to move and their
+        # color-swapped board with black to move
+        sides = [(seed, True)] if symmetric else [(seed, True), (swap_colors(seed), False)]
+        for side_seed, white_turn in sides:
+            board = Board(side_seed, no_verify=True)
+            for dice_roll in range(1, 5):
+                available_moves = board.get_available_moves(white_turn, dice_roll)
+                if len(available_moves) < 2:
+                    continue
+                move = preferred_move(player, board, available_moves, white_turn)
+                keys.append(policy_key(side_seed, white_turn, dice_roll))
+                moves.append(move.path_position)
+    return np.array(keys, dtype=np.uint64), np.array(moves, dtype=np.uint8)
+
+
+def compile_policy(
+    player: str,
+    states: np.ndarray,
+    symmetric: bool = False,
+    processes: Optional[int] = None,
+    block_size: int = 10_000,
+) -> PolicyTable:
+    """
+    Compile a player over canonical states such as those of reachable_states.
+
+    player is anything load_player accepts, so that worker processes can
+    load it themselves. Blocks of block_size states are compiled in a
+    process pool unless processes is 1.
+    """
+    blocks = [states[i : i + block_size] for i in range(0, len(states), block_size)]
+    if processes == 1:
+        parts = [_compile_block(player, block, symmetric) for block in blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            parts = list(
+                executor.map(
+                    _compile_block,
+                    [player] * len(blocks),
+                    blocks,
+                    [symmetric] * len(blocks),
+                )
+            )
+
+    keys = np.concatenate([keys for keys, _ in parts] or [np.empty(0, np.uint64)])
+    moves = np.concatenate([moves for _, moves in parts] or [np.empty(0, np.uint8)])
+    order = np.argsort(keys, kind="stable")
+    return PolicyTable(keys[order], moves[order], player, symmetric)
@@ -0,0 +1,197 @@
+"""
+Sampling profiler for tournament workers.
+
+Workers profile every chunk of games they play with a Sampler: a SIGPROF
+timer interrupts the process every interval seconds of CPU time, and each
+interruption records the Python stack it lands in, from the function that
+started the sampler in. The timer fires at the granularity of the kernel
+clock, so the CPU time of the chunk is measured separately and split
+between stacks by their share of the samples. A chunk reports a Profile of
+stack counts, so only a few hundred distinct stacks per chunk cross
+process boundaries, and the parent merges the chunks of all workers into
+one Profile.
+
+Every sample is attributed to one subsystem by the outermost matching
+frame of its stack:
+
+    select_move: NAME   a player's select_move or move_distribution,
+                        including the move generation it does to look ahead
+    engine              move generation, making moves and decoding boards
+    game loop           the rest of Game.play, such as dice and logging
+    other               outside games, such as setting them up
+
+Stacks are written in the collapsed format read by flamegraph.pl and
+speedscope, one line per distinct stack of module:function frames from the
+outermost in, followed by its number of samples.
+
+With trace_memory, tracemalloc also runs during every chunk. A Profile
+then holds the peak traced memory of any chunk and, by allocation site,
+the most memory still held at the end of a chunk, which points at caches
+and leaks.
+
+Sampling relies on signal.setitimer, which is not available on Windows.
+"""
+
+import signal
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Iterator, Optional
+
+from royal_game.modules.board import Board
+from royal_game.modules.game import Game
+from royal_game.modules.move_cache import MoveCache
+from royal_game.modules.player import Player
+
+_ENGINE_CODES = frozenset(
+    function.__code__
+    for function in (
+        Board.__init__,
+        Board.__int__,
+        Board.clone,
+        Board.get_available_moves,
+        Board.is_end_state,
+        Board.make_move,
+        MoveCache.get_available_moves,
+    )
+)
+_GAME_LOOP_CODE = Game.play.__code__
+_PLAYER_FUNCTIONS = ("select_move", "move_distribution")
+
+# allocation sites kept per chunk, the rest are too small to matter
+_MAX_SITES = 100
+
+# frame labels by code object, built once per process
+_labels: dict[CodeType, str] = {}
+
+
+def is_supported() -> bool:
+    """Return whether sampling is possible on this platform."""
+    return hasattr(signal, "setitimer")
+
+
+def _label(frame: FrameType) -> str:
+    code = frame.f_code
+    label = _labels.get(code)
+    if label is None:
+        # code objects only carry qualified names from Python 3.11
+        name = getattr(code, "co_qualname", code.co_name)
+        label = _labels[code] = f"{frame.f_globals.get('__name__', '?')}:{name}"
+    return label
+
+
+def _subsystem(frames: list[FrameType]) -> str:
+    """Return the subsystem of a stack given from the outermost frame in."""
+    in_game = False
+    for frame in frames:
+        code = frame.f_code
+        if code.co_name in _PLAYER_FUNCTIONS:
+            player = frame.f_locals.get("self")
+            if isinstance(player, Player):
+                return f"select_move: {player}"
+        if code in _ENGINE_CODES:
+            return "engine"
+        in_game = in_game or code is _GAME_LOOP_CODE
+    return "game loop" if in_game else "other"
+
+
+@dataclass
+class Profile:
+    """Samples of stacks and subsystems, with allocation sites if memory was traced."""
+
+    cpu_seconds: float = 0.0
+    stacks: Counter = field(default_factory=Counter)
+    subsystems: Counter = field(default_factory=Counter)
+    # most bytes held at the end of any chunk by "file:line"
+    allocations: Counter = field(default_factory=Counter)
+    peak_memory: int = 0
+
+    def add(self, frame: Optional[FrameType], root: Optional[FrameType] = None) -> None:
+        """Record a sample of the stack from root to frame, its innermost frame."""
+        frames = []
+        while frame is not None:
+            frames.append(frame)
+            if frame is root:
+                break
+            frame = frame.f_back
+        frames.reverse()
+        self.stacks[";".join(map(_label, frames))] += 1
+        self.subsystems[_subsystem(frames)] += 1
+
+    def merge(self, other: "Profile") -> None:
+        """Add the samples of another profile."""
+        self.cpu_seconds += other.cpu_seconds
+        self.stacks.update(other.stacks)
+        self.subsystems.update(other.subsystems)
+        self.allocations |= other.allocations
+        self.peak_memory = max(self.peak_memory, other.peak_memory)
+
+    @property
+    def num_samples(self) -> int:
+        """Number of samples taken."""
+        return sum(self.subsystems.values())
+
+    def seconds(self, samples: int) -> float:
+        """Return the CPU time a number of samples stands for."""
+        return self.cpu_seconds * samples / max(self.num_samples, 1)
+
+    def self_samples(self) -> Counter:
+        """Return the samples of every function that were taken inside it."""
+        counts: Counter = Counter()
+        for stack, samples in self.stacks.items():
+            counts[stack.rpartition(";")[2]] += samples
+        return counts
+
+    def total_samples(self) -> Counter:
+        """Return the samples of every function that were taken inside it or its callees."""
+        counts: Counter = Counter()
+        for stack, samples in self.stacks.items():
+            for label in set(stack.split(";")):
+                counts[label] += samples
+        return counts
+
+    def write_collapsed(self, path: Path) -> None:
+        """Write the stacks in the collapsed format of flame graph tools."""
+        with open(path, "w") as fout:
+            for stack, samples in sorted(self.stacks.items()):
+                fout.write(f"{stack} {samples}\n")
+
+
+@dataclass
+class Sampler:
+    """Settings of the profiler run in every worker."""
+
+    interval: float = 0.001
+    trace_memory: bool = False
+
+    @contextmanager
+    def record(self) -> Iterator[Profile]:
+        """Profile the process while the block runs, filling the Profile it yields."""
+        profile = Profile()
+        # the caller of the with statement, below this generator and contextlib's __enter__
+        root = sys._getframe(2)
+        previous = signal.signal(signal.SIGPROF, lambda _, frame: profile.add(frame, root))
+        if self.trace_memory:
+            tracemalloc.start()
+        start = time.process_time()
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        try:
+            yield profile
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            profile.cpu_seconds = time.process_time() - start
+            signal.signal(signal.SIGPROF, previous)
+            if self.trace_memory:
+                snapshot = tracemalloc.take_snapshot().filter_traces(
+                    [tracemalloc.Filter(False, tracemalloc.__file__)]
+                )
+                profile.peak_memory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                for stat in snapshot.statistics("lineno")[:_MAX_SITES]:
+                    frame = stat.traceback[0]
+                    profile.allocations[f"{frame.filename}:{frame.lineno}"] += stat.size
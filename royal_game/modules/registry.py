@@ -0,0 +1,117 @@
+"""
+Discovery and lazy loading of player implementations.
+
+Players are found in two places without importing them:
+
+    - modules of the royal_game.players package, where the player class
+      name is the module name in camel case
+    - entry points of installed packages in the royal_game.players group,
+      for example in a plugin's pyproject.toml:
+
+        [project.entry-points."royal_game.players"]
+        my_player = "my_package.my_player:MyPlayer"
+
+Discovery only lists module names and entry point metadata, and a player
+module is imported the first time its class is requested, so startup time
+does not grow with the number of available players.
+"""
+
+import pkgutil
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib import import_module
+from importlib.metadata import entry_points
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Union
+
+from royal_game._exceptions import PlayerNotFound
+from royal_game.modules.player import Player
+
+ENTRY_POINT_GROUP = "royal_game.players"
+
+
+def filename_to_class_name(filename: str) -> str:
+    """Convert snake class filename to capitalized camel case class name."""
+    return "".join([word.capitalize() for word in filename.split("_")])
+
+
+@dataclass(frozen=True)
+class PlayerSpec:
+    """Where to import a player class from."""
+
+    name: str
+    module: str
+    class_name: str
+
+    def load(self) -> type[Player]:
+        """Import the module and return the player class."""
+        return _load(self.module, self.class_name)
+
+
+@lru_cache(maxsize=None)
+def _load(module: str, class_name: str) -> type[Player]:
+    try:
+        return getattr(import_module(module), class_name)
+    except (ImportError, AttributeError) as e:
+        raise PlayerNotFound(f"{module}:{class_name}") from e
+
+
+@lru_cache(maxsize=1)
+def _builtin_players() -> dict[str, PlayerSpec]:
+    players = {}
+    search_locations = find_spec("royal_game.players").submodule_search_locations
+    for module_info in pkgutil.iter_modules(search_locations):
+        if not module_info.ispkg:
+            players[module_info.name] = PlayerSpec(
+                module_info.name,
+                f"royal_game.players.{module_info.name}",
+                filename_to_class_name(module_info.name),
+            )
+    return players
+
+
+def _player_dirs() -> list[str]:
+    return find_spec("royal_game.players").submodule_search_locations
+
+
+@lru_cache(maxsize=1)
+def _plugin_players() -> dict[str, PlayerSpec]:
+    players = {}
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        module, _, class_name = entry_point.value.partition(":")
+        players[entry_point.name] = PlayerSpec(entry_point.name, module, class_name)
+    return players
+
+
+def discover_players() -> dict[str, PlayerSpec]:
+    """Return the spec of every available player by name, without importing any of them."""
+    # built-in players take precedence over plugins of the same name
+    return {**_plugin_players(), **_builtin_players()}
+
+
+def load_player(player: Union[str, Path]) -> type[Player]:
+    """
+    Return the player class named by a registry name, a player file or module:Class.
+
+    Player files are looked up by name, so royal_game/players/greedy.py and
+    greedy refer to the same player. Files outside royal_game/players are
+    not imported, players defined elsewhere are given as module:Class.
+    """
+    player = str(player)
+    if player.endswith(".py"):
+        path = Path(player).resolve()
+        if not any(path.parent == Path(location).resolve() for location in _player_dirs()):
+            raise PlayerNotFound(player)
+        name = path.stem
+    elif ":" in player:
+        module, _, class_name = player.partition(":")
+        return _load(module, class_name)
+    else:
+        name = player
+
+    # installed distributions are only scanned for names that are not built in
+    spec = _builtin_players().get(name) or _plugin_players().get(name)
+    if spec is None:
+        raise PlayerNotFound(player)
+    return spec.load()
@@ -0,0 +1,437 @@
+"""
+Move quality of recorded games against a reference evaluator.
+
+Every decision with more than one available move is scored by its regret,
+the win probability the mover gives up by not choosing the best move:
+
+    regret = max over moves of value(afterstate) - value(chosen afterstate)
+
+where the value of an afterstate is the mover's win probability before the
+next dice roll. Decisions are taken in the canonical form of
+royal_game.modules.selfplay samples, a white-to-move seed, a dice roll and
+the path position of the chosen move, so recorded samples and replayed
+games are scored alike.
+
+The reference is a ValueTable holding the win probability of the side to
+move in every canonical state of a transition graph, solved exactly by
+solve_values. Any object with the same values method can stand in for it.
+
+Regret is totalled per player, per type of the chosen move and per game
+phase. Phases split games into thirds of the distance both colors have to
+cover, as measured by the sum of their pip counts.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from royal_game.modules.features import path_occupancy, pip_count, start_end_counts
+from royal_game.modules.game import dice_probabilities
+from royal_game.modules.markov import remaining_error
+from royal_game.modules.move import Move
+from royal_game.modules.player import Player
+from royal_game.modules.selfplay import SAMPLE_DTYPE, play_seeded_game
+from royal_game.modules.shared_table import (
+    SharedTable,
+    get_shared,
+    install_handles,
+    published_handles,
+)
+from royal_game.modules.symmetry import canonicalize, swap_colors_batch
+from royal_game.modules.transitions import TransitionGraph, afterstates
+
+FORMAT_VERSION = 1
+
+# a chosen move counts as the first of these types that applies
+MOVE_TYPES = ("rosette", "capture", "ascension", "onboard", "other")
+PHASES = ("opening", "middlegame", "endgame")
+
+# pip count of a color with all pieces at the start
+_FULL_PIP_COUNT = 7 * 15
+
+logger = logging.getLogger(__name__)
+
+
+def move_type(move: Move) -> int:
+    """Return the index of the type of a move in MOVE_TYPES."""
+    if move.is_rosette:
+        return 0
+    if move.is_capture:
+        return 1
+    if move.is_ascension:
+        return 2
+    if move.is_onboard:
+        return 3
+    return 4
+
+
+def game_phase(seeds: np.ndarray) -> np.ndarray:
+    """Return the index in PHASES of the phase of every seed."""
+    seeds = np.atleast_1d(np.asarray(seeds, dtype=np.uint64))
+    counts = start_end_counts(seeds)
+    white, black = path_occupancy(seeds)
+    remaining = pip_count(white, counts[:, 0]) + pip_count(black, counts[:, 2])
+    progress = 1 - remaining / (2 * _FULL_PIP_COUNT)
+    return np.minimum(progress * len(PHASES), len(PHASES) - 1).astype(np.intp)
+
+
+@dataclass
+class ValueTable:
+    """Win probability of the side to move by canonical seed."""
+
+    states: np.ndarray
+    probabilities: np.ndarray
+
+    def __post_init__(self) -> None:
+        self.states = np.ascontiguousarray(self.states, dtype=np.uint64)
+        self.probabilities = np.ascontiguousarray(self.probabilities, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def values(self, seeds: np.ndarray) -> np.ndarray:
+        """Return the win probabilities of canonical seeds, which must be in the table."""
+        seeds = np.asarray(seeds, dtype=np.uint64)
+        indices = np.searchsorted(self.states, seeds)
+        if (indices >= len(self.states)).any() or (self.states[indices] != seeds).any():
+            raise KeyError("Some seeds are not states of the value table.")
+        return self.probabilities[indices]
+
+    def share(self) -> SharedTable:
+        """Copy the table into shared memory."""
+        return SharedTable.create({"states": self.states, "probabilities": self.probabilities})
+
+    @classmethod
+    def from_shared(cls, table: SharedTable) -> "ValueTable":
+        """Return a table backed by shared memory without copying it."""
+        return cls(table["states"], table["probabilities"])
+
+    def save(self, path: Path) -> None:
+        """Write the table to a .npz file."""
+        np.savez(
+            path,
+            states=self.states,
+            probabilities=self.probabilities,
+            version=np.array(FORMAT_VERSION),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "ValueTable":
+        """Load a table saved with save."""
+        with np.load(path) as data:
+            version = int(data["version"])
+            if version != FORMAT_VERSION:
+                raise ValueError(
+                    f"{path} has value table format {version}, expected {FORMAT_VERSION}."
+                )
+            return cls(data["states"], data["probabilities"])
+
+
+def solve_values(
+    graph: TransitionGraph, tolerance: float = 1e-10, max_iterations: int = 100_000
+) -> ValueTable:
+    """
+    Solve for the win probability of the side to move in every state of a transition graph.
+
+    Both sides maximize their own win probability, so the values are the
+    fixed point of one step of optimal play after each dice roll. Since
+    every game ends with probability one, they are found by iterating
+    until the distance to the fixed point, as estimated by
+    royal_game.modules.markov.remaining_error from the last two changes,
+    is within tolerance. A small change alone does not suffice, as games
+    can run long enough for each step to barely shrink the distance.
+    """
+    states = np.asarray(graph.states)
+    counts = start_end_counts(states)
+    probabilities = (counts[:, 1] == 7).astype(np.float64)
+    transient = (counts[:, 1] != 7) & (counts[:, 3] != 7)
+    if not transient.any():
+        return ValueTable(states, probabilities)
+
+    # a roll of 0 passes to the color-swapped state, and the rows of the
+    # other rolls are delimited by the row starts of transient states since
+    # end states have no successors
+    passes = graph.index_of(swap_colors_batch(states[transient]))
+    starts = {
+        dice_roll: np.asarray(graph.indptr[dice_roll][:-1])[transient]
+        for dice_roll in range(1, 5)
+    }
+    change = 0.0
+    for iteration in range(1, max_iterations + 1):
+        updated = dice_probabilities[0] * (1 - probabilities[passes])
+        for dice_roll in range(1, 5):
+            successor = probabilities[graph.indices[dice_roll]]
+            mover = np.where(graph.extra_turn[dice_roll], successor, 1 - successor)
+            updated += dice_probabilities[dice_roll] * np.maximum.reduceat(
+                mover, starts[dice_roll]
+            )
+        previous_change = change
+        change = np.max(np.abs(updated - probabilities[transient]))
+        probabilities[transient] = updated
+        if remaining_error(change, previous_change) <= tolerance:
+            logger.debug("Values converged after %d iterations.", iteration)
+            break
+    else:
+        logger.warning("Values did not converge within %d iterations.", max_iterations)
+    return ValueTable(states, probabilities)
+
+
+def table_key(path: Path) -> str:
+    """Return the key a value table file is shared under."""
+    return f"values:{path.resolve()}"
+
+
+@lru_cache(maxsize=None)
+def reference_table(path: Path) -> ValueTable:
+    """Return the value table of a file, attaching to shared memory if it is published."""
+    shared = get_shared(table_key(path))
+    return ValueTable.load(path) if shared is None else ValueTable.from_shared(shared)
+
+
+def score_decisions(
+    evaluator: ValueTable, states: np.ndarray, rolls: np.ndarray, moves: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Score canonical decisions given as seeds, dice rolls and chosen path positions.
+
+    Return which decisions had more than one available move, and the
+    regret, chosen move type and phase of each of those.
+    """
+    scored = np.zeros(len(states), dtype=bool)
+    chosen, types, children, extra_turns, row_starts = [], [], [], [], []
+    for i, (seed, dice_roll, position) in enumerate(
+        zip(states.tolist(), rolls.tolist(), moves.tolist())
+    ):
+        options = afterstates(seed, dice_roll)
+        if len(options) < 2:
+            continue
+        scored[i] = True
+        row_starts.append(len(children))
+        for move, child, extra_turn in options:
+            if move.path_position == position:
+                chosen.append(len(children))
+                types.append(move_type(move))
+            children.append(child)
+            extra_turns.append(extra_turn)
+        if len(chosen) < len(row_starts):
+            raise ValueError(
+                f"No move from path position {position} on {seed} with {dice_roll}."
+            )
+
+    if not children:
+        empty = np.empty(0, dtype=np.intp)
+        return scored, np.empty(0), empty, empty
+    values = evaluator.values(np.array(children, dtype=np.uint64))
+    # the mover only keeps the value of a successor if the move gave an extra turn
+    mover = np.where(extra_turns, values, 1 - values)
+    best = np.maximum.reduceat(mover, row_starts)
+    regret = np.maximum(best - mover[chosen], 0)
+    return scored, regret, np.array(types, dtype=np.intp), game_phase(states[scored])
+
+
+@dataclass
+class RegretStats:
+    """Regret totals by player, move type and phase."""
+
+    players: list[str]
+    blunder_threshold: float = 0.05
+    # games played by each player, unknown for recorded samples
+    games: np.ndarray = field(init=False)
+    decisions: np.ndarray = field(init=False)
+    optimal: np.ndarray = field(init=False)
+    blunders: np.ndarray = field(init=False)
+    regret: np.ndarray = field(init=False)
+    max_regret: np.ndarray = field(init=False)
+
+    def __post_init__(self) -> None:
+        shape = (len(self.players), len(MOVE_TYPES), len(PHASES))
+        self.games = np.zeros(len(self.players), dtype=np.int64)
+        self.decisions = np.zeros(shape, dtype=np.int64)
+        self.optimal = np.zeros(shape, dtype=np.int64)
+        self.blunders = np.zeros(shape, dtype=np.int64)
+        self.regret = np.zeros(shape)
+        self.max_regret = np.zeros(shape)
+
+    def add(
+        self, players: np.ndarray, regret: np.ndarray, types: np.ndarray, phases: np.ndarray
+    ) -> None:
+        """Add scored decisions made by the players at the given indices."""
+        cells = (players, types, phases)
+        np.add.at(self.decisions, cells, 1)
+        # afterstate values are only exact up to the solver's tolerance
+        np.add.at(self.optimal, cells, regret < 1e-9)
+        np.add.at(self.blunders, cells, regret >= self.blunder_threshold)
+        np.add.at(self.regret, cells, regret)
+        np.maximum.at(self.max_regret, cells, regret)
+
+    def merge(self, other: "RegretStats") -> None:
+        """Add the totals of other, which must cover the same players."""
+        self.games += other.games
+        self.decisions += other.decisions
+        self.optimal += other.optimal
+        self.blunders += other.blunders
+        self.regret += other.regret
+        np.maximum(self.max_regret, other.max_regret, out=self.max_regret)
+
+    def totals(self, axis: Optional[int] = None) -> dict[str, np.ndarray]:
+        """
+        Return the totals by player, and by MOVE_TYPES if axis is 1 or PHASES if axis is 2.
+
+        Arrays are indexed by player first.
+        """
+        summed = (2, 1) if axis is None else tuple({1, 2} - {axis})
+        return {
+            "decisions": self.decisions.sum(axis=summed),
+            "optimal": self.optimal.sum(axis=summed),
+            "blunders": self.blunders.sum(axis=summed),
+            "regret": self.regret.sum(axis=summed),
+            "max_regret": self.max_regret.max(axis=summed),
+        }
+
+    def to_dict(self) -> dict:
+        """Return every total as nested lists indexed by player, move type and phase."""
+        return {
+            "players": self.players,
+            "move_types": list(MOVE_TYPES),
+            "phases": list(PHASES),
+            "blunder_threshold": self.blunder_threshold,
+            "games": self.games.tolist(),
+            "decisions": self.decisions.tolist(),
+            "optimal": self.optimal.tolist(),
+            "blunders": self.blunders.tolist(),
+            "regret": self.regret.tolist(),
+            "max_regret": self.max_regret.tolist(),
+        }
+
+
+def _score_games(
+    players: list[type[Player]],
+    pairings: list[tuple[int, int]],
+    board_seed: int,
+    run_seed: int,
+    game_indices: range,
+    values_path: Path,
+    blunder_threshold: float,
+) -> RegretStats:
+    """Play a range of seeded games and score every decision made in them."""
+    stats = RegretStats([player.__name__ for player in players], blunder_threshold)
+    states, rolls, moves, movers = [], [], [], []
+    for game_index in game_indices:
+        white, black = pairings[game_index % len(pairings)]
+        game, _ = play_seeded_game(
+            players[white], players[black], board_seed, f"{run_seed}:{game_index}"
+        )
+        stats.games[white] += 1
+        stats.games[black] += 1
+        for seed, white_turn, dice_roll, move in game.history:
+            states.append(canonicalize(seed, white_turn)[0])
+            rolls.append(dice_roll)
+            moves.append(move.path_position)
+            movers.append(white if white_turn else black)
+
+    scored, regret, types, phases = score_decisions(
+        reference_table(values_path),
+        np.array(states, dtype=np.uint64),
+        np.array(rolls, dtype=np.uint8),
+        np.array(moves, dtype=np.uint8),
+    )
+    stats.add(np.array(movers, dtype=np.intp)[scored], regret, types, phases)
+    return stats
+
+
+def _score_samples(
+    path: Path, start: int, stop: int, values_path: Path, blunder_threshold: float
+) -> RegretStats:
+    """Score a slice of a self-play shard, crediting every decision to a single player."""
+    samples = np.memmap(path, dtype=SAMPLE_DTYPE, mode="r")[start:stop]
+    stats = RegretStats(["samples"], blunder_threshold)
+    scored, regret, types, phases = score_decisions(
+        reference_table(values_path), samples["state"], samples["roll"], samples["move"]
+    )
+    stats.add(np.zeros(scored.sum(), dtype=np.intp), regret, types, phases)
+    return stats
+
+
+def _run(
+    fn, tasks: list[tuple], stats: RegretStats, values_path: Path, processes: Optional[int]
+) -> RegretStats:
+    """Merge fn(*task) over tasks, in a pool sharing the value table unless processes is 1."""
+    if processes == 1:
+        for task in tasks:
+            stats.merge(fn(*task))
+        return stats
+
+    # workers attach to the table instead of each loading a copy
+    shared = reference_table(values_path).share()
+    try:
+        handles = {**published_handles(), table_key(values_path): shared.handle}
+        with ProcessPoolExecutor(
+            max_workers=processes, initializer=install_handles, initargs=(handles,)
+        ) as executor:
+            for result in executor.map(fn, *zip(*tasks)):
+                stats.merge(result)
+    finally:
+        shared.close()
+    return stats
+
+
+def analyze_games(
+    players: list[type[Player]],
+    pairings: list[tuple[int, int]],
+    num_games: int,
+    run_seed: int,
+    values_path: Path,
+    board_seed: int = 122138132480,
+    chunk_size: int = 100,
+    processes: Optional[int] = None,
+    blunder_threshold: float = 0.05,
+) -> RegretStats:
+    """
+    Play num_games games cycling through the (white, black) pairings of player indices.
+
+    Games are seeded the same way as royal_game.modules.selfplay.generate,
+    so the same pairings and run seed replay the games of a self-play run.
+    """
+    tasks = [
+        (
+            players,
+            pairings,
+            board_seed,
+            run_seed,
+            range(start, min(start + chunk_size, num_games)),
+            values_path,
+            blunder_threshold,
+        )
+        for start in range(0, num_games, chunk_size)
+    ]
+    stats = RegretStats([player.__name__ for player in players], blunder_threshold)
+    return _run(_score_games, tasks, stats, values_path, processes)
+
+
+def analyze_samples(
+    shards: Iterable[Path],
+    values_path: Path,
+    chunk_size: int = 100_000,
+    processes: Optional[int] = None,
+    blunder_threshold: float = 0.05,
+) -> RegretStats:
+    """
+    Score the decisions stored in self-play shards.
+
+    Samples do not record who made them, so all decisions are credited to
+    a single player named samples.
+    """
+    tasks = []
+    for path in shards:
+        num_samples = path.stat().st_size // SAMPLE_DTYPE.itemsize
+        tasks.extend(
+            (path, start, min(start + chunk_size, num_samples), values_path, blunder_threshold)
+            for start in range(0, num_samples, chunk_size)
+        )
+    stats = RegretStats(["samples"], blunder_threshold)
+    return _run(_score_samples, tasks, stats, values_path, processes)
@@ -0,0 +1,319 @@
+"""
+Streaming per-game tournament results.
+
+Every finished game becomes one row of an append-only CSV file:
+
+    pairing   index of the pairing in the run
+    game      index of the game within its pairing
+    white     name of the white player
+    black     name of the black player
+    seed      seed of the game's random state
+    winner    white or black
+    plies     number of moves made
+    captures  number of captures made
+    duration  seconds the game took
+
+Rows are buffered and appended in batches, so at most one batch is lost
+if a run is killed. WinMatrix aggregates rows one at a time, so summaries
+can be built while a run is going or rebuilt from the file afterwards in
+memory independent of the number of games. The output_* functions print
+them as the tables of tournament.py and summarize.py.
+"""
+
+import csv
+from collections import defaultdict
+from functools import partial
+from math import sqrt
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+FIELDS = (
+    "pairing",
+    "game",
+    "white",
+    "black",
+    "seed",
+    "winner",
+    "plies",
+    "captures",
+    "duration",
+)
+
+
+class GameResult(NamedTuple):
+    """Outcome and statistics of one game."""
+
+    pairing: int
+    game: int
+    white: str
+    black: str
+    seed: str
+    white_won: bool
+    plies: int
+    captures: int
+    duration: float
+
+    def to_row(self) -> list:
+        """Return the CSV fields of the result."""
+        return [
+            self.pairing,
+            self.game,
+            self.white,
+            self.black,
+            self.seed,
+            "white" if self.white_won else "black",
+            self.plies,
+            self.captures,
+            f"{self.duration:.6f}",
+        ]
+
+    @classmethod
+    def from_row(cls, row: list[str]) -> "GameResult":
+        """Parse the CSV fields written by to_row."""
+        pairing, game, white, black, seed, winner, plies, captures, duration = row
+        return cls(
+            int(pairing),
+            int(game),
+            white,
+            black,
+            seed,
+            winner == "white",
+            int(plies),
+            int(captures),
+            float(duration),
+        )
+
+
+class ResultWriter:
+    """Appends results to a CSV file in batches."""
+
+    def __init__(self, path: Path, batch_size: int = 1000) -> None:
+        new_file = not path.exists() or path.stat().st_size == 0
+        self.file = open(path, "a", newline="")  # noqa: SIM115
+        self.writer = csv.writer(self.file)
+        if new_file:
+            self.writer.writerow(FIELDS)
+        self.batch_size = batch_size
+        self._buffer: list[GameResult] = []
+        # where the rows of this writer begin
+        self.start = self.file.tell()
+
+    def write(self, result: GameResult) -> None:
+        """Buffer a result and append the batch once it is full."""
+        self._buffer.append(result)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append the buffered results to the file."""
+        self.writer.writerows(result.to_row() for result in self._buffer)
+        self._buffer.clear()
+        self.file.flush()
+
+    @property
+    def offset(self) -> int:
+        """Byte offset of the end of the flushed results."""
+        return self.file.tell()
+
+    def close(self) -> None:
+        """Flush the remaining results and close the file."""
+        self.flush()
+        self.file.close()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_results(
+    path: Path, start: Optional[int] = None, stop: Optional[int] = None
+) -> Iterator[GameResult]:
+    """
+    Yield the results stored in a file one at a time.
+
+    start and stop optionally restrict reading to the rows between two byte
+    offsets, such as those of ResultWriter.start and ResultWriter.offset.
+    """
+    with open(path, "rb") as fin:
+        if start is None:
+            fin.readline()
+        else:
+            fin.seek(start)
+
+        def lines() -> Iterator[str]:
+            while stop is None or fin.tell() < stop:
+                line = fin.readline()
+                if not line:
+                    return
+                yield line.decode()
+
+        for row in csv.reader(lines()):
+            # a run killed mid-write can leave a truncated last row
+            if len(row) == len(FIELDS):
+                yield GameResult.from_row(row)
+
+
+class PairStats:
+    """Running sums over the twin pairs of one pairing."""
+
+    def __init__(self) -> None:
+        self.num_pairs = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+
+    def add(self, score: float) -> None:
+        """Add the mean score of one twin pair."""
+        self.num_pairs += 1
+        self.total += score
+        self.total_squares += score**2
+
+    def interval(self, z: float = 1.96) -> tuple[float, float]:
+        """Return the normal approximation interval of the mean pair score."""
+        if self.num_pairs < 2:
+            return 0.0, 1.0
+        mean = self.total / self.num_pairs
+        variance = (self.total_squares - self.num_pairs * mean**2) / (self.num_pairs - 1)
+        half_width = z * sqrt(max(variance, 0.0) / self.num_pairs)
+        return mean - half_width, mean + half_width
+
+
+class WinMatrix:
+    """
+    Win counts between every pair of players, built one result at a time.
+
+    In self-play only white wins are counted. Games 2k and 2k+1 of a
+    pairing are color-swapped twins, and the first player of the pairing,
+    white in game 2k, scores the mean of its two results for paired
+    intervals. Only twins whose partner has not arrived yet are held in
+    memory.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self.num_wins: defaultdict[str, defaultdict[str, int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+        self.num_games: defaultdict[frozenset, int] = defaultdict(int)
+        # players in the order they are listed, names given up front come first
+        self.names: dict[str, None] = dict.fromkeys(names)
+        self.self_play = False
+        self.pairs: dict[tuple[str, str], PairStats] = {}
+        self._unpaired: dict[tuple[int, int], bool] = {}
+        self.plies = 0
+        self.captures = 0
+        self.duration = 0.0
+
+    def add(self, result: GameResult) -> None:
+        """Count one game."""
+        white, black = result.white, result.black
+        self.names.update({white: None, black: None})
+        self.num_games[frozenset((white, black))] += 1
+        self.plies += result.plies
+        self.captures += result.captures
+        self.duration += result.duration
+        if white == black:
+            self.self_play = True
+            self.num_wins[white][black] += result.white_won
+        elif result.white_won:
+            self.num_wins[white][black] += 1
+        else:
+            self.num_wins[black][white] += 1
+
+        # score of the pairing's first player, white in the even game of a twin pair
+        first_is_white = result.game % 2 == 0
+        score = result.white_won if white == black else result.white_won == first_is_white
+        twin = self._unpaired.pop((result.pairing, result.game ^ 1), None)
+        if twin is None:
+            self._unpaired[(result.pairing, result.game)] = score
+            return
+        first, second = (white, black) if first_is_white else (black, white)
+        self.pairs.setdefault((first, second), PairStats()).add((score + twin) / 2)
+
+    def games_between(self, name1: str, name2: str) -> int:
+        """Return the number of games between two players."""
+        return self.num_games[frozenset((name1, name2))]
+
+    def intervals(self, z: float = 1.96) -> dict[str, dict[str, tuple[float, float]]]:
+        """Return the paired interval of every player's win rate against every other."""
+        intervals: defaultdict[str, dict] = defaultdict(dict)
+        for (first, second), stats in self.pairs.items():
+            low, high = stats.interval(z)
+            intervals[first][second] = (low, high)
+            if first != second:
+                intervals[second][first] = (1 - high, 1 - low)
+        return intervals
+
+    @property
+    def total_games(self) -> int:
+        """Number of games counted."""
+        return sum(self.num_games.values())
+
+
+def print_table(
+    title: str, player_names: list[str], cell: Callable[[str, str], str], self_play: bool
+) -> None:
+    """Print a scoring matrix with one row and one column per player."""
+    print(f"{title:_^120}")
+
+    # list player names in the top row of the table
+    print("".join([f"{name:^20}" for name in ([""] + player_names)]))
+
+    for name1 in player_names:
+        # list player names in the first column of the table
+        # for a scoring matrix look
+        table_row = f"{name1:^20}"
+        for name2 in player_names:
+            if name1 == name2 and not self_play:
+                table_row += f"{'/':^20}"
+            else:
+                table_row += f"{cell(name1, name2):^20}"
+        print(table_row)
+
+
+def output_results(matrix: WinMatrix) -> None:
+    """Format tournament results nicely."""
+    print_table(
+        "TOURNAMENT RESULTS",
+        list(matrix.names),
+        lambda name1, name2: (
+            f"{matrix.num_wins[name1][name2]}/{matrix.games_between(name1, name2)}"
+        ),
+        matrix.self_play,
+    )
+
+
+def output_stratum_results(matrices: dict[str, WinMatrix]) -> None:
+    """Format win rates from the start positions of every stratum nicely."""
+
+    def win_rate(matrix: WinMatrix, name1: str, name2: str) -> str:
+        games = matrix.games_between(name1, name2)
+        return f"{matrix.num_wins[name1][name2] / games:.1%} of {games}" if games else "/"
+
+    for stratum, matrix in matrices.items():
+        print_table(
+            f"{stratum.upper()} WIN RATES",
+            list(matrix.names),
+            partial(win_rate, matrix),
+            matrix.self_play,
+        )
+
+
+def output_exact_results(win_probability: dict, self_play: bool) -> None:
+    """Format exact win probabilities nicely."""
+    print_table(
+        "EXACT RESULTS",
+        list(win_probability.keys()),
+        lambda name1, name2: f"{win_probability[name1][name2]:.6f}",
+        self_play,
+    )
+
+
+def output_paired_results(intervals: dict, self_play: bool) -> None:
+    """Format 95% confidence intervals of paired win rates nicely."""
+    print_table(
+        "PAIRED 95% INTERVALS",
+        list(intervals.keys()),
+        lambda name1, name2: "{:.3f}-{:.3f}".format(*intervals[name1][name2]),
+        self_play,
+    )
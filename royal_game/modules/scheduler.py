@@ -0,0 +1,163 @@
+"""
+Cost-aware scheduling of game batches across worker processes.
+
+Work is a fixed number of games for each of several jobs (pairings of
+players), whose cost per game can differ by orders of magnitude. Games are
+handed out in chunks from a central queue that idle workers pull from, so
+no worker owns a fixed share of the games and a slow pairing cannot leave
+the others idle. The scheduler:
+
+    - probes every job with a single game to measure its cost
+    - sizes chunks so each takes about target_seconds, shrinking them as
+      the estimated remaining work runs out so the last chunks of the run
+      finish close together
+    - serves the job with the most estimated remaining work first, so
+      expensive pairings start early instead of forming a long tail
+
+Chunk costs are measured inside the workers and refine each job's running
+average cost per game.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class JobStatus:
+    """Progress and measured cost of one job."""
+
+    num_games: int
+    next_game: int = 0
+    games_done: int = 0
+    seconds: float = 0.0
+    chunks_in_flight: int = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of games not handed out yet."""
+        return self.num_games - self.next_game
+
+    @property
+    def cost(self) -> Optional[float]:
+        """Average seconds per game, None until a chunk has finished."""
+        return self.seconds / self.games_done if self.games_done else None
+
+
+class Scheduler:
+    """Decides which games of which job to hand out next."""
+
+    def __init__(
+        self,
+        num_games: list[int],
+        num_workers: int,
+        target_seconds: float = 0.5,
+        max_chunk_size: int = 1000,
+    ) -> None:
+        self.jobs = [JobStatus(n) for n in num_games]
+        self.num_workers = num_workers
+        self.target_seconds = target_seconds
+        self.max_chunk_size = max_chunk_size
+
+    def remaining_seconds(self) -> Optional[float]:
+        """Estimated work left in games not handed out yet, None while any cost is unknown."""
+        remaining = 0.0
+        for job in self.jobs:
+            if job.pending:
+                if job.cost is None:
+                    return None
+                remaining += job.pending * job.cost
+        return remaining
+
+    def next_chunk(self) -> Optional[tuple[int, range]]:
+        """Return the next (job index, game indices) to run, None if nothing can run yet."""
+        # measure every job once before committing to chunk sizes
+        for index, job in enumerate(self.jobs):
+            if job.pending and job.cost is None and not job.chunks_in_flight:
+                return index, self._take(job, 1)
+
+        known = [
+            (job.pending * job.cost, index)
+            for index, job in enumerate(self.jobs)
+            if job.pending and job.cost is not None
+        ]
+        if not known:
+            # only jobs with a probe in flight are left
+            return None
+        _, index = max(known)
+        job = self.jobs[index]
+
+        target = self.target_seconds
+        remaining = self.remaining_seconds()
+        if remaining is not None:
+            # guided self-scheduling: no chunk larger than a fraction of what is left
+            target = min(target, remaining / (2 * self.num_workers))
+        size = min(self.max_chunk_size, max(1, round(target / job.cost)))
+        return index, self._take(job, size)
+
+    def _take(self, job: JobStatus, size: int) -> range:
+        games = range(job.next_game, min(job.next_game + size, job.num_games))
+        job.next_game = games.stop
+        job.chunks_in_flight += 1
+        return games
+
+    def record(self, index: int, num_games: int, seconds: float) -> None:
+        """Update a job with the measured cost of a finished chunk."""
+        job = self.jobs[index]
+        job.games_done += num_games
+        job.seconds += seconds
+        job.chunks_in_flight -= 1
+
+    @property
+    def done(self) -> bool:
+        """Whether every game has been handed out and finished."""
+        return all(job.games_done == job.num_games for job in self.jobs)
+
+
+def _timed(fn: Callable, index: int, games: range) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn(index, games)
+    return result, time.perf_counter() - start
+
+
+def run_scheduled(
+    fn: Callable[[int, range], Any],
+    scheduler: Scheduler,
+    on_result: Callable[[int, range, Any], None],
+    executor: Optional[ProcessPoolExecutor] = None,
+) -> None:
+    """
+    Run fn(job index, game indices) on every chunk handed out by scheduler.
+
+    on_result(job index, game indices, result) is called in the parent as
+    chunks finish, in completion order. fn must be picklable when an
+    executor is given. Without one, chunks run in the current process.
+    """
+    if executor is None:
+        while not scheduler.done:
+            index, games = scheduler.next_chunk()
+            result, seconds = _timed(fn, index, games)
+            scheduler.record(index, len(games), seconds)
+            on_result(index, games, result)
+        return
+
+    pending: dict[Future, tuple[int, range]] = {}
+
+    def fill() -> None:
+        # a second chunk per worker hides the round trip to the parent
+        while len(pending) < 2 * scheduler.num_workers:
+            chunk = scheduler.next_chunk()
+            if chunk is None:
+                return
+            pending[executor.submit(_timed, fn, *chunk)] = chunk
+
+    fill()
+    while pending:
+        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in finished:
+            index, games = pending.pop(future)
+            result, seconds = future.result()
+            scheduler.record(index, len(games), seconds)
+            on_result(index, games, result)
+        fill()
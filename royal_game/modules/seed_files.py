@@ -0,0 +1,338 @@
+"""
+External-memory operations on seed files.
+
+Seed files hold one seed per record, either as decimal text with one seed
+per line or, for files ending in .bin or .u64, as little-endian uint64.
+Files are processed in blocks, so memory use is bounded by the block and
+run sizes rather than the size of the file:
+
+    - sorting splits the inputs into runs of about run_size seeds, sorts
+      the runs in parallel worker processes and merges them, several
+      passes deep if there are more than MAX_FAN_IN runs
+    - merging and the set operations advance through their sorted inputs
+      together, in steps that cover every remaining seed up to the
+      smallest last seed of the current blocks, so each step is a handful
+      of vectorized numpy operations
+
+Seeds are validated with legal_mask while they are read, and illegal seeds
+or unparsable lines are skipped and counted.
+"""
+
+import tempfile
+from concurrent.futures import Executor
+from functools import reduce
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+from royal_game.modules.state_space import legal_mask
+
+SEED_DTYPE = np.dtype("<u8")
+BINARY_SUFFIXES = (".bin", ".u64")
+BLOCK_SIZE = 1 << 20
+RUN_SIZE = 1 << 24
+MAX_FAN_IN = 64
+
+
+def is_binary(path: Path) -> bool:
+    """Whether a seed file holds uint64 records rather than decimal text."""
+    return path.suffix in BINARY_SUFFIXES
+
+
+def _parse_text(data: bytes) -> tuple[np.ndarray, int]:
+    """Parse whitespace separated decimal seeds, returning them and the number of bad tokens."""
+    tokens = data.split()
+    try:
+        values = np.array(tokens).astype(np.int64) if tokens else np.empty(0, np.int64)
+    except (ValueError, OverflowError):
+        # rare, so find the offending tokens one at a time, no legal seed has 19 digits
+        parsed = [int(token) for token in tokens if token.isdigit() and len(token) < 19]
+        values = np.array(parsed, dtype=np.int64)
+        return _non_negative(values), len(tokens) - len(parsed)
+    seeds = _non_negative(values)
+    return seeds, len(values) - len(seeds)
+
+
+def _non_negative(values: np.ndarray) -> np.ndarray:
+    return values[values >= 0].astype(np.uint64)
+
+
+class SeedReader:
+    """
+    Iterates over the seeds of a file in blocks of at most block_size seeds.
+
+    start and stop optionally restrict reading to a byte span, which must
+    begin and end on record boundaries as returned by split_file. invalid
+    counts the records skipped so far.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        block_size: int = BLOCK_SIZE,
+        verify: bool = True,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> None:
+        self.path = path
+        self.block_size = block_size
+        self.verify = verify
+        self.start = start
+        self.stop = path.stat().st_size if stop is None else stop
+        self.invalid = 0
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        blocks = self._binary_blocks() if is_binary(self.path) else self._text_blocks()
+        for seeds in blocks:
+            if self.verify:
+                legal = legal_mask(seeds)
+                self.invalid += len(seeds) - int(np.count_nonzero(legal))
+                seeds = seeds[legal]
+            if len(seeds):
+                yield seeds
+
+    def _binary_blocks(self) -> Iterator[np.ndarray]:
+        with open(self.path, "rb") as fin:
+            fin.seek(self.start)
+            remaining = (self.stop - self.start) // SEED_DTYPE.itemsize
+            while remaining:
+                seeds = np.fromfile(
+                    fin, dtype=SEED_DTYPE, count=min(remaining, self.block_size)
+                )
+                if not len(seeds):
+                    return
+                remaining -= len(seeds)
+                yield seeds.astype(np.uint64, copy=False)
+
+    def _text_blocks(self) -> Iterator[np.ndarray]:
+        # decimal seeds take at most 20 bytes and a newline
+        chunk_bytes = 21 * self.block_size
+        with open(self.path, "rb") as fin:
+            fin.seek(self.start)
+            position, leftover = self.start, b""
+            while position < self.stop:
+                data = fin.read(min(chunk_bytes, self.stop - position))
+                if not data:
+                    break
+                position += len(data)
+                data = leftover + data
+                # hold back a partial last line until the next chunk completes it
+                cut = data.rfind(b"\n") + 1 if position < self.stop else len(data)
+                data, leftover = data[:cut], data[cut:]
+                seeds, bad = _parse_text(data)
+                self.invalid += bad
+                yield seeds
+            if leftover:
+                seeds, bad = _parse_text(leftover)
+                self.invalid += bad
+                yield seeds
+
+
+class SeedWriter:
+    """Writes blocks of seeds to a file in the format implied by its suffix."""
+
+    def __init__(self, path: Path) -> None:
+        self.binary = is_binary(path)
+        self.file = open(path, "wb")  # noqa: SIM115
+        self.count = 0
+
+    def write(self, seeds: np.ndarray) -> None:
+        """Append a block of seeds."""
+        if not len(seeds):
+            return
+        if self.binary:
+            seeds.astype(SEED_DTYPE, copy=False).tofile(self.file)
+        else:
+            self.file.write(("\n".join(map(str, seeds.tolist())) + "\n").encode())
+        self.count += len(seeds)
+
+    def close(self) -> None:
+        """Close the file."""
+        self.file.close()
+
+    def __enter__(self) -> "SeedWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def split_file(path: Path, num_seeds: int) -> list[tuple[int, int]]:
+    """Split a file into byte spans on record boundaries holding about num_seeds seeds each."""
+    size = path.stat().st_size
+    if is_binary(path):
+        step = num_seeds * SEED_DTYPE.itemsize
+        return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+    # estimate the line length from the beginning of the file
+    with open(path, "rb") as fin:
+        head = fin.read(1 << 16)
+        step = max(1, num_seeds * len(head) // max(1, head.count(b"\n")))
+        spans, start = [], 0
+        while start < size:
+            fin.seek(min(start + step, size))
+            fin.readline()
+            stop = min(fin.tell(), size)
+            spans.append((start, stop))
+            start = stop
+    return spans
+
+
+def _sort_run(
+    path: Path, start: int, stop: int, run_path: Path, unique: bool, verify: bool
+) -> tuple[int, int]:
+    reader = SeedReader(path, block_size=BLOCK_SIZE, verify=verify, start=start, stop=stop)
+    blocks = list(reader)
+    seeds = np.concatenate(blocks) if blocks else np.empty(0, np.uint64)
+    seeds = np.unique(seeds) if unique else np.sort(seeds)
+    seeds.astype(SEED_DTYPE, copy=False).tofile(run_path)
+    return len(seeds), reader.invalid
+
+
+def sort_runs(
+    paths: Iterable[Path],
+    temp_dir: Path,
+    run_size: int = RUN_SIZE,
+    unique: bool = False,
+    verify: bool = True,
+    executor: Optional[Executor] = None,
+) -> tuple[list[Path], int]:
+    """
+    Write the seeds of the given files as sorted runs of about run_size seeds.
+
+    Runs are sorted in the executor's workers when one is given. Return the
+    run files and the number of invalid records skipped.
+    """
+    tasks = []
+    for path in paths:
+        for start, stop in split_file(path, run_size):
+            run_path = temp_dir / f"run-{len(tasks)}.u64"
+            tasks.append((path, start, stop, run_path, unique, verify))
+
+    if executor is None:
+        outcomes = [_sort_run(*task) for task in tasks]
+    else:
+        outcomes = list(executor.map(_sort_run, *zip(*tasks))) if tasks else []
+    return [task[3] for task in tasks], sum(invalid for _, invalid in outcomes)
+
+
+def aligned_blocks(streams: list[Iterator[np.ndarray]]) -> Iterator[list[np.ndarray]]:
+    """
+    Advance through sorted streams of blocks together.
+
+    Each step yields one array per stream holding every seed not yielded yet
+    that is at most the smallest last seed of the streams' current blocks,
+    so every later seed of any stream is larger than every seed of the step.
+    Exhausted streams yield empty arrays.
+    """
+    empty = np.empty(0, np.uint64)
+    current = [next(stream, empty) for stream in streams]
+    while any(len(block) for block in current):
+        bound = min(block[-1] for block in current if len(block))
+        step = []
+        for i, block in enumerate(current):
+            cut = int(np.searchsorted(block, bound, side="right"))
+            step.append(block[:cut])
+            current[i] = block[cut:]
+            if not len(current[i]):
+                current[i] = next(streams[i], empty)
+        yield step
+
+
+def _checked(blocks: Iterable[np.ndarray], name: str) -> Iterator[np.ndarray]:
+    """Pass blocks through, raising ValueError unless the seeds are strictly increasing."""
+    previous = None
+    for block in blocks:
+        if np.any(block[1:] <= block[:-1]) or (previous is not None and block[0] <= previous):
+            raise ValueError(f"{name} is not sorted and free of duplicates.")
+        previous = block[-1]
+        yield block
+
+
+def merge(
+    run_paths: list[Path], temp_dir: Path, unique: bool = False, block_size: int = BLOCK_SIZE
+) -> Iterator[np.ndarray]:
+    """Yield the seeds of sorted run files in ascending order, in blocks."""
+    # merge the runs in batches until a single pass can read them all
+    generation = 0
+    while len(run_paths) > MAX_FAN_IN:
+        merged = []
+        for i in range(0, len(run_paths), MAX_FAN_IN):
+            merged_path = temp_dir / f"merge-{generation}-{i // MAX_FAN_IN}.u64"
+            with SeedWriter(merged_path) as writer:
+                for block in _merge_pass(run_paths[i : i + MAX_FAN_IN], unique, block_size):
+                    writer.write(block)
+            merged.append(merged_path)
+        for path in run_paths:
+            path.unlink()
+        run_paths, generation = merged, generation + 1
+    yield from _merge_pass(run_paths, unique, block_size)
+
+
+def _merge_pass(run_paths: list[Path], unique: bool, block_size: int) -> Iterator[np.ndarray]:
+    # the current blocks of all runs share the block size budget
+    run_block_size = max(1, block_size // max(1, len(run_paths)))
+    streams = [iter(SeedReader(path, run_block_size, verify=False)) for path in run_paths]
+    for step in aligned_blocks(streams):
+        seeds = np.concatenate(step)
+        yield np.unique(seeds) if unique else np.sort(seeds)
+
+
+def sorted_stream(
+    path: Path,
+    temp_dir: Path,
+    presorted: bool = False,
+    run_size: int = RUN_SIZE,
+    verify: bool = True,
+    executor: Optional[Executor] = None,
+) -> tuple[Iterator[np.ndarray], int]:
+    """
+    Return the distinct seeds of a file in ascending order, in blocks.
+
+    Presorted files are streamed directly and checked as they are read.
+    Otherwise the file is sorted first, and the number of invalid records
+    skipped is returned along with the stream.
+    """
+    if presorted:
+        return _checked(SeedReader(path, verify=verify), str(path)), 0
+    run_dir = Path(tempfile.mkdtemp(dir=temp_dir))
+    runs, invalid = sort_runs([path], run_dir, run_size, True, verify, executor)
+    return merge(runs, run_dir, unique=True), invalid
+
+
+def union(steps: Iterable[list[np.ndarray]]) -> Iterator[np.ndarray]:
+    """Yield the seeds in any of the aligned sorted streams."""
+    for step in steps:
+        yield np.unique(np.concatenate(step))
+
+
+def intersection(steps: Iterable[list[np.ndarray]]) -> Iterator[np.ndarray]:
+    """Yield the seeds in all of the aligned sorted streams."""
+    for step in steps:
+        yield reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), step)
+
+
+def difference(steps: Iterable[list[np.ndarray]]) -> Iterator[np.ndarray]:
+    """Yield the seeds of the first aligned sorted stream that are in none of the others."""
+    for first, *others in steps:
+        yield first[np.isin(first, np.concatenate(others), invert=True)]
+
+
+def sample(
+    blocks: Iterable[np.ndarray], num_seeds: int, rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Return a uniform random sample of num_seeds seeds from a stream, in ascending order.
+
+    Every seed is given a random key and the seeds with the smallest keys are
+    kept, so memory is bounded by num_seeds and the block size.
+    """
+    keys, kept = np.empty(0, np.uint64), np.empty(0, np.uint64)
+    for block in blocks:
+        keys = np.concatenate([keys, rng.integers(0, 2**63, len(block), dtype=np.uint64)])
+        kept = np.concatenate([kept, block])
+        if len(kept) > num_seeds:
+            smallest = np.argpartition(keys, num_seeds)[:num_seeds]
+            keys, kept = keys[smallest], kept[smallest]
+    return np.sort(kept)
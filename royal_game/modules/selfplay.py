@@ -0,0 +1,185 @@
+"""
+Self-play training data generation.
+
+Games are played across worker processes and every selected move becomes
+one fixed-size binary sample:
+
+    state    uint64  canonical seed with the mover as white
+    roll     uint8   dice roll
+    move     uint8   Move.path_position of the selected move
+    outcome  int8    1 if the mover went on to win, -1 otherwise
+
+States are canonicalized with royal_game.modules.symmetry, and move
+identifiers are the same for both colors, so samples are color-agnostic.
+
+Samples are streamed into shards of a fixed number of samples, followed by
+a manifest.json that lists the shards and the generation settings. Each
+game is seeded from the run seed and its index and results are written in
+game order, so the shards for a given seed do not depend on the number of
+worker processes.
+"""
+
+import json
+import os
+import random
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+import numpy as np
+
+from royal_game.modules.game import Game
+from royal_game.modules.player import Player
+from royal_game.modules.symmetry import canonicalize
+
+SAMPLE_DTYPE = np.dtype([("state", "<u8"), ("roll", "u1"), ("move", "u1"), ("outcome", "i1")])
+
+
+def play_seeded_game(
+    white_player: type[Player], black_player: type[Player], board_seed: int, game_seed: str
+) -> tuple[Game, bool]:
+    """Play a game with its history recorded and return it with whether white won."""
+    random.seed(game_seed)
+    game = Game(white_player(), black_player(), board_seed, record_history=True)
+    return game, game.play()
+
+
+def play_recorded_game(
+    white_player: type[Player], black_player: type[Player], board_seed: int, game_seed: str
+) -> np.ndarray:
+    """Play a seeded game and return its samples."""
+    game, white_wins = play_seeded_game(white_player, black_player, board_seed, game_seed)
+
+    samples = np.empty(len(game.history), dtype=SAMPLE_DTYPE)
+    for i, (seed, white_turn, dice_roll, move) in enumerate(game.history):
+        samples[i] = (
+            canonicalize(seed, white_turn)[0],
+            dice_roll,
+            move.path_position,
+            1 if white_turn == white_wins else -1,
+        )
+    return samples
+
+
+def _play_chunk(
+    pairings: list[tuple[type[Player], type[Player]]],
+    board_seed: int,
+    run_seed: int,
+    game_indices: range,
+) -> np.ndarray:
+    """Play a contiguous range of games and concatenate their samples."""
+    samples = []
+    for game_index in game_indices:
+        white_player, black_player = pairings[game_index % len(pairings)]
+        samples.append(
+            play_recorded_game(
+                white_player, black_player, board_seed, f"{run_seed}:{game_index}"
+            )
+        )
+    return np.concatenate(samples) if samples else np.empty(0, dtype=SAMPLE_DTYPE)
+
+
+def ordered_results(
+    executor: ProcessPoolExecutor, fn: Callable, arguments: Iterable[tuple], window: int
+) -> Iterator:
+    """
+    Yield fn(*args) for each args in order, with at most window tasks in flight.
+
+    Unlike executor.map, tasks are submitted lazily so finished results
+    never pile up ahead of a slow consumer.
+    """
+    pending: deque[Future] = deque()
+    for args in arguments:
+        pending.append(executor.submit(fn, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class ShardWriter:
+    """Accumulates samples and writes them out in shards of a fixed size."""
+
+    def __init__(self, out_dir: Path, shard_size: int) -> None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self.out_dir = out_dir
+        self.shard_size = shard_size
+        self.shards: list[dict] = []
+        self._buffer = np.empty(shard_size, dtype=SAMPLE_DTYPE)
+        self._buffered = 0
+
+    def write(self, samples: np.ndarray) -> None:
+        """Buffer samples and flush every full shard."""
+        while len(samples):
+            taken = min(len(samples), self.shard_size - self._buffered)
+            self._buffer[self._buffered : self._buffered + taken] = samples[:taken]
+            self._buffered += taken
+            samples = samples[taken:]
+            if self._buffered == self.shard_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered samples, if any, as a new shard."""
+        if not self._buffered:
+            return
+        name = f"shard-{len(self.shards):05d}.bin"
+        self._buffer[: self._buffered].tofile(self.out_dir / name)
+        self.shards.append({"file": name, "num_samples": self._buffered})
+        self._buffered = 0
+
+    def close(self, settings: dict) -> None:
+        """Flush the last partial shard and write the manifest."""
+        self.flush()
+        manifest = {
+            "dtype": [[name, SAMPLE_DTYPE[name].str] for name in SAMPLE_DTYPE.names],
+            "shard_size": self.shard_size,
+            "num_samples": sum(shard["num_samples"] for shard in self.shards),
+            "shards": self.shards,
+            "settings": settings,
+        }
+        with open(self.out_dir / "manifest.json", "w") as fout:
+            json.dump(manifest, fout, indent=2)
+
+
+def generate(
+    pairings: list[tuple[type[Player], type[Player]]],
+    out_dir: Path,
+    num_games: int,
+    run_seed: int,
+    board_seed: int = 122138132480,
+    shard_size: int = 1 << 20,
+    chunk_size: int = 100,
+    processes: Optional[int] = None,
+) -> dict:
+    """
+    Play num_games games cycling through the (white, black) pairings and write their samples.
+
+    Return the settings recorded in the manifest.
+    """
+    settings = {
+        "pairings": [[white.__name__, black.__name__] for white, black in pairings],
+        "num_games": num_games,
+        "run_seed": run_seed,
+        "board_seed": board_seed,
+    }
+    writer = ShardWriter(out_dir, shard_size)
+    chunks = (
+        (pairings, board_seed, run_seed, range(start, min(start + chunk_size, num_games)))
+        for start in range(0, num_games, chunk_size)
+    )
+    processes = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        # two chunks per worker keep every worker busy while bounding memory
+        for samples in ordered_results(executor, _play_chunk, chunks, 2 * processes):
+            writer.write(samples)
+    writer.close(settings)
+    return settings
+
+
+def read_shards(directory: Path) -> Iterator[np.ndarray]:
+    """Yield the memory-mapped samples of every shard listed in a manifest."""
+    with open(directory / "manifest.json", "r") as fin:
+        manifest = json.load(fin)
+    for shard in manifest["shards"]:
+        yield np.memmap(directory / shard["file"], dtype=SAMPLE_DTYPE, mode="r")
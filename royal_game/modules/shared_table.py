@@ -0,0 +1,149 @@
+"""
+Read-only numpy tables shared between processes.
+
+A SharedTable places a set of named arrays in one multiprocessing shared
+memory block. The process that creates it owns the block and unlinks it
+when the table is closed or the process exits. Other processes attach with
+the table's picklable TableHandle and get zero-copy read-only views of the
+same memory.
+
+Tables are published under a key, usually derived from the file they were
+loaded from, so players can look them up instead of loading files
+themselves:
+
+    - before creating a pool, the parent calls share_player_tables, which
+      creates and publishes the tables of every player class (see
+      Player.share_tables)
+    - workers receive published_handles() through the pool initializer
+      install_handles, which is only needed when workers are spawned rather
+      than forked
+    - a player calls get_shared(key) and falls back to loading its file
+      when nothing is published
+"""
+
+import weakref
+from contextlib import suppress
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, Mapping, NamedTuple, Optional
+
+import numpy as np
+
+# arrays start on cache line boundaries
+_ALIGNMENT = 64
+
+# handles published in this process by key
+_published: dict[str, "TableHandle"] = {}
+# tables created or attached in this process by shared memory block name
+_attached: dict[str, "SharedTable"] = {}
+
+
+class TableHandle(NamedTuple):
+    """Picklable reference to a SharedTable."""
+
+    name: str
+    # (array name, dtype, shape, byte offset) of every array
+    layout: tuple[tuple[str, str, tuple[int, ...], int], ...]
+    metadata: dict
+
+    def attach(self) -> "SharedTable":
+        """Return the table, mapping it into this process on first use."""
+        table = _attached.get(self.name)
+        if table is None:
+            table = SharedTable(SharedMemory(self.name), self, owner=False)
+            _attached[self.name] = table
+        return table
+
+
+class SharedTable:
+    """Named read-only arrays in one shared memory block."""
+
+    def __init__(self, memory: SharedMemory, handle: TableHandle, owner: bool) -> None:
+        self.handle = handle
+        self.metadata = handle.metadata
+        self.arrays: dict[str, np.ndarray] = {}
+        for name, dtype, shape, offset in handle.layout:
+            array = np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=offset)
+            array.flags.writeable = False
+            self.arrays[name] = array
+        self._finalizer = weakref.finalize(self, _release, memory, self.arrays, owner)
+
+    @classmethod
+    def create(
+        cls, arrays: Mapping[str, np.ndarray], metadata: Optional[dict] = None
+    ) -> "SharedTable":
+        """Copy arrays into a new shared memory block owned by this process."""
+        layout, size = [], 0
+        for name, array in arrays.items():
+            size = -(-size // _ALIGNMENT) * _ALIGNMENT
+            layout.append((name, array.dtype.str, array.shape, size))
+            size += array.nbytes
+        memory = SharedMemory(create=True, size=max(size, 1))
+        for (_, dtype, shape, offset), array in zip(layout, arrays.values()):
+            np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=offset)[...] = array
+
+        table = cls(memory, TableHandle(memory.name, tuple(layout), metadata or {}), owner=True)
+        _attached[memory.name] = table
+        return table
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the arrays."""
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def close(self) -> None:
+        """Unmap the table, and free its memory if this process created it."""
+        _attached.pop(self.handle.name, None)
+        self._finalizer()
+
+    def __enter__(self) -> "SharedTable":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _release(memory: SharedMemory, arrays: dict[str, np.ndarray], owner: bool) -> None:
+    # views must go before the buffer they point into can be closed, and if
+    # callers still hold some the mapping is left to the end of the process
+    arrays.clear()
+    with suppress(BufferError):
+        memory.close()
+    if owner:
+        memory.unlink()
+
+
+def publish(key: str, table: SharedTable) -> None:
+    """Make a table available to get_shared in this process and forked children."""
+    _published[key] = table.handle
+
+
+def get_shared(key: str) -> Optional[SharedTable]:
+    """Return the table published under key, None if there is none."""
+    handle = _published.get(key)
+    return None if handle is None else handle.attach()
+
+
+def published_handles() -> dict[str, TableHandle]:
+    """Return the handles of every published table by key, to pass to workers."""
+    return dict(_published)
+
+
+def install_handles(handles: Mapping[str, TableHandle]) -> None:
+    """Publish handles received from the parent, for use as a pool initializer."""
+    _published.update(handles)
+
+
+def share_player_tables(player_classes: Iterable[type]) -> list[SharedTable]:
+    """Create and publish the shared tables of player classes that have any."""
+    tables = []
+    for player_class in dict.fromkeys(player_classes):
+        for key, table in player_class.share_tables().items():
+            if key not in _published:
+                publish(key, table)
+                tables.append(table)
+            else:
+                table.close()
+    return tables
@@ -0,0 +1,212 @@
+"""
+Enumeration of the legal board seeds.
+
+A seed is legal when the Board constructor accepts it: every public grid
+holds 0b00, 0b01 or 0b10 and each color has exactly 7 pieces in total.
+This includes end states that cannot arise in play, such as both colors
+having 7 pieces at the end.
+
+The state space is partitioned into shards by the number of pieces each
+color has on the board and the start/end counts. Since all pieces are
+accounted for, the start/end counts fix the start/end bits of the seed, so
+shards are disjoint and can be processed independently. Seeds are yielded
+in ascending order within each shard, and shards in ascending order of
+their key.
+"""
+
+from enum import IntEnum
+from functools import lru_cache
+from itertools import chain, product
+from math import comb
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+
+class Shard(NamedTuple):
+    """Key of a state space shard."""
+
+    white_on_board: int
+    black_on_board: int
+    white_start: int
+    white_end: int
+    black_start: int
+    black_end: int
+
+    @property
+    def start_end_bits(self) -> int:
+        """Bits 28-39 shared by every seed in the shard."""
+        return (
+            (self.white_start << 28)
+            + (self.white_end << 31)
+            + (self.black_start << 34)
+            + (self.black_end << 37)
+        )
+
+
+def all_shards() -> list[Shard]:
+    """Return every shard key in the fixed enumeration order."""
+    shards = []
+    for white_on_board, black_on_board in product(range(8), repeat=2):
+        for white_start, black_start in product(
+            range(8 - white_on_board), range(8 - black_on_board)
+        ):
+            shards.append(
+                Shard(
+                    white_on_board,
+                    black_on_board,
+                    white_start,
+                    7 - white_on_board - white_start,
+                    black_start,
+                    7 - black_on_board - black_start,
+                )
+            )
+    return shards
+
+
+def shard_of(seed: int) -> Shard:
+    """Return the shard a legal seed belongs to."""
+    white_start, white_end, black_start, black_end = (
+        (seed >> (28 + 3 * i)) & 0b111 for i in range(4)
+    )
+    return Shard(
+        7 - white_start - white_end,
+        7 - black_start - black_end,
+        white_start,
+        white_end,
+        black_start,
+        black_end,
+    )
+
+
+def _public_splits(white_on_board: int, black_on_board: int) -> Iterator[tuple[int, int]]:
+    """Yield the feasible numbers of white and black pieces on public grids."""
+    for white_public in range(max(0, white_on_board - 6), min(8, white_on_board) + 1):
+        for black_public in range(
+            max(0, black_on_board - 6), min(8 - white_public, black_on_board) + 1
+        ):
+            yield white_public, black_public
+
+
+def shard_size(shard: Shard) -> int:
+    """Return the exact number of legal seeds in a shard."""
+    return sum(
+        comb(6, shard.white_on_board - white_public)
+        * comb(6, shard.black_on_board - black_public)
+        * comb(8, white_public)
+        * comb(8 - white_public, black_public)
+        for white_public, black_public in _public_splits(
+            shard.white_on_board, shard.black_on_board
+        )
+    )
+
+
+def num_states() -> int:
+    """Return the total number of legal seeds."""
+    return sum(shard_size(shard) for shard in all_shards())
+
+
+@lru_cache(maxsize=None)
+def _private_rows(num_pieces: int) -> tuple[int, ...]:
+    """Ascending 6-bit private row patterns with num_pieces occupied grids."""
+    return tuple(row for row in range(64) if row.bit_count() == num_pieces)
+
+
+@lru_cache(maxsize=None)
+def _public_rows() -> dict[tuple[int, int], tuple[int, ...]]:
+    """Ascending 16-bit public row patterns grouped by white and black piece counts."""
+    rows: dict[tuple[int, int], list[int]] = {}
+    for statuses in product(range(3), repeat=8):
+        row = sum(status << (2 * i) for i, status in enumerate(statuses))
+        rows.setdefault((statuses.count(1), statuses.count(2)), []).append(row)
+    return {counts: tuple(sorted(row_list)) for counts, row_list in rows.items()}
+
+
+def iter_shard(shard: Shard) -> Iterator[int]:
+    """Lazily yield the seeds of a shard in ascending order."""
+    base = shard.start_end_bits
+    public_rows = sorted(
+        (row, white_public, black_public)
+        for white_public, black_public in _public_splits(
+            shard.white_on_board, shard.black_on_board
+        )
+        for row in _public_rows()[(white_public, black_public)]
+    )
+
+    # the public row occupies more significant bits than both private rows
+    for public_row, white_public, black_public in public_rows:
+        public_bits = base + (public_row << 12)
+        for black_row in _private_rows(shard.black_on_board - black_public):
+            black_bits = public_bits + (black_row << 6)
+            for white_row in _private_rows(shard.white_on_board - white_public):
+                yield black_bits + white_row
+
+
+def shard_array(shard: Shard) -> np.ndarray:
+    """Return the seeds of a shard as an ascending uint64 array."""
+    parts = []
+    for white_public, black_public in _public_splits(
+        shard.white_on_board, shard.black_on_board
+    ):
+        public = np.array(_public_rows()[(white_public, black_public)], dtype=np.uint64)
+        black = np.array(_private_rows(shard.black_on_board - black_public), dtype=np.uint64)
+        white = np.array(_private_rows(shard.white_on_board - white_public), dtype=np.uint64)
+        # broadcast to every combination of the three rows
+        seeds = (
+            (public << 12)[:, None, None] + (black << 6)[None, :, None] + white[None, None, :]
+        )
+        parts.append(seeds.ravel() + np.uint64(shard.start_end_bits))
+    return np.sort(np.concatenate(parts))
+
+
+def iter_states(shards: Optional[Iterable[Shard]] = None) -> Iterator[int]:
+    """Lazily yield every legal seed, or only the seeds of the given shards."""
+    return chain.from_iterable(
+        iter_shard(shard) for shard in (all_shards() if shards is None else shards)
+    )
+
+
+# number of occupied grids in every 6-bit private row
+_PRIVATE_COUNTS = np.array([row.bit_count() for row in range(64)], dtype=np.int64)
+
+
+class SeedError(IntEnum):
+    """Reasons validate_batch rejects a seed, the first that applies is reported."""
+
+    valid = 0
+    # bits set above bit 39, which the Board constructor ignores and would
+    # make the seed alias a legal one
+    out_of_range = 1
+    # a public grid holding 0b11
+    invalid_grid = 2
+    white_pieces = 3
+    black_pieces = 4
+
+
+def validate_batch(seeds: np.ndarray) -> np.ndarray:
+    """Return the SeedError code of every seed of a uint64 array as uint8."""
+    seeds = np.asarray(seeds, dtype=np.uint64)
+    white = _PRIVATE_COUNTS[(seeds & np.uint64(0x3F)).astype(np.intp)]
+    black = _PRIVATE_COUNTS[((seeds >> np.uint64(6)) & np.uint64(0x3F)).astype(np.intp)]
+    invalid_grid = np.zeros(seeds.shape, dtype=bool)
+    for offset in range(12, 28, 2):
+        status = (seeds >> np.uint64(offset)) & np.uint64(0b11)
+        white = white + (status == 1)
+        black = black + (status == 2)
+        invalid_grid |= status == 0b11
+    start_end = [(seeds >> np.uint64(28 + 3 * i)) & np.uint64(0b111) for i in range(4)]
+    white = white + (start_end[0] + start_end[1]).astype(np.int64)
+    black = black + (start_end[2] + start_end[3]).astype(np.int64)
+
+    # assign in reverse order of precedence so the first error wins
+    codes = np.zeros(seeds.shape, dtype=np.uint8)
+    codes[black != 7] = SeedError.black_pieces
+    codes[white != 7] = SeedError.white_pieces
+    codes[invalid_grid] = SeedError.invalid_grid
+    codes[(seeds >> np.uint64(40)) != 0] = SeedError.out_of_range
+    return codes
+
+
+def legal_mask(seeds: np.ndarray) -> np.ndarray:
+    """Return which seeds of a uint64 array are legal, see validate_batch."""
+    return validate_batch(seeds) == SeedError.valid
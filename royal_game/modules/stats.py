@@ -0,0 +1,44 @@
+"""Statistics helpers for summarizing game outcomes."""
+
+from math import sqrt
+from statistics import NormalDist, fmean, stdev
+from typing import Sequence
+
+
+def z_score(confidence: float) -> float:
+    """Return the two-sided standard normal quantile for a confidence level."""
+    if not 0 < confidence < 1:
+        raise ValueError(f"Confidence level must be in (0, 1), got {confidence}.")
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+def wilson_interval(wins: int, num_games: int, z: float = 1.96) -> tuple[float, float]:
+    """
+    Wilson score interval for a win probability.
+
+    Unlike the normal approximation, the interval stays inside [0, 1]
+    and behaves well for win rates close to 0 or 1.
+    """
+    if num_games == 0:
+        return 0.0, 1.0
+
+    p = wins / num_games
+    denominator = 1 + z**2 / num_games
+    center = (p + z**2 / (2 * num_games)) / denominator
+    half_width = z * sqrt(p * (1 - p) / num_games + z**2 / (4 * num_games**2)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+def mean_interval(samples: Sequence[float], z: float = 1.96) -> tuple[float, float]:
+    """
+    Return a normal approximation interval for the mean of independent samples.
+
+    Used for paired games, where each sample is the average score of a
+    game and its color-swapped twin.
+    """
+    if len(samples) < 2:
+        return 0.0, 1.0
+
+    mean = fmean(samples)
+    half_width = z * stdev(samples, mean) / sqrt(len(samples))
+    return mean - half_width, mean + half_width
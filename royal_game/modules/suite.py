@@ -0,0 +1,162 @@
+"""
+Suites of start positions for tournaments.
+
+A suite file lists one start position per line, a decimal board seed with
+white to move, optionally followed by the name of its stratum and by a
+weight:
+
+    122138132480 opening 2
+    732828794880
+    837518624784 race 0.5
+    104689829892 0.5
+
+Blank lines and lines starting with # are skipped. Positions without a
+stratum are classified into STRATA: race once no capture is possible any
+more (see royal_game.modules.features.contact_possible), otherwise opening
+or middlegame by the game phase of royal_game.modules.regret. Weights
+default to 1.
+
+Games 2k and 2k+1 of a tournament pairing are color-swapped twins, and
+every twin pair starts from one position of the suite. Positions are
+assigned along a low-discrepancy sequence over the cumulative weights, so
+any run of consecutive twin pairs visits positions in proportion to their
+weights. The sequence only depends on the run seed, so every pairing plays
+the same positions and results do not depend on how games are split
+across workers.
+"""
+
+import random
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from pathlib import Path
+
+import numpy as np
+
+from royal_game.modules.features import contact_possible, start_end_counts
+from royal_game.modules.regret import PHASES, game_phase
+from royal_game.modules.state_space import SeedError, validate_batch
+
+STRATA = ("opening", "middlegame", "race")
+
+# fractional part of the golden ratio, whose multiples spread out most evenly
+_GOLDEN = 0.6180339887498949
+
+
+@dataclass
+class Suite:
+    """Start positions with their strata and weights."""
+
+    seeds: list[int]
+    strata: list[str]
+    weights: list[float]
+
+    def __post_init__(self) -> None:
+        if not self.seeds:
+            raise ValueError("A suite needs at least one position.")
+        if not len(self.seeds) == len(self.strata) == len(self.weights):
+            raise ValueError("Every position of a suite needs a stratum and a weight.")
+        if min(self.weights) < 0 or sum(self.weights) <= 0:
+            raise ValueError("Suite weights must be non-negative and not all 0.")
+        total = sum(self.weights)
+        self._bounds = [weight / total for weight in accumulate(self.weights)]
+
+    def __len__(self) -> int:
+        return len(self.seeds)
+
+    def position(self, run_seed: int, game: int) -> int:
+        """Return the index of the start position of a game of a run."""
+        offset = random.Random(f"{run_seed}:suite").random()
+        point = (offset + (game // 2) * _GOLDEN) % 1
+        return min(bisect_right(self._bounds, point), len(self.seeds) - 1)
+
+    def board_seed(self, run_seed: int, game: int) -> int:
+        """Return the start position of a game of a run."""
+        return self.seeds[self.position(run_seed, game)]
+
+    def stratum(self, run_seed: int, game: int) -> str:
+        """Return the stratum of the start position of a game of a run."""
+        return self.strata[self.position(run_seed, game)]
+
+    @property
+    def stratum_names(self) -> list[str]:
+        """Strata of the suite, those of STRATA first and then in order of appearance."""
+        present = dict.fromkeys(self.strata)
+        return [name for name in STRATA if name in present] + [
+            name for name in present if name not in STRATA
+        ]
+
+    def to_rows(self) -> list[list]:
+        """Return the positions as JSON serializable seed, stratum, weight rows."""
+        return [list(row) for row in zip(self.seeds, self.strata, self.weights)]
+
+    @classmethod
+    def from_rows(cls, rows: list[list]) -> "Suite":
+        """Rebuild a suite from the rows of to_rows."""
+        seeds, strata, weights = zip(*rows)
+        return cls(list(seeds), list(strata), list(weights))
+
+
+def classify(seeds: list[int]) -> list[str]:
+    """Return the name in STRATA of the stratum of every white-to-move seed."""
+    contact = contact_possible(seeds)
+    phases = game_phase(seeds)
+    return [
+        (
+            "race"
+            if not has_contact
+            else "opening"
+            if phase == PHASES.index("opening")
+            else "middlegame"
+        )
+        for has_contact, phase in zip(contact.tolist(), phases.tolist())
+    ]
+
+
+def _parse_line(path: Path, line_number: int, fields: list[str]) -> tuple[int, str, float]:
+    """Return the seed, stratum and weight of a suite line, with "" for no stratum."""
+    try:
+        seed = int(fields[0])
+        if not 0 <= seed < 1 << 40:
+            raise ValueError("seed out of range")
+        stratum, weight = "", 1.0
+        if len(fields) == 3:
+            stratum, weight = fields[1], float(fields[2])
+        elif len(fields) == 2:
+            try:
+                weight = float(fields[1])
+            except ValueError:
+                stratum = fields[1]
+        elif len(fields) > 3:
+            raise ValueError("expected a seed, a stratum and a weight")
+    except ValueError as e:
+        raise ValueError(f"{path}:{line_number}: {e}") from None
+    return seed, stratum, weight
+
+
+def load_suite(path: Path) -> Suite:
+    """Read a suite file, classifying the positions listed without a stratum."""
+    rows = []
+    with open(path, "r") as fin:
+        for line_number, line in enumerate(fin, 1):
+            fields = line.split()
+            if fields and not fields[0].startswith("#"):
+                rows.append((line_number, *_parse_line(path, line_number, fields)))
+    if not rows:
+        raise ValueError(f"{path} lists no positions.")
+
+    line_numbers, seeds, strata, weights = (list(column) for column in zip(*rows))
+    array = np.array(seeds, dtype=np.uint64)
+    errors = validate_batch(array)
+    counts = start_end_counts(array)
+    finished = (counts[:, 1] == 7) | (counts[:, 3] == 7)
+    for line_number, error, is_finished in zip(line_numbers, errors.tolist(), finished):
+        if error:
+            raise ValueError(f"{path}:{line_number}: invalid seed ({SeedError(error).name})")
+        if is_finished:
+            raise ValueError(f"{path}:{line_number}: the game is already over")
+
+    missing = [i for i, stratum in enumerate(strata) if not stratum]
+    for i, stratum in zip(missing, classify([seeds[i] for i in missing])):
+        strata[i] = stratum
+    return Suite(seeds, strata, weights)
@@ -0,0 +1,99 @@
+"""
+Color symmetry of the board representation.
+
+The game is symmetric under swapping the colors of every piece together with
+the W and B rows, so every (board, side to move) pair has a mirror image in
+which the other side is to move. Canonicalizing maps each pair onto the form
+where white is to move, so tables keyed by board seeds need only store
+white-to-move positions.
+
+Moves selected on a canonical board are translated back to the original
+board with mirror_move. Both swap_colors and mirror_move are involutions.
+"""
+
+import numpy as np
+
+from royal_game.modules.move import Move
+
+# masks over the 40-bit representation documented in royal_game.modules.board
+_WHITE_PRIVATE = 0x3F
+_PUBLIC_LOW = 0x5555 << 12
+_PUBLIC_HIGH = 0xAAAA << 12
+_WHITE_START_END = 0x3F << 28
+_BLACK_START_END = 0x3F << 34
+
+
+def swap_colors(seed: int) -> int:
+    """Return the seed of the board with all piece colors swapped."""
+    return (
+        ((seed >> 6) & _WHITE_PRIVATE)
+        | ((seed & _WHITE_PRIVATE) << 6)
+        # public grids use 0b01 for white and 0b10 for black
+        | ((seed & _PUBLIC_LOW) << 1)
+        | ((seed & _PUBLIC_HIGH) >> 1)
+        | ((seed & _BLACK_START_END) >> 6)
+        | ((seed & _WHITE_START_END) << 6)
+    )
+
+
+def canonicalize(seed: int, white_turn: bool) -> tuple[int, bool]:
+    """
+    Map a board and side to move onto the equivalent white-to-move board.
+
+    Return the canonical seed and whether the colors were swapped. If so,
+    moves available on the canonical board must be passed through mirror_move
+    before they are applied to the original board.
+    """
+    if white_turn:
+        return seed, False
+    return swap_colors(seed), True
+
+
+def mirror_grid(name: str) -> str:
+    """Return the name of the grid occupying the same position for the other color."""
+    if name[0] == "W":
+        return "B" + name[1:]
+    if name[0] == "B":
+        return "W" + name[1:]
+    return name
+
+
+def mirror_move(move: Move) -> Move:
+    """Return the equivalent move for the other color."""
+    return Move(
+        mirror_grid(move.grid1),
+        mirror_grid(move.grid2),
+        is_rosette=move.is_rosette,
+        is_capture=move.is_capture,
+        is_ascension=move.is_ascension,
+        is_onboard=move.is_onboard,
+        no_verify=True,
+    )
+
+
+def swap_colors_batch(seeds: np.ndarray) -> np.ndarray:
+    """Vectorized swap_colors over an array of seeds."""
+    seeds = np.asarray(seeds, dtype=np.uint64)
+    return (
+        ((seeds >> np.uint64(6)) & np.uint64(_WHITE_PRIVATE))
+        | ((seeds & np.uint64(_WHITE_PRIVATE)) << np.uint64(6))
+        | ((seeds & np.uint64(_PUBLIC_LOW)) << np.uint64(1))
+        | ((seeds & np.uint64(_PUBLIC_HIGH)) >> np.uint64(1))
+        | ((seeds & np.uint64(_BLACK_START_END)) >> np.uint64(6))
+        | ((seeds & np.uint64(_WHITE_START_END)) << np.uint64(6))
+    )
+
+
+def canonicalize_batch(
+    seeds: np.ndarray, white_turn: np.ndarray | bool
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized canonicalize over an array of seeds.
+
+    white_turn is either a single bool or a boolean array broadcastable
+    against seeds. Return the canonical seeds and a boolean array marking
+    the seeds whose colors were swapped.
+    """
+    seeds = np.asarray(seeds, dtype=np.uint64)
+    swapped = np.broadcast_to(~np.asarray(white_turn, dtype=bool), seeds.shape)
+    return np.where(swapped, swap_colors_batch(seeds), seeds), swapped.copy()
@@ -0,0 +1,209 @@
+"""
+TD(lambda) training of a ValueNetwork by self-play.
+
+Each round, worker processes play games in which both sides greedily
+maximize the current network over afterstates, and return the canonical
+position at the start of every turn. The parent then computes the
+lambda-returns of every trajectory and updates the network with one batched
+forward and backward pass over all positions of the round. This is the
+offline forward view of TD(lambda), so the weights stay fixed while a round
+of games is played.
+"""
+
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from random import choices
+from typing import Callable, Optional
+
+import numpy as np
+
+from royal_game.modules.board import Board
+from royal_game.modules.game import Game, dice_probabilities
+from royal_game.modules.player import Player
+from royal_game.modules.symmetry import canonicalize
+from royal_game.modules.value_network import ValueNetwork
+from royal_game.players.casper import Casper
+from royal_game.players.greedy import Greedy
+from royal_game.players.td_lambda import TdLambda
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Trajectory:
+    """Canonical positions at the start of every turn of one game."""
+
+    states: np.ndarray
+    white_turns: np.ndarray
+    white_wins: bool
+
+
+def play_trajectory(network: ValueNetwork, board_seed: int, epsilon: float = 0.0) -> Trajectory:
+    """Play one self-play game, selecting a random move with probability epsilon."""
+    board = Board(board_seed)
+    white_turn = True
+    states, white_turns = [], []
+
+    while not board.is_end_state():
+        states.append(canonicalize(int(board), white_turn)[0])
+        white_turns.append(white_turn)
+        dice_roll = choices([0, 1, 2, 3, 4], weights=dice_probabilities, k=1)[0]
+        available_moves = board.get_available_moves(white_turn, dice_roll) if dice_roll else ()
+        if not available_moves:
+            white_turn = not white_turn
+            continue
+
+        if len(available_moves) == 1:
+            move = available_moves[0]
+        elif random.random() < epsilon:
+            move = random.choice(available_moves)
+        else:
+            values = network.afterstate_values(board, available_moves, white_turn)
+            move = available_moves[int(np.argmax(values))]
+
+        board.make_move(move)
+        if not move.is_rosette:
+            white_turn = not white_turn
+
+    return Trajectory(
+        np.array(states, dtype=np.uint64),
+        np.array(white_turns, dtype=bool),
+        board.board["WE"].num_pieces == 7,
+    )
+
+
+def _play_trajectories(
+    params: dict[str, np.ndarray], board_seed: int, epsilon: float, num_games: int, seed: str
+) -> list[Trajectory]:
+    """Worker entry point playing a batch of games with the given weights."""
+    random.seed(seed)
+    network = ValueNetwork.__new__(ValueNetwork)
+    network.params = params
+    return [play_trajectory(network, board_seed, epsilon) for _ in range(num_games)]
+
+
+def lambda_returns(
+    values: np.ndarray, white_turns: np.ndarray, white_wins: bool, lam: float
+) -> np.ndarray:
+    """
+    Return the lambda-return target of every position of a trajectory.
+
+    values[t] is the network's estimate that the side to move at t wins.
+    Estimates are flipped whenever the side to move changes.
+    """
+    targets = np.empty(len(values))
+    target = float(white_turns[-1] == white_wins)
+    targets[-1] = target
+    for t in range(len(values) - 2, -1, -1):
+        blended = (1 - lam) * values[t + 1] + lam * target
+        target = blended if white_turns[t] == white_turns[t + 1] else 1 - blended
+        targets[t] = target
+    return targets
+
+
+def td_update(
+    network: ValueNetwork, trajectories: list[Trajectory], lam: float, alpha: float
+) -> float:
+    """Apply one batched update towards the lambda-returns and return the mean squared error."""
+    lengths = [len(trajectory.states) for trajectory in trajectories]
+    inputs = network.inputs(np.concatenate([trajectory.states for trajectory in trajectories]))
+    hidden, output = network.forward(inputs)
+
+    targets = np.concatenate(
+        [
+            lambda_returns(values, trajectory.white_turns, trajectory.white_wins, lam)
+            for trajectory, values in zip(
+                trajectories, np.split(output, np.cumsum(lengths)[:-1])
+            )
+        ]
+    )
+    errors = output - targets
+    gradients = network.backward(inputs, hidden, output, errors)
+    for name, gradient in gradients.items():
+        # average over games rather than positions so long games are not underweighted
+        network.params[name] -= alpha * gradient / len(trajectories)
+    return float(np.mean(errors**2))
+
+
+def win_rate(
+    network: ValueNetwork, opponent: type[Player], num_games: int, board_seed: int
+) -> float:
+    """Play half the games as each color against opponent and return the win rate."""
+    wins = 0
+    for i in range(num_games):
+        player = TdLambda(network=network)
+        if i < num_games // 2:
+            wins += Game(player, opponent(), board_seed).play()
+        else:
+            wins += not Game(opponent(), player, board_seed).play()
+    return wins / num_games
+
+
+def train(
+    network: ValueNetwork,
+    num_rounds: int,
+    games_per_round: int,
+    lam: float = 0.7,
+    alpha: float = 0.1,
+    epsilon: float = 0.0,
+    board_seed: int = 122138132480,
+    eval_every: int = 10,
+    eval_games: int = 200,
+    run_seed: int = 0,
+    processes: Optional[int] = None,
+    checkpoint: Optional[Callable[[ValueNetwork], None]] = None,
+) -> ValueNetwork:
+    """
+    Train network in place by self-play and return it.
+
+    Games of each round are split evenly across the worker processes.
+    Throughput is logged every round and win rates against Greedy and
+    Casper every eval_every rounds, after which checkpoint(network) is
+    called if given.
+    """
+    processes = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        for round_index in range(1, num_rounds + 1):
+            start = time.perf_counter()
+            batch_sizes = [
+                games_per_round // processes + (i < games_per_round % processes)
+                for i in range(processes)
+            ]
+            futures = [
+                executor.submit(
+                    _play_trajectories,
+                    network.params,
+                    board_seed,
+                    epsilon,
+                    batch_size,
+                    f"{run_seed}:{round_index}:{i}",
+                )
+                for i, batch_size in enumerate(batch_sizes)
+                if batch_size
+            ]
+            trajectories = [trajectory for future in futures for trajectory in future.result()]
+            play_time = time.perf_counter() - start
+            error = td_update(network, trajectories, lam, alpha)
+            logger.info(
+                "Round %d: %.1f games/sec, %d positions, mean squared TD error %.4f.",
+                round_index,
+                len(trajectories) / play_time,
+                sum(len(trajectory.states) for trajectory in trajectories),
+                error,
+            )
+
+            if round_index % eval_every == 0 or round_index == num_rounds:
+                random.seed(f"{run_seed}:eval:{round_index}")
+                logger.info(
+                    "Round %d: win rate %.3f against Greedy, %.3f against Casper.",
+                    round_index,
+                    win_rate(network, Greedy, eval_games, board_seed),
+                    win_rate(network, Casper, eval_games, board_seed),
+                )
+                if checkpoint is not None:
+                    checkpoint(network)
+    return network
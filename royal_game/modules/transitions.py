@@ -0,0 +1,265 @@
+"""
+Precomputed transition graph of the game.
+
+States are canonical white-to-move seeds (see royal_game.modules.symmetry)
+numbered by their position in an ascending array. For every dice roll of
+1-4, the successors of each state are stored in compressed sparse row
+form over these dense indices:
+
+    roll{r}_indptr.npy      int64, one more entry than there are states
+    roll{r}_indices.npy     uint32, dense index of each successor
+    roll{r}_extra_turn.npy  bool, whether the move landed on a rosette
+
+A successor with an extra turn is the board after the move, still with
+white to move. Otherwise it is the color-swapped board after the move,
+since the opponent moves next. A roll without available moves stores a
+single pass to the color-swapped board, end states store no successors,
+and a roll of 0 always passes and is not stored.
+
+All arrays are plain .npy files so they can be memory-mapped.
+"""
+
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Iterable, Optional
+
+import numpy as np
+
+from royal_game.modules.board import Board
+from royal_game.modules.game import dice_probabilities
+from royal_game.modules.move import Move
+from royal_game.modules.selfplay import ordered_results
+from royal_game.modules.state_space import all_shards, shard_array
+from royal_game.modules.symmetry import swap_colors
+
+FORMAT_VERSION = 1
+
+
+def is_end_seed(seed: int) -> bool:
+    """Check if either color has all 7 pieces at the end without decoding the board."""
+    return (seed >> 31) & 0b111 == 7 or (seed >> 37) & 0b111 == 7
+
+
+def afterstates(seed: int, dice_roll: int) -> list[tuple[Move, int, bool]]:
+    """
+    Return the moves available on a white-to-move seed with their canonical successors.
+
+    Each entry is the move, the canonical seed after it and whether the
+    move gives white an extra turn. End states have no moves.
+    """
+    if is_end_seed(seed):
+        return []
+
+    board = Board(seed)
+    result = []
+    for move in board.get_available_moves(True, dice_roll):
+        child = board.clone()
+        child.make_move(move)
+        if move.is_rosette:
+            result.append((move, int(child), True))
+        else:
+            result.append((move, swap_colors(int(child)), False))
+    return result
+
+
+def successors(seed: int, dice_roll: int) -> list[tuple[int, bool]]:
+    """
+    Return the canonical successors of a white-to-move seed for a dice roll.
+
+    Each successor is a pair of the canonical seed and whether the move
+    gives white an extra turn.
+    """
+    if is_end_seed(seed):
+        return []
+
+    moves = afterstates(seed, dice_roll)
+    if not moves:
+        return [(swap_colors(seed), False)]
+    return [(child, extra_turn) for _, child, extra_turn in moves]
+
+
+def reachable_states(roots: Iterable[int]) -> np.ndarray:
+    """Return the ascending canonical seeds reachable from white-to-move roots."""
+    seen = set(roots)
+    queue = deque(seen)
+    while queue:
+        seed = queue.popleft()
+        if is_end_seed(seed):
+            continue
+        # a roll of 0 always passes the turn
+        children = [swap_colors(seed)] + [
+            child for dice_roll in range(1, 5) for child, _ in successors(seed, dice_roll)
+        ]
+        for child in children:
+            if child not in seen:
+                seen.add(child)
+                queue.append(child)
+    return np.array(sorted(seen), dtype=np.uint64)
+
+
+def all_states() -> np.ndarray:
+    """Return every legal seed in ascending order."""
+    return np.sort(np.concatenate([shard_array(shard) for shard in all_shards()]))
+
+
+def _build_block(
+    states_path: Path, start: int, stop: int
+) -> dict[int, tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Compute the row lengths, successor indices and extra turn flags of a block of states."""
+    states = np.load(states_path, mmap_mode="r")
+    block = {}
+    for dice_roll in range(1, 5):
+        counts = np.zeros(stop - start, dtype=np.uint8)
+        children: list[int] = []
+        extra_turn: list[bool] = []
+        for i, seed in enumerate(states[start:stop].tolist()):
+            row = successors(seed, dice_roll)
+            counts[i] = len(row)
+            for child, extra in row:
+                children.append(child)
+                extra_turn.append(extra)
+
+        child_seeds = np.array(children, dtype=np.uint64)
+        indices = np.searchsorted(states, child_seeds)
+        if len(indices) and (
+            indices.max() >= len(states) or (states[indices] != child_seeds).any()
+        ):
+            raise ValueError("The state set is not closed under successors.")
+        block[dice_roll] = (
+            counts,
+            indices.astype(np.uint32),
+            np.array(extra_turn, dtype=bool),
+        )
+    return block
+
+
+def _raw_to_npy(raw_path: Path, npy_path: Path, dtype: type, length: int) -> None:
+    """Copy a raw array file into a .npy file in bounded chunks."""
+    out = np.lib.format.open_memmap(npy_path, mode="w+", dtype=dtype, shape=(length,))
+    if length:
+        source = np.memmap(raw_path, dtype=dtype, mode="r")
+        for start in range(0, length, 1 << 24):
+            out[start : start + (1 << 24)] = source[start : start + (1 << 24)]
+    out.flush()
+
+
+def build_transitions(
+    states: np.ndarray,
+    out_dir: Path,
+    processes: Optional[int] = None,
+    block_size: int = 100_000,
+) -> None:
+    """
+    Write the transition graph of a closed, ascending array of states to out_dir.
+
+    States are split into blocks that are processed across a process pool,
+    with at most two blocks per worker in flight. Results are streamed to
+    disk in block order, so memory use is bounded by the block size rather
+    than the size of the graph.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    states_path = out_dir / "states.npy"
+    np.save(states_path, np.asarray(states, dtype=np.uint64))
+    num_states = len(states)
+    starts = range(0, num_states, block_size)
+
+    names = ("counts", "indices", "extra_turn")
+    with TemporaryDirectory(dir=out_dir) as tmp:
+        tmp = Path(tmp)
+        with ExitStack() as stack:
+            raw = {
+                (dice_roll, name): stack.enter_context(
+                    open(tmp / f"roll{dice_roll}_{name}.raw", "wb")
+                )
+                for dice_roll in range(1, 5)
+                for name in names
+            }
+            processes = processes or os.cpu_count() or 1
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=processes))
+            tasks = (
+                (states_path, start, min(start + block_size, num_states)) for start in starts
+            )
+            blocks = ordered_results(executor, _build_block, tasks, 2 * processes)
+            for block in blocks:
+                for dice_roll, arrays in block.items():
+                    for name, array in zip(names, arrays):
+                        array.tofile(raw[(dice_roll, name)])
+
+        for dice_roll in range(1, 5):
+            counts = np.memmap(tmp / f"roll{dice_roll}_counts.raw", dtype=np.uint8, mode="r")
+            indptr = np.zeros(num_states + 1, dtype=np.int64)
+            np.cumsum(counts, dtype=np.int64, out=indptr[1:])
+            np.save(out_dir / f"roll{dice_roll}_indptr.npy", indptr)
+            for name, dtype in (("indices", np.uint32), ("extra_turn", bool)):
+                _raw_to_npy(
+                    tmp / f"roll{dice_roll}_{name}.raw",
+                    out_dir / f"roll{dice_roll}_{name}.npy",
+                    dtype,
+                    int(indptr[-1]),
+                )
+
+    with open(out_dir / "meta.json", "w") as fout:
+        json.dump(
+            {
+                "format_version": FORMAT_VERSION,
+                "num_states": num_states,
+                "dice_probabilities": list(dice_probabilities),
+            },
+            fout,
+            indent=2,
+        )
+
+
+@dataclass
+class TransitionGraph:
+    """Memory-mapped transition graph written by build_transitions."""
+
+    states: np.ndarray
+    indptr: dict[int, np.ndarray]
+    indices: dict[int, np.ndarray]
+    extra_turn: dict[int, np.ndarray]
+
+    @property
+    def num_states(self) -> int:
+        """Number of canonical states in the graph."""
+        return len(self.states)
+
+    def index_of(self, seeds: np.ndarray) -> np.ndarray:
+        """Return the dense indices of canonical seeds, which must be in the graph."""
+        seeds = np.asarray(seeds, dtype=np.uint64)
+        indices = np.searchsorted(self.states, seeds)
+        if (indices >= self.num_states).any() or (self.states[indices] != seeds).any():
+            raise KeyError("Some seeds are not states of the transition graph.")
+        return indices
+
+    def successors(self, index: int, dice_roll: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the successor indices and extra turn flags of a state for a dice roll."""
+        start, stop = self.indptr[dice_roll][index], self.indptr[dice_roll][index + 1]
+        return (
+            self.indices[dice_roll][start:stop],
+            self.extra_turn[dice_roll][start:stop],
+        )
+
+
+def load_transitions(directory: Path, mmap_mode: Optional[str] = "r") -> TransitionGraph:
+    """Load a transition graph, memory-mapping the arrays by default."""
+    with open(directory / "meta.json", "r") as fin:
+        meta = json.load(fin)
+    if meta["format_version"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported transition graph version {meta['format_version']}.")
+
+    def load(name: str) -> np.ndarray:
+        return np.load(directory / f"{name}.npy", mmap_mode=mmap_mode)
+
+    return TransitionGraph(
+        load("states"),
+        {dice_roll: load(f"roll{dice_roll}_indptr") for dice_roll in range(1, 5)},
+        {dice_roll: load(f"roll{dice_roll}_indices") for dice_roll in range(1, 5)},
+        {dice_roll: load(f"roll{dice_roll}_extra_turn") for dice_roll in range(1, 5)},
+    )
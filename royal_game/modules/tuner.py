@@ -0,0 +1,212 @@
+"""
+Genetic algorithm tuning of the Parametric player.
+
+Every generation, each candidate parameter vector plays the same seeded
+games against every opponent, once as white and once as black per seed.
+Sharing game seeds between the candidates of a generation (common random
+numbers) means fitness differences come from the parameters rather than
+from the dice, and fresh seeds every generation keep the search from
+overfitting a fixed set of games. Candidates are evaluated in a process
+pool, and the population is checkpointed to JSON after every generation so
+a long run can be resumed.
+"""
+
+import json
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from royal_game._exceptions import OpponentMismatch
+from royal_game.modules.game import Game
+from royal_game.modules.player import Player
+from royal_game.players.parametric import DEFAULT_PARAMETERS, PARAMETER_NAMES, Parametric
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TunerState:
+    """Everything needed to resume tuning after a generation has been evaluated."""
+
+    generation: int
+    population: list[list[float]]
+    fitnesses: list[float]
+    rng_state: dict
+    settings: dict
+
+    @property
+    def best_parameters(self) -> dict[str, float]:
+        """Parameters of the fittest candidate of the latest generation."""
+        best = self.population[int(np.argmax(self.fitnesses))]
+        return dict(zip(PARAMETER_NAMES, best))
+
+    def save(self, path: Path) -> None:
+        """Write the state atomically so an interrupted run keeps the previous checkpoint."""
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "w") as fout:
+            json.dump(asdict(self), fout, indent=2)
+        temp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "TunerState":
+        """Load a state saved with save."""
+        with open(path, "r") as fin:
+            return cls(**json.load(fin))
+
+
+def candidate_fitness(
+    parameters: list[float],
+    opponents: list[type[Player]],
+    board_seed: int,
+    num_games: int,
+    seed_prefix: str,
+) -> float:
+    """Return the win rate of a candidate over num_games seeds per opponent and color."""
+    parameters = dict(zip(PARAMETER_NAMES, parameters))
+    wins = 0
+    for opponent in opponents:
+        for i in range(num_games):
+            random.seed(f"{seed_prefix}:{i}")
+            wins += Game(Parametric(parameters), opponent(), board_seed).play()
+            random.seed(f"{seed_prefix}:{i}")
+            wins += not Game(opponent(), Parametric(parameters), board_seed).play()
+    return wins / (2 * num_games * len(opponents))
+
+
+def next_population(
+    population: np.ndarray,
+    fitnesses: np.ndarray,
+    rng: np.random.Generator,
+    num_elite: int,
+    sigma: float,
+    tournament_size: int = 3,
+) -> np.ndarray:
+    """
+    Breed the next generation.
+
+    The num_elite fittest candidates survive unchanged. Every other child
+    blends two parents picked by tournament selection and receives Gaussian
+    mutation with standard deviation sigma.
+    """
+    size, num_parameters = population.shape
+    elite = population[np.argsort(-fitnesses, kind="stable")[:num_elite]]
+
+    def select() -> np.ndarray:
+        contestants = rng.choice(size, tournament_size)
+        return population[contestants[np.argmax(fitnesses[contestants])]]
+
+    children = []
+    for _ in range(size - len(elite)):
+        mother, father = select(), select()
+        blend = rng.uniform(-0.25, 1.25, num_parameters)
+        child = mother + blend * (father - mother)
+        children.append(child + rng.normal(0, sigma, num_parameters))
+    return np.vstack([elite, *children]) if children else elite
+
+
+def initial_population(size: int, rng: np.random.Generator, sigma: float) -> np.ndarray:
+    """Return the default parameters followed by Gaussian perturbations of them."""
+    defaults = np.array([DEFAULT_PARAMETERS[name] for name in PARAMETER_NAMES])
+    noise = rng.normal(0, sigma, (size, len(defaults)))
+    noise[0] = 0
+    return defaults + noise
+
+
+def tune(
+    opponents: list[type[Player]],
+    num_generations: int,
+    population_size: int = 24,
+    num_games: int = 100,
+    sigma: float = 2.0,
+    num_elite: int = 2,
+    board_seed: int = 122138132480,
+    run_seed: int = 0,
+    processes: Optional[int] = None,
+    checkpoint_file: Optional[Path] = None,
+    resume: bool = False,
+) -> TunerState:
+    """
+    Run the genetic algorithm for num_generations generations and return the final state.
+
+    With resume, the population, generation counter and random state are
+    restored from checkpoint_file and tuning continues where it stopped.
+    The settings of a resumed run are the ones it was started with, and
+    opponents must be the ones it was started with, or OpponentMismatch is
+    raised.
+    """
+    if resume:
+        state = TunerState.load(checkpoint_file)
+        settings = state.settings
+        names = [opponent.__name__ for opponent in opponents]
+        if names != settings["opponents"]:
+            raise OpponentMismatch(checkpoint_file, settings["opponents"], names)
+        rng = np.random.default_rng()
+        rng.bit_generator.state = state.rng_state
+        population = next_population(
+            np.array(state.population),
+            np.array(state.fitnesses),
+            rng,
+            settings["num_elite"],
+            settings["sigma"],
+        )
+        first_generation = state.generation + 1
+        logger.info("Resuming from generation %d.", first_generation)
+    else:
+        settings = {
+            "opponents": [opponent.__name__ for opponent in opponents],
+            "population_size": population_size,
+            "num_games": num_games,
+            "sigma": sigma,
+            "num_elite": num_elite,
+            "board_seed": board_seed,
+            "run_seed": run_seed,
+        }
+        rng = np.random.default_rng(run_seed)
+        population = initial_population(population_size, rng, sigma)
+        first_generation = 0
+
+    state = None
+    with ProcessPoolExecutor(max_workers=processes or os.cpu_count() or 1) as executor:
+        for generation in range(first_generation, first_generation + num_generations):
+            start = time.perf_counter()
+            # every candidate of a generation plays the same seeds
+            seed_prefix = f"{settings['run_seed']}:{generation}"
+            fitnesses = np.array(
+                list(
+                    executor.map(
+                        candidate_fitness,
+                        population.tolist(),
+                        [opponents] * len(population),
+                        [settings["board_seed"]] * len(population),
+                        [settings["num_games"]] * len(population),
+                        [seed_prefix] * len(population),
+                    )
+                )
+            )
+            state = TunerState(
+                generation,
+                population.tolist(),
+                fitnesses.tolist(),
+                rng.bit_generator.state,
+                settings,
+            )
+            if checkpoint_file is not None:
+                state.save(checkpoint_file)
+            logger.info(
+                "Generation %d: best %.3f, mean %.3f, %.1f sec.",
+                generation,
+                fitnesses.max(),
+                fitnesses.mean(),
+                time.perf_counter() - start,
+            )
+            population = next_population(
+                population, fitnesses, rng, settings["num_elite"], settings["sigma"]
+            )
+    return state
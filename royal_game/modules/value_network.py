@@ -0,0 +1,115 @@
+"""
+Neural network value function over board features.
+
+A single hidden layer network maps the features of a canonical
+white-to-move seed to the probability that white wins. Forward and
+backward passes operate on whole batches of seeds at once.
+"""
+
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from royal_game.modules.board import Board
+from royal_game.modules.features import FEATURE_NAMES, extract_features
+from royal_game.modules.move import Move
+from royal_game.modules.symmetry import canonicalize_batch
+
+# divide every feature by its largest possible value
+FEATURE_SCALE = np.array(
+    [
+        105.0 if "pip_count" in name else 1.0 if "rosette" in name else 7.0
+        for name in FEATURE_NAMES
+    ],
+    dtype=np.float64,
+)
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1 / (1 + np.exp(-x))
+
+
+class ValueNetwork:
+    """Win probability of the side to move, evaluated on canonical seeds."""
+
+    def __init__(self, num_hidden: int = 40, random_seed: Optional[int] = 0) -> None:
+        rng = np.random.default_rng(random_seed)
+        num_inputs = len(FEATURE_NAMES)
+        self.params = {
+            "hidden_weights": rng.normal(0, 1 / np.sqrt(num_inputs), (num_inputs, num_hidden)),
+            "hidden_bias": np.zeros(num_hidden),
+            "output_weights": rng.normal(0, 1 / np.sqrt(num_hidden), num_hidden),
+            "output_bias": np.zeros(1),
+        }
+
+    @property
+    def num_hidden(self) -> int:
+        """Number of hidden units."""
+        return len(self.params["hidden_bias"])
+
+    def inputs(self, seeds: np.ndarray) -> np.ndarray:
+        """Return the scaled feature matrix of canonical seeds."""
+        return extract_features(seeds, dtype=np.float64) / FEATURE_SCALE
+
+    def forward(self, inputs: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Return the hidden activations and output values of a batch of inputs."""
+        hidden = np.tanh(inputs @ self.params["hidden_weights"] + self.params["hidden_bias"])
+        output = _sigmoid(hidden @ self.params["output_weights"] + self.params["output_bias"])
+        return hidden, output
+
+    def backward(
+        self, inputs: np.ndarray, hidden: np.ndarray, output: np.ndarray, errors: np.ndarray
+    ) -> dict[str, np.ndarray]:
+        """
+        Return the gradients of sum(errors * output) with respect to every parameter.
+
+        With errors = output - target this is the gradient of half the
+        squared error over the batch.
+        """
+        output_delta = errors * output * (1 - output)
+        hidden_delta = np.outer(output_delta, self.params["output_weights"]) * (1 - hidden**2)
+        return {
+            "hidden_weights": inputs.T @ hidden_delta,
+            "hidden_bias": hidden_delta.sum(axis=0),
+            "output_weights": hidden.T @ output_delta,
+            "output_bias": np.array([output_delta.sum()]),
+        }
+
+    def evaluate(self, seeds: np.ndarray) -> np.ndarray:
+        """Return the white win probability of canonical white-to-move seeds."""
+        seeds = np.atleast_1d(np.asarray(seeds, dtype=np.uint64))
+        values = self.forward(self.inputs(seeds))[1]
+        # end states are scored exactly
+        white_end = ((seeds >> np.uint64(31)) & np.uint64(0b111)) == 7
+        black_end = ((seeds >> np.uint64(37)) & np.uint64(0b111)) == 7
+        return np.where(white_end, 1.0, np.where(black_end, 0.0, values))
+
+    def afterstate_values(
+        self, board: Board, moves: Iterable[Move], white_turn: bool
+    ) -> np.ndarray:
+        """Return the mover's win probability after each move."""
+        seeds, next_turns = [], []
+        for move in moves:
+            child = board.clone()
+            child.make_move(move)
+            seeds.append(int(child))
+            next_turns.append(white_turn if move.is_rosette else not white_turn)
+
+        next_turns = np.array(next_turns)
+        canonical, _ = canonicalize_batch(np.array(seeds, dtype=np.uint64), next_turns)
+        values = self.evaluate(canonical)
+        # values are from the perspective of whoever moves next
+        return np.where(next_turns == white_turn, values, 1 - values)
+
+    def save(self, path: Path) -> None:
+        """Save the parameters to an .npz file."""
+        np.savez(path, **self.params)
+
+    @classmethod
+    def load(cls, path: Path) -> "ValueNetwork":
+        """Load parameters saved with save."""
+        network = cls.__new__(cls)
+        with np.load(path) as params:
+            network.params = {name: params[name] for name in params.files}
+        return network
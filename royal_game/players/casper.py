@@ -34,25 +34,42 @@ class Casper(Player):
 
         The dummy always return the first available move.
         """
+        candidates = self.candidate_moves(board, available_moves, white_turn)
+        if len(candidates) == 1:
+            return candidates[0]
+        # fall back to moving randomly
+        return candidates[randint(0, len(candidates) - 1)]
+
+    def move_distribution(
+        self, board: Board, available_moves: Iterable[Move], white_turn: bool
+    ) -> list[tuple[Move, float]]:
+        """Select uniformly among the candidate moves."""
+        candidates = self.candidate_moves(board, available_moves, white_turn)
+        return [(move, 1 / len(candidates)) for move in candidates]
+
+    def candidate_moves(
+        self, board: Board, available_moves: Iterable[Move], white_turn: bool
+    ) -> list[Move]:
+        """Return the single preferred move, or the moves to choose randomly from."""
         # convert to list so moves can be eliminated from consideration
         available_moves = list(available_moves)
 
         # always claim center rosette when possible
         for move in available_moves:
             if move.grid2 == "8":
-                return move
+                return [move]
 
         # filter out all moves away from the center rosette unless
         # there are no other options
         if len(available_moves) > 1:
             available_moves = [move for move in available_moves if move.grid1 != "8"]
         else:
-            return available_moves[0]
+            return available_moves
 
         # otherwise always rosette when possible
         for move in available_moves:
             if move.is_rosette:
-                return move
+                return [move]
 
         white_at_back, black_at_back = 0, 0
 
@@ -70,12 +87,11 @@ class Casper(Player):
         ):
             for move in available_moves:
                 if move.is_onboard:
-                    return move
+                    return [move]
 
         # if no better moves are available, then captures whenever possible
         for move in available_moves:
             if move.is_capture:
-                return move
+                return [move]
 
-        # fall back to moving randomly
-        return available_moves[randint(0, len(available_moves) - 1)]
+        return available_moves
@@ -0,0 +1,109 @@
+"""A player that replays a compiled move table."""
+
+import logging
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from royal_game.modules.board import Board
+from royal_game.modules.move import Move
+from royal_game.modules.player import Player
+from royal_game.modules.policy_table import PolicyTable, dice_roll_of, preferred_move
+from royal_game.modules.registry import load_player
+from royal_game.modules.shared_table import SharedTable, get_shared
+
+# compile_player.py writes the table here by default
+DEFAULT_TABLE = Path("compiled.npz")
+# played in place of a missing table
+DEFAULT_SOURCE = "greedy"
+
+logger = logging.getLogger(__name__)
+
+
+def table_path(table: Optional[Path] = None) -> Path:
+    """Return the table file a Compiled player reads."""
+    return Path(table or os.environ.get("ROYAL_GAME_COMPILED", DEFAULT_TABLE))
+
+
+def table_key(path: Path) -> str:
+    """Return the key a table file is shared under."""
+    return f"compiled:{path.resolve()}"
+
+
+@lru_cache(maxsize=None)
+def load_table(path: Path) -> PolicyTable:
+    """
+    Return the table stored in path, loading it only once per process.
+
+    Without a table file, an empty table of DEFAULT_SOURCE is returned, so
+    every decision is delegated to that player.
+    """
+    if path.exists():
+        return PolicyTable.load(path)
+    logger.warning("%s not found, playing %s instead.", path, DEFAULT_SOURCE)
+    return PolicyTable(
+        np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.uint8), DEFAULT_SOURCE
+    )
+
+
+class Compiled(Player):
+    """Plays the moves stored in a PolicyTable."""
+
+    def __init__(self, table: Optional[Path] = None, policy: Optional[PolicyTable] = None):
+        """
+        Load the move table.
+
+        The table is read from the table argument, the ROYAL_GAME_COMPILED
+        environment variable or compiled.npz in the working directory, in
+        that order, unless share_tables has placed it in shared memory. A
+        PolicyTable can be passed directly instead. Decisions
+        missing from the table are decided the way the compiled player would
+        have been compiled, and counted in misses. Without a table file,
+        DEFAULT_SOURCE decides every move.
+        """
+        if policy is None:
+            path = table_path(table)
+            shared = get_shared(table_key(path))
+            policy = (
+                load_table(path.resolve())
+                if shared is None
+                else PolicyTable.from_shared(shared)
+            )
+        self.policy = policy
+        self.misses = 0
+        self._fallback: Optional[Player] = None
+        super().__init__(f"Compiled {policy.player}")
+
+    @classmethod
+    def share_tables(cls) -> dict[str, SharedTable]:
+        """Share the default table, so workers and per-game instances do not load it."""
+        path = table_path()
+        if not path.exists():
+            return {}
+        return {table_key(path): PolicyTable.load(path).share()}
+
+    def select_move(
+        self, board: Board, available_moves: Iterable[Move], white_turn: bool
+    ) -> Move:
+        """Select the move stored for the board, side and dice roll."""
+        if len(available_moves) == 1:
+            return available_moves[0]
+
+        position = self.policy.lookup(int(board), white_turn, dice_roll_of(available_moves))
+        if position is not None:
+            for move in available_moves:
+                if move.path_position == position:
+                    return move
+
+        self.misses += 1
+        if self._fallback is None:
+            # load_table has already warned about an empty table
+            if len(self.policy):
+                logger.warning(
+                    "Decision missing from the table, loading %s.", self.policy.player
+                )
+            self._fallback = load_player(self.policy.player)()
+        return preferred_move(self._fallback, board, available_moves, white_turn)
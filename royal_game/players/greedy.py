@@ -33,17 +33,31 @@ class Greedy(Player):
 
         The dummy always return the first available move.
         """
+        candidates = self.candidate_moves(available_moves)
+        if len(candidates) == 1:
+            return candidates[0]
+        # If none of these options are available, select a move randomly
+        return candidates[randint(0, len(candidates) - 1)]
+
+    def move_distribution(
+        self, board: Board, available_moves: Iterable[Move], white_turn: bool
+    ) -> list[tuple[Move, float]]:
+        """Select uniformly among the candidate moves."""
+        candidates = self.candidate_moves(available_moves)
+        return [(move, 1 / len(candidates)) for move in candidates]
+
+    def candidate_moves(self, available_moves: Iterable[Move]) -> list[Move]:
+        """Return the single preferred move, or all moves if none is preferred."""
         # Takes an ascension whenever it is available
         for move in available_moves:
             if move.is_ascension:
-                return move
+                return [move]
         # Then tries to claim a rosette
         for move in available_moves:
             if move.is_rosette:
-                return move
+                return [move]
         # Then tries to capture enemy pieces
         for move in available_moves:
             if move.is_capture:
-                return move
-        # If none of these options are available, select a move randomly
-        return available_moves[randint(0, len(available_moves) - 1)]
+                return [move]
+        return list(available_moves)
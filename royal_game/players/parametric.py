@@ -0,0 +1,143 @@
+"""A parametric version of Casper's heuristics for automatic tuning."""
+
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Mapping, Optional
+
+from royal_game._constants import black_order_iter, white_order_iter
+from royal_game.modules.board import Board
+from royal_game.modules.grid_status import GridStatus
+from royal_game.modules.move import Move
+from royal_game.modules.player import Player
+
+# tune.py writes the best parameters here by default
+DEFAULT_PARAMETERS_FILE = Path("parametric.json")
+
+PARAMETER_NAMES = (
+    "center_rosette",
+    "leave_center",
+    "rosette",
+    "capture",
+    "onboard",
+    "onboard_behind",
+    "ascension",
+    "advance",
+    "land_threatened",
+    "escape_threat",
+)
+
+# reproduces the priority order of Casper's heuristics
+DEFAULT_PARAMETERS = {
+    "center_rosette": 16.0,
+    "leave_center": -32.0,
+    "rosette": 8.0,
+    "capture": 2.0,
+    "onboard": 0.0,
+    "onboard_behind": 4.0,
+    "ascension": 0.0,
+    "advance": 0.0,
+    "land_threatened": 0.0,
+    "escape_threat": 0.0,
+}
+
+
+@lru_cache(maxsize=None)
+def load_parameters(parameters_file: Path) -> Optional[dict[str, float]]:
+    """Return the parameters saved in a file by tune.py, read once per process, or None."""
+    if not parameters_file.exists():
+        return None
+    with open(parameters_file, "r") as fin:
+        return json.load(fin)["parameters"]
+
+
+def threatened_positions(board: Board, white_turn: bool) -> set[int]:
+    """Return the mover's path positions an opponent piece could capture on next turn."""
+    opponent_status = GridStatus.black if white_turn else GridStatus.white
+    opponent_path = list(black_order_iter() if white_turn else white_order_iter())
+    threatened = set()
+    for i, name in enumerate(opponent_path):
+        if board.board[name].status is opponent_status:
+            # both paths share positions 5-12, the center rosette is safe
+            threatened.update(
+                position
+                for position in range(i + 2, i + 6)
+                if 5 <= position <= 12 and position != 8
+            )
+    return threatened
+
+
+class Parametric(Player):
+    """You must implement the select_move method!"""  # noqa: D400
+
+    def __init__(
+        self,
+        parameters: Optional[Mapping[str, float]] = None,
+        parameters_file: Optional[Path] = None,
+    ):
+        """
+        Set the weight of every move feature.
+
+        Parameters are taken from the parameters argument, then from the JSON
+        file given by parameters_file or the ROYAL_GAME_PARAMETRIC environment
+        variable, then from parametric.json in the working directory. Missing
+        weights default to DEFAULT_PARAMETERS.
+        """
+        name = "Parametric heuristics"
+        super().__init__(name)
+
+        if parameters is None:
+            parameters_file = Path(
+                parameters_file
+                or os.environ.get("ROYAL_GAME_PARAMETRIC", DEFAULT_PARAMETERS_FILE)
+            )
+            parameters = load_parameters(parameters_file.resolve())
+        self.parameters = {**DEFAULT_PARAMETERS, **(parameters or {})}
+
+    @staticmethod
+    def move_features(move: Move, behind: bool, threatened: set[int]) -> dict[str, float]:
+        """
+        Return the features of a move that the parameters weigh.
+
+        behind is whether the opponent has more pieces on their private
+        tiles, and threatened the positions opponent pieces can reach.
+        """
+        source = move.path_position
+        target = 15 if move.is_ascension else int(move.grid2.lstrip("WB"))
+        return {
+            "center_rosette": float(move.grid2 == "8"),
+            "leave_center": float(move.grid1 == "8"),
+            "rosette": float(move.is_rosette),
+            "capture": float(move.is_capture),
+            "onboard": float(move.is_onboard),
+            "onboard_behind": float(move.is_onboard and behind),
+            "ascension": float(move.is_ascension),
+            "advance": source / 14,
+            "land_threatened": float(target in threatened),
+            "escape_threat": float(source in threatened),
+        }
+
+    def select_move(
+        self, board: Board, available_moves: Iterable[Move], white_turn: bool
+    ) -> Move:
+        """Select the move with the highest weighted sum of features, the first on ties."""
+        if len(available_moves) == 1:
+            return available_moves[0]
+
+        white_at_back = sum(
+            board.board[f"W{i}"].status is GridStatus.white for i in range(1, 5)
+        )
+        black_at_back = sum(
+            board.board[f"B{i}"].status is GridStatus.black for i in range(1, 5)
+        )
+        behind = black_at_back > white_at_back if white_turn else white_at_back > black_at_back
+        threatened = threatened_positions(board, white_turn)
+
+        best_move, best_score = None, float("-inf")
+        for move in available_moves:
+            features = self.move_features(move, behind, threatened)
+            score = sum(self.parameters[name] * value for name, value in features.items())
+            if score > best_score:
+                best_move, best_score = move, score
+        return best_move
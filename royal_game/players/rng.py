@@ -34,3 +34,9 @@ class Rng(Player):
         The dummy always return the first available move.
         """
         return available_moves[randint(0, len(available_moves) - 1)]
+
+    def move_distribution(
+        self, board: Board, available_moves: Iterable[Move], white_turn: bool
+    ) -> list[tuple[Move, float]]:
+        """Select every available move with equal probability."""
+        return [(move, 1 / len(available_moves)) for move in available_moves]
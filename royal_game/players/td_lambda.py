@@ -0,0 +1,59 @@
+"""A player that greedily maximizes a value network trained by TD(lambda) self-play."""
+
+import logging
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from royal_game.modules.board import Board
+from royal_game.modules.move import Move
+from royal_game.modules.player import Player
+from royal_game.modules.value_network import ValueNetwork
+
+logger = logging.getLogger(__name__)
+
+# train_td.py writes its weights here by default
+DEFAULT_WEIGHTS = Path("td_lambda.npz")
+
+
+@lru_cache(maxsize=None)
+def load_network(weights: Path) -> ValueNetwork:
+    """Return the network stored in weights, loading it only once per process."""
+    if weights.exists():
+        return ValueNetwork.load(weights)
+    logger.warning("%s not found, playing with an untrained network.", weights)
+    return ValueNetwork()
+
+
+class TdLambda(Player):
+    """You must implement the select_move method!"""  # noqa: D400
+
+    def __init__(self, weights: Optional[Path] = None, network: Optional[ValueNetwork] = None):
+        """
+        Load the value network.
+
+        Weights are read from the weights argument, the ROYAL_GAME_TD_WEIGHTS
+        environment variable or td_lambda.npz in the working directory, in
+        that order. A network object can be passed directly instead.
+        """
+        name = "TD(lambda) player"
+        super().__init__(name)
+
+        if network is not None:
+            self.network = network
+            return
+
+        weights = Path(weights or os.environ.get("ROYAL_GAME_TD_WEIGHTS", DEFAULT_WEIGHTS))
+        self.network = load_network(weights.resolve())
+
+    def select_move(
+        self, board: Board, available_moves: Iterable[Move], white_turn: bool
+    ) -> Move:
+        """Select the move with the highest afterstate value."""
+        if len(available_moves) == 1:
+            return available_moves[0]
+        values = self.network.afterstate_values(board, available_moves, white_turn)
+        return available_moves[int(np.argmax(values))]
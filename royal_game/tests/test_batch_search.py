@@ -0,0 +1,83 @@
+import numpy as np
+
+from royal_game.modules.batch_search import NUM_SLOTS, expectimax, is_end_batch, move_slots
+from royal_game.modules.game import dice_probabilities
+from royal_game.modules.state_space import Shard, all_shards, shard_array
+from royal_game.modules.symmetry import swap_colors
+from royal_game.modules.transitions import afterstates, is_end_seed
+from royal_game.modules.value_network import ValueNetwork
+
+
+def sample_states(num_shards: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    shards = all_shards()
+    seeds = np.concatenate(
+        [rng.choice(shard_array(shards[i]), 30) for i in rng.choice(len(shards), num_shards)]
+        + [shard_array(Shard(3, 3, 1, 3, 2, 2))[::1001], np.array([122138132480], np.uint64)]
+    )
+    return seeds[~is_end_batch(seeds)]
+
+
+def test_move_slots():
+    seeds = sample_states(60)
+    for dice_roll in range(1, 5):
+        available, children, extra_turn = move_slots(seeds, dice_roll)
+        assert available.shape == children.shape == (len(seeds), NUM_SLOTS)
+        for i, seed in enumerate(seeds.tolist()):
+            expected = sorted(
+                (move.path_position, child, extra)
+                for move, child, extra in afterstates(seed, dice_roll)
+            )
+            slots = np.flatnonzero(available[i])
+            assert expected == [
+                (slot, int(children[i, slot]), bool(extra_turn[i, slot])) for slot in slots
+            ]
+
+
+def reference_value(seed, depth, evaluate):
+    """Depth-first expectimax over afterstates."""
+    if is_end_seed(seed):
+        return float((seed >> 31) & 0b111 == 7)
+    if depth == 0:
+        return float(evaluate(np.array([seed], dtype=np.uint64))[0])
+    passed = 1 - reference_value(swap_colors(seed), depth - 1, evaluate)
+    value = dice_probabilities[0] * passed
+    for dice_roll in range(1, 5):
+        options = [
+            reference_value(child, depth - 1, evaluate)
+            if extra
+            else 1 - reference_value(child, depth - 1, evaluate)
+            for _, child, extra in afterstates(seed, dice_roll)
+        ]
+        value += dice_probabilities[dice_roll] * max(options, default=passed)
+    return value
+
+
+def test_expectimax():
+    evaluate = ValueNetwork(random_seed=1).evaluate
+    # a won end state, the initial board and a repeated root
+    roots = np.concatenate(
+        [[599282155520, 122138132480], sample_states(1)[::6], [122138132480]]
+    ).astype(np.uint64)
+    values, moves = expectimax(roots, 2, evaluate)
+    assert values[0] == 1 and (moves[0] == -1).all()
+    assert values[1] == values[-1]
+    for seed, value in zip(roots.tolist(), values.tolist()):
+        assert abs(value - reference_value(seed, 2, evaluate)) < 1e-12
+
+    # the best move of each roll leads to the best child
+    for seed, row in zip(roots[1:].tolist(), moves[1:].tolist()):
+        for dice_roll, position in enumerate(row, start=1):
+            options = afterstates(seed, dice_roll)
+            if not options:
+                assert position == -1
+                continue
+            scores = {
+                move.path_position: reference_value(child, 1, evaluate)
+                if extra
+                else 1 - reference_value(child, 1, evaluate)
+                for move, child, extra in options
+            }
+            assert abs(scores[position] - max(scores.values())) < 1e-12
+
+    assert np.allclose(expectimax(roots, 0, evaluate)[0][1:], evaluate(roots[1:]))
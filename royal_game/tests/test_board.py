@@ -1,5 +1,9 @@
+import random
+from itertools import chain
+
 import pytest
 
+from royal_game._constants import black_grid_iter, public_grid_iter, white_grid_iter
 from royal_game._exceptions import InvalidNumberofPieces
 from royal_game.modules.board import Board
 from royal_game.modules.grid_status import GridStatus
@@ -93,3 +97,36 @@ def test_move():
     assert int(board) == 104689829892
     board.make_move(Move("B14", "BE", False, False, True, False))
     assert int(board) == 242128781316
+
+
+def test_decode_matches_bit_layout():
+    rng = random.Random(0)
+    names = [name for name, _ in chain(white_grid_iter(), black_grid_iter())]
+    for seed in [rng.randrange(1 << 40) for _ in range(2000)] + [174518804524, 104689829892]:
+        try:
+            board = Board(seed, no_verify=True)
+        except ValueError:
+            # only public grids holding 0b11 are undecodable
+            assert any((seed >> offset) & 0b11 == 0b11 for offset in range(12, 28, 2))
+            continue
+        for offset, name in enumerate(names):
+            occupied = board.board[name].status is not GridStatus.empty
+            assert occupied == bool((seed >> offset) & 1)
+        for i, (name, _) in enumerate(public_grid_iter()):
+            assert board.board[name].status.value == (seed >> (12 + 2 * i)) & 0b11
+        for i, name in enumerate(["WS", "WE", "BS", "BE"]):
+            assert board.board[name].num_pieces == (seed >> (28 + 3 * i)) & 0b111
+        assert int(board) == seed & ((1 << 40) - 1)
+
+
+def test_clone():
+    board = Board(174518804524)
+    clone = board.clone()
+    assert clone == board and list(clone.board) == list(board.board)
+    for move in board.get_available_moves(True, 2):
+        child = board.clone()
+        child.make_move(move)
+        expected = Board(174518804524)
+        expected.make_move(move)
+        assert int(child) == int(expected)
+    assert int(board) == 174518804524
@@ -0,0 +1,35 @@
+from royal_game.modules.checkpoint import CompletedGames, TournamentCheckpoint
+from royal_game.modules.results import GameResult, ResultWriter, read_results
+
+
+def test_completed_games():
+    completed = CompletedGames()
+    for games in (range(10, 20), range(0, 5), range(30, 40), range(5, 10), range(25, 31)):
+        completed.add(games)
+    assert completed.ranges == [[0, 20], [25, 40]]
+    assert completed.count == 35
+    assert completed.missing(50) == [range(20, 25), range(40, 50)]
+    completed.add(range(15, 45))
+    assert completed.ranges == [[0, 45]]
+    assert CompletedGames().missing(3) == [range(0, 3)]
+
+
+def test_checkpoint_round_trip(tmp_path):
+    checkpoint = TournamentCheckpoint({"num_games": 10}, [[[0, 4]], []], 10, 200)
+    checkpoint.save(tmp_path / "checkpoint")
+    assert TournamentCheckpoint.load(tmp_path / "checkpoint") == checkpoint
+
+
+def test_read_results_span(tmp_path):
+    path = tmp_path / "results.csv"
+    results = [GameResult(0, i, "A", "B", f"0:0:{i}", True, 10, 1, 0.5) for i in range(4)]
+    with ResultWriter(path) as writer:
+        writer.write(results[0])
+        writer.flush()
+        start = writer.offset
+        writer.write(results[1])
+        writer.write(results[2])
+        writer.flush()
+        stop = writer.offset
+        writer.write(results[3])
+    assert list(read_results(path, start, stop)) == results[1:3]
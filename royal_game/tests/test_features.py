@@ -0,0 +1,68 @@
+import numpy as np
+
+from royal_game.modules.board import Board
+from royal_game.modules.features import (
+    FEATURE_NAMES,
+    contact_possible,
+    extract_features,
+    path_occupancy,
+)
+from royal_game.modules.grid_status import GridStatus
+from royal_game.modules.symmetry import swap_colors_batch
+
+SEEDS = [122138132480, 174518804524, 104689829892, 86973360148, 88852430985, 837518624784]
+
+
+def features_of(seed: int) -> dict[str, float]:
+    return dict(zip(FEATURE_NAMES, extract_features([seed])[0]))
+
+
+def test_path_occupancy():
+    white, black = path_occupancy(SEEDS)
+    for row, seed in enumerate(SEEDS):
+        board = Board(seed)
+        for column, (white_name, black_name) in enumerate(
+            zip(
+                ["W1", "W2", "W3", "W4"] + [str(i) for i in range(5, 13)] + ["W13", "W14"],
+                ["B1", "B2", "B3", "B4"] + [str(i) for i in range(5, 13)] + ["B13", "B14"],
+            )
+        ):
+            assert white[row, column] == (board.board[white_name].status is GridStatus.white)
+            assert black[row, column] == (board.board[black_name].status is GridStatus.black)
+
+
+def test_starting_board():
+    features = features_of(122138132480)
+    assert features["white_start"] == features["black_start"] == 7
+    assert features["white_pip_count"] == features["black_pip_count"] == 7 * 15
+    assert sum(value for name, value in features.items() if "start" not in name) == 2 * 7 * 15
+
+
+def test_threats():
+    # white on 6 and the center rosette, black on B4 and 5
+    seed = (1 << 9) + (0b01 << 14) + (0b01 << 18) + (0b10 << 12) + (5 << 28) + (5 << 34)
+    features = features_of(seed)
+    # 6 can be hit from 5 with a 1 and from B4 with a 2, the center rosette is safe
+    assert [features[f"white_threatened_{i}"] for i in range(1, 5)] == [1, 1, 0, 0]
+    assert [features[f"black_threatened_{i}"] for i in range(1, 5)] == [0, 0, 0, 0]
+    assert features["white_rosette_8"] == 1
+    assert features["black_rosette_4"] == 1
+    assert features["white_pip_count"] == 5 * 15 + 9 + 7
+
+
+def test_color_symmetry():
+    seeds = np.array(SEEDS, dtype=np.uint64)
+    half = len(FEATURE_NAMES) // 2
+    features = extract_features(seeds)
+    swapped = extract_features(swap_colors_batch(seeds))
+    assert np.array_equal(features[:, :half], swapped[:, half:])
+    assert np.array_equal(features[:, half:], swapped[:, :half])
+
+
+def test_contact_possible():
+    # white has one piece left on W13, black still has pieces to bring in
+    race = (1 << 4) + (6 << 31) + (7 << 34)
+    assert contact_possible([122138132480, race]).tolist() == [True, False]
+    assert contact_possible(swap_colors_batch(np.array([race], dtype=np.uint64))).tolist() == [
+        False
+    ]
@@ -1,5 +1,8 @@
+import random
+
 from royal_game.modules.game import Game
 from royal_game.players.dummy import Dummy
+from royal_game.players.rng import Rng
 
 
 def test_end_game():
@@ -8,3 +11,14 @@ def test_end_game():
 
     black_win = Game(Dummy(), Dummy(), 966988398624)
     assert not black_win.play()
+
+
+def test_dice_rng():
+    histories = []
+    for global_seed in (1, 2):
+        # the global random state must not affect the dice
+        random.seed(global_seed)
+        game = Game(Rng(), Rng(), record_history=True, dice_rng=random.Random("dice"))
+        game.play()
+        histories.append([dice_roll for _, _, dice_roll, _ in game.history[:3]])
+    assert histories[0] == histories[1]
@@ -0,0 +1,81 @@
+import pytest
+
+from royal_game._exceptions import StateLimitExceeded
+from royal_game.modules.board import Board
+from royal_game.modules.markov import build_chain, evaluate_exact, solve_chain
+from royal_game.modules.symmetry import swap_colors
+from royal_game.players.casper import Casper
+from royal_game.players.dummy import Dummy
+from royal_game.players.greedy import Greedy
+from royal_game.players.rng import Rng
+
+# one piece left each on W14 and B14, ascended with a roll of exactly 1
+LAST_PIECE_RACE = (1 << 5) + (1 << 11) + (6 << 31) + (6 << 37)
+
+
+def test_last_piece_race():
+    result = evaluate_exact(Dummy(), Dummy(), LAST_PIECE_RACE)
+    # each turn the side to move wins with probability 1/4
+    assert result.white_win_probability == pytest.approx(4 / 7)
+    assert result.expected_length == pytest.approx(4)
+    assert result.num_states == 2
+
+
+def test_end_states():
+    assert evaluate_exact(Dummy(), Dummy(), 599282155520).white_win_probability == 1.0
+    assert evaluate_exact(Dummy(), Dummy(), 966988398624).white_win_probability == 0.0
+
+
+def test_color_symmetry():
+    # two pieces left each, so the random players reach a small chain
+    seed = (1 << 4) + (1 << 5) + (1 << 10) + (1 << 11) + (5 << 31) + (5 << 37)
+    result = evaluate_exact(Rng(), Rng(), seed)
+    chain = build_chain(Rng(), Rng(), seed)
+    assert chain.num_states == result.num_states
+    # the side to move has the advantage in a symmetric position
+    assert 0.5 < result.white_win_probability < 1
+    assert (chain.white_win + chain.black_win).max() <= 1
+
+    # swapping colors and the side to move swaps the win probabilities, and
+    # every state of a chain from a symmetric position has its mirror in it
+    win_probability, _ = solve_chain(chain)
+    index = {state: i for i, state in enumerate(chain.states)}
+    mirrored = 0
+    for (state_seed, white_turn), i in index.items():
+        j = index.get((swap_colors(state_seed), not white_turn))
+        if j is not None:
+            assert win_probability[i] == pytest.approx(1 - win_probability[j], abs=1e-9)
+            mirrored += 1
+    assert mirrored == chain.num_states
+
+
+def test_state_limit():
+    with pytest.raises(StateLimitExceeded):
+        build_chain(Rng(), Rng(), max_states=100)
+
+
+def test_move_distributions():
+    board = Board(86973360148)
+    for player in (Dummy(), Rng(), Greedy(), Casper()):
+        available_moves = board.get_available_moves(True, 2)
+        distribution = player.move_distribution(board, available_moves, True)
+        assert sum(prob for _, prob in distribution) == pytest.approx(1)
+        assert player.select_move(board, available_moves, True) in [
+            move for move, _ in distribution
+        ]
+
+
+def test_non_convergence_warning(caplog):
+    chain = build_chain(Dummy(), Dummy(), LAST_PIECE_RACE)
+    with caplog.at_level("WARNING"):
+        solve_chain(chain, max_iterations=3)
+    assert "did not converge" in caplog.text
+
+
+def test_tolerance_bounds_error():
+    # every step only shrinks the distance to the solution by a factor 3/4
+    chain = build_chain(Dummy(), Dummy(), LAST_PIECE_RACE)
+    for tolerance in (1e-4, 1e-6, 1e-9):
+        win_probability, expected_length = solve_chain(chain, tolerance)
+        assert abs(win_probability[0] - 4 / 7) <= tolerance
+        assert abs(expected_length[0] - 4) <= 4 * tolerance
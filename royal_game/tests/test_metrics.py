@@ -0,0 +1,44 @@
+from urllib.request import urlopen
+
+from royal_game.modules.game import Game
+from royal_game.modules.metrics import Histogram, MetricsServer, TournamentMetrics
+from royal_game.modules.results import GameResult
+from royal_game.players.dummy import Dummy
+
+
+def test_histogram():
+    histogram = Histogram((0.1, 1.0))
+    histogram.observe([0.05, 0.1, 0.5, 2.0])
+    other = Histogram((0.1, 1.0))
+    other.observe([3.0])
+    histogram.merge(other)
+    assert histogram.counts == [2, 1, 2]
+    assert histogram.render("latency", 'player="A"') == [
+        'latency_bucket{player="A",le="0.1"} 2',
+        'latency_bucket{player="A",le="1.0"} 3',
+        'latency_bucket{player="A",le="+Inf"} 5',
+        'latency_sum{player="A"} 5.65',
+        'latency_count{player="A"} 5',
+    ]
+
+
+def test_decision_times():
+    game = Game(Dummy(), Dummy(), record_decision_times=True)
+    game.play()
+    assert len(game.decision_times[0]) + len(game.decision_times[1]) == game.plies
+
+
+def test_metrics_server():
+    metrics = TournamentMetrics(['A vs "B"', "A vs C"], 10, num_workers=2)
+    histogram = Histogram()
+    histogram.observe([1e-4])
+    metrics.record([GameResult(1, 0, "A", "C", "0:1:0", True, 50, 3, 0.1)], {"A": histogram})
+
+    with MetricsServer(metrics, 0) as server:
+        text = urlopen(f"http://127.0.0.1:{server.port}/metrics").read().decode()
+    lines = text.splitlines()
+    assert 'royal_game_games_completed_total{pairing="A vs \\"B\\""} 0' in lines
+    assert 'royal_game_games_completed_total{pairing="A vs C"} 1' in lines
+    assert "royal_game_games_remaining 9" in lines
+    assert "royal_game_eta_seconds NaN" in lines
+    assert 'royal_game_decision_seconds_count{player="A"} 1' in lines
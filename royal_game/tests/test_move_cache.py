@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from royal_game.modules.board import Board
+from royal_game.modules.game import Game
+from royal_game.modules.move_cache import MoveCache
+from royal_game.players.dummy import Dummy
+
+
+def test_cache_hits_and_eviction():
+    cache = MoveCache(maxsize=2)
+    board = Board(86973360148)
+
+    moves = cache.get_available_moves(board, True, 2)
+    assert moves == board.get_available_moves(True, 2)
+    assert cache.get_available_moves(board, True, 2) is moves
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 0)
+
+    cache.get_available_moves(board, False, 4)
+    # refreshes (board, True, 2) so (board, False, 4) is evicted next
+    cache.get_available_moves(board, True, 2)
+    cache.get_available_moves(Board(), True, 1)
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    cache.get_available_moves(board, True, 2)
+    assert cache.hits == 3
+    assert cache.hit_rate == pytest.approx(0.5)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == cache.misses == cache.evictions == 0
+
+
+def test_reject_invalid_size():
+    with pytest.raises(ValueError):
+        MoveCache(0)
+
+
+def test_cached_game():
+    cache = MoveCache()
+    assert Game(Dummy(), Dummy(), 599282155520, move_cache=cache).play()
+    assert cache.misses == cache.hits == 0
+
+    random.seed(0)
+    expected = Game(Dummy(), Dummy()).play()
+    for _ in range(2):
+        random.seed(0)
+        assert Game(Dummy(), Dummy(), move_cache=cache).play() == expected
+    # the second game replays every position of the first
+    assert cache.hits >= cache.misses
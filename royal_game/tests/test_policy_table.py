@@ -0,0 +1,75 @@
+import random
+
+from royal_game.modules.board import Board
+from royal_game.modules.game import Game
+from royal_game.modules.policy_table import (
+    PolicyTable,
+    compile_policy,
+    dice_roll_of,
+    preferred_move,
+)
+from royal_game.modules.transitions import is_end_seed, reachable_states
+from royal_game.players.casper import Casper
+from royal_game.players.compiled import DEFAULT_SOURCE, Compiled
+from royal_game.players.rng import Rng
+
+# two pieces per color left to enter
+ROOT = (2 << 28) | (5 << 31) | (2 << 34) | (5 << 37)
+STATES = reachable_states([ROOT])
+
+
+def test_dice_roll_of():
+    for seed in STATES[::7].tolist():
+        if is_end_seed(seed):
+            continue
+        board = Board(seed)
+        for white_turn in (True, False):
+            for dice_roll in range(1, 5):
+                available_moves = board.get_available_moves(white_turn, dice_roll)
+                if len(available_moves) > 1:
+                    assert dice_roll_of(available_moves) == dice_roll
+
+
+def test_compiled_player(tmp_path):
+    table = compile_policy("casper", STATES[:2000], processes=1)
+    table.save(tmp_path / "casper.npz")
+    table = PolicyTable.load(tmp_path / "casper.npz")
+    assert table.player == "casper"
+    assert list(table.keys) == sorted(table.keys)
+
+    player, casper = Compiled(tmp_path / "casper.npz"), Casper()
+    random.seed(0)
+    for _ in range(20):
+        game = Game(player, Rng(), board_seed=ROOT, record_history=True)
+        game.play()
+        for seed, white_turn, dice_roll, move in game.history:
+            if white_turn:
+                board = Board(seed)
+                available_moves = board.get_available_moves(white_turn, dice_roll)
+                assert move == preferred_move(casper, board, available_moves, white_turn)
+    # states beyond the compiled ones are delegated to Casper
+    assert player.misses > 0
+    assert player.name == "Compiled casper"
+
+
+def test_missing_table(tmp_path, caplog):
+    with caplog.at_level("WARNING"):
+        players = [Compiled(tmp_path / "missing.npz") for _ in range(3)]
+        Game(players[0], Rng(), board_seed=ROOT).play()
+    assert caplog.text.count("not found") == 1
+    assert "Decision missing" not in caplog.text
+    assert players[0].name == f"Compiled {DEFAULT_SOURCE}"
+    assert players[0].misses > 0
+
+
+def test_symmetric():
+    table = compile_policy("greedy", STATES[:500], processes=1)
+    symmetric = compile_policy("greedy", STATES[:500], symmetric=True, processes=1)
+    assert len(symmetric) < len(table)
+    for seed in STATES[:500:5].tolist():
+        if is_end_seed(seed):
+            continue
+        for dice_roll in range(1, 5):
+            assert symmetric.lookup(seed, True, dice_roll) == table.lookup(
+                seed, True, dice_roll
+            )
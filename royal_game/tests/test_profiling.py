@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from royal_game.modules.game import Game
+from royal_game.modules.profiling import Profile, Sampler, is_supported
+from royal_game.players.greedy import Greedy
+from royal_game.players.rng import Rng
+
+pytestmark = pytest.mark.skipif(not is_supported(), reason="needs signal.setitimer")
+
+
+def play_games() -> Profile:
+    random.seed(0)
+    with Sampler(interval=0.0005, trace_memory=True).record() as profile:
+        while profile.num_samples < 100:
+            Game(Greedy(), Rng()).play()
+    return profile
+
+
+def test_sampler(tmp_path):
+    profile = play_games()
+    assert profile.cpu_seconds > 0 and profile.peak_memory > 0
+    assert {"engine", "game loop", "select_move: Greedy player"} <= set(profile.subsystems)
+    assert sum(profile.stacks.values()) == profile.num_samples
+    # stacks start at the function that started the sampler
+    assert all(stack.startswith(f"{__name__}:play_games") for stack in profile.stacks)
+    assert profile.total_samples()[f"{__name__}:play_games"] == profile.num_samples
+    assert sum(profile.self_samples().values()) == profile.num_samples
+
+    path = tmp_path / "profile.folded"
+    profile.write_collapsed(path)
+    lines = path.read_text().splitlines()
+    assert len(lines) == len(profile.stacks)
+    assert sum(int(line.rpartition(" ")[2]) for line in lines) == profile.num_samples
+
+
+def test_merge():
+    profile, other = play_games(), play_games()
+    merged = Profile()
+    merged.merge(profile)
+    merged.merge(other)
+    assert merged.num_samples == profile.num_samples + other.num_samples
+    assert merged.cpu_seconds == pytest.approx(profile.cpu_seconds + other.cpu_seconds)
+    assert merged.peak_memory == max(profile.peak_memory, other.peak_memory)
+    assert merged.seconds(merged.num_samples) == pytest.approx(merged.cpu_seconds)
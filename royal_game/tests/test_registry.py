@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import royal_game
+from royal_game._exceptions import PlayerNotFound
+from royal_game.modules.registry import discover_players, load_player
+from royal_game.players.greedy import Greedy
+from royal_game.players.rng import Rng
+
+
+def test_discover_players():
+    players = discover_players()
+    assert players["td_lambda"].module == "royal_game.players.td_lambda"
+    assert players["td_lambda"].class_name == "TdLambda"
+
+
+def test_load_player():
+    assert load_player("greedy") is Greedy
+    assert load_player("royal_game/players/greedy.py") is Greedy
+    assert load_player("royal_game.players.rng:Rng") is Rng
+    with pytest.raises(PlayerNotFound):
+        load_player("no_such_player")
+    # a file of the same name elsewhere is not the built-in player
+    with pytest.raises(PlayerNotFound):
+        load_player("/some/dir/greedy.py")
+    with pytest.raises(PlayerNotFound):
+        load_player("royal_game.players.rng:NoSuchPlayer")
+
+
+def test_import_has_no_side_effects(tmp_path):
+    # discovery must not import player modules, and importing the game must not log to disk
+    code = (
+        "import sys\n"
+        "import royal_game.modules.game\n"
+        "from royal_game.modules.registry import discover_players\n"
+        "discover_players()\n"
+        "assert not any(name.startswith('royal_game.players.') for name in sys.modules)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(Path(royal_game.__file__).parents[1])}
+    subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, check=True)
+    assert not (tmp_path / "games.log").exists()
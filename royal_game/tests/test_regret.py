@@ -0,0 +1,149 @@
+import numpy as np
+import pytest
+
+from royal_game.modules.markov import evaluate_exact
+from royal_game.modules.player import Player
+from royal_game.modules.policy_table import dice_roll_of
+from royal_game.modules.regret import (
+    PHASES,
+    RegretStats,
+    ValueTable,
+    analyze_games,
+    analyze_samples,
+    game_phase,
+    score_decisions,
+    solve_values,
+)
+from royal_game.modules.selfplay import generate, read_shards
+from royal_game.modules.symmetry import canonicalize
+from royal_game.modules.transitions import (
+    afterstates,
+    build_transitions,
+    load_transitions,
+    reachable_states,
+)
+from royal_game.players.greedy import Greedy
+from royal_game.players.rng import Rng
+
+# two white pieces and one black piece left at the start
+RACE = (2 << 28) + (5 << 31) + (1 << 34) + (6 << 37)
+
+
+@pytest.fixture(scope="module")
+def values_path(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("regret")
+    build_transitions(reachable_states([RACE]), directory / "graph", processes=1)
+    path = directory / "values.npz"
+    solve_values(load_transitions(directory / "graph"), tolerance=1e-14).save(path)
+    return path
+
+
+class Optimal(Player):
+    """Selects the move with the best afterstate value."""
+
+    def __init__(self, table: ValueTable):
+        super().__init__("Optimal")
+        self.table = table
+
+    def select_move(self, board, available_moves, white_turn):
+        if len(available_moves) == 1:
+            return available_moves[0]
+        seed, _ = canonicalize(int(board), white_turn)
+        options = afterstates(seed, dice_roll_of(available_moves))
+        values = self.table.values([child for _, child, _ in options])
+        mover = [v if extra else 1 - v for v, (_, _, extra) in zip(values, options)]
+        position = options[int(np.argmax(mover))][0].path_position
+        return next(move for move in available_moves if move.path_position == position)
+
+
+def test_solve_values(values_path):
+    table = ValueTable.load(values_path)
+    # a winning move hands the opponent a lost end state
+    assert table.values([(1 << 28) + (6 << 31) + (7 << 37)]).tolist() == [0.0]
+    assert ((table.probabilities >= 0) & (table.probabilities <= 1)).all()
+
+    # the values are the win probability of optimal play against itself
+    optimal = Optimal(table)
+    exact = evaluate_exact(optimal, optimal, RACE, tolerance=1e-14)
+    assert exact.white_win_probability == pytest.approx(table.values([RACE])[0], abs=1e-9)
+    # and no other player does better against it
+    exact = evaluate_exact(Greedy(), optimal, RACE, tolerance=1e-14)
+    assert exact.white_win_probability < table.values([RACE])[0]
+
+    with pytest.raises(KeyError):
+        table.values([122138132480])
+
+
+def test_solve_values_tolerance(values_path):
+    reference = ValueTable.load(values_path).probabilities
+    graph = load_transitions(values_path.parent / "graph")
+    for tolerance in (1e-4, 1e-6):
+        probabilities = solve_values(graph, tolerance=tolerance).probabilities
+        assert np.abs(probabilities - reference).max() <= tolerance
+
+
+def test_score_decisions(values_path):
+    table = ValueTable.load(values_path)
+    states = reachable_states([RACE])[::7]
+    rolls = np.full(len(states), 2, dtype=np.uint8)
+    best, worst = [], []
+    for seed in states.tolist():
+        options = afterstates(seed, 2) or [(None, 0, False)]
+        positions = [move.path_position if move else 0 for move, _, _ in options]
+        values = table.values([child for _, child, _ in options]) if options[0][0] else [0]
+        mover = [v if extra else 1 - v for v, (_, _, extra) in zip(values, options)]
+        best.append(positions[int(np.argmax(mover))])
+        worst.append(positions[int(np.argmin(mover))])
+
+    scored, regret, types, phases = score_decisions(table, states, rolls, np.array(best))
+    assert scored.any() and (regret < 1e-12).all()
+    assert len(types) == len(phases) == scored.sum()
+    scored_worst, regret, _, _ = score_decisions(table, states, rolls, np.array(worst))
+    assert np.array_equal(scored, scored_worst)
+    assert (regret > 0).any()
+
+
+def test_game_phase():
+    assert game_phase([122138132480]).tolist() == [PHASES.index("opening")]
+    assert game_phase([RACE]).tolist() == [PHASES.index("endgame")]
+
+
+def test_analyze(values_path, tmp_path):
+    pairings = [(0, 1), (1, 0)]
+    stats = analyze_games(
+        [Greedy, Rng], pairings, 12, 3, values_path, RACE, chunk_size=5, processes=1
+    )
+    assert stats.players == ["Greedy", "Rng"]
+    assert stats.games.tolist() == [12, 12]
+    assert stats.decisions.sum() > 0
+    assert (stats.optimal <= stats.decisions).all()
+    assert (stats.blunders <= stats.decisions).all()
+
+    parallel = analyze_games(
+        [Greedy, Rng], pairings, 12, 3, values_path, RACE, chunk_size=4, processes=2
+    )
+    assert np.array_equal(parallel.decisions, stats.decisions)
+    assert np.allclose(parallel.regret, stats.regret)
+
+    # self-play shards with the same run seed hold the same games
+    generate([(Greedy, Rng), (Rng, Greedy)], tmp_path, 12, 3, RACE, processes=1)
+    shards = [tmp_path / f"shard-{i:05d}.bin" for i in range(len(list(read_shards(tmp_path))))]
+    samples = analyze_samples(shards, values_path, chunk_size=50, processes=1)
+    assert samples.decisions.sum() == stats.decisions.sum()
+    assert samples.regret.sum() == pytest.approx(stats.regret.sum())
+
+
+def test_merge():
+    stats = RegretStats(["a"])
+    other = RegretStats(["a"])
+    other.add(np.array([0, 0]), np.array([0.0, 0.2]), np.array([1, 4]), np.array([0, 2]))
+    other.games[0] = 1
+    stats.merge(other)
+    stats.merge(other)
+    totals = stats.totals()
+    assert totals["decisions"].tolist() == [4]
+    assert totals["optimal"].tolist() == [2]
+    assert totals["blunders"].tolist() == [2]
+    assert totals["max_regret"].tolist() == [0.2]
+    assert stats.totals(1)["decisions"].tolist() == [[0, 2, 0, 0, 2]]
+    assert stats.games.tolist() == [2]
@@ -0,0 +1,55 @@
+import pytest
+
+from royal_game.modules.results import GameResult, ResultWriter, WinMatrix, read_results
+
+
+def result(game: int, white: str, black: str, white_won: bool, pairing: int = 0) -> GameResult:
+    return GameResult(
+        pairing, game, white, black, f"0:{pairing}:{game}", white_won, 100, 5, 0.01
+    )
+
+
+def test_writer_round_trip(tmp_path):
+    path = tmp_path / "results.csv"
+    results = [result(i, "A", "B", i % 3 == 0) for i in range(5)]
+    with ResultWriter(path, batch_size=2) as writer:
+        for game_result in results[:3]:
+            writer.write(game_result)
+    # appending to an existing file does not repeat the header
+    with ResultWriter(path) as writer:
+        for game_result in results[3:]:
+            writer.write(game_result)
+    assert list(read_results(path)) == results
+
+    # a truncated last row is skipped
+    with open(path, "a") as fout:
+        fout.write("0,5,A,B")
+    assert len(list(read_results(path))) == 5
+
+
+def test_win_matrix():
+    matrix = WinMatrix()
+    # A wins both twins of the first pair and splits the second
+    for game_result in [
+        result(1, "B", "A", False),
+        result(0, "A", "B", True),
+        result(2, "A", "B", True),
+        result(3, "B", "A", True),
+        result(0, "A", "A", False, pairing=1),
+    ]:
+        matrix.add(game_result)
+
+    assert list(matrix.names) == ["B", "A"]
+    assert matrix.num_wins["A"]["B"] == 3
+    assert matrix.num_wins["B"]["A"] == 1
+    # only white wins are counted in self-play
+    assert matrix.num_wins["A"]["A"] == 0
+    assert matrix.games_between("A", "B") == 4
+    assert matrix.self_play
+
+    stats = matrix.pairs[("A", "B")]
+    assert stats.num_pairs == 2
+    assert stats.total == pytest.approx(1.5)
+    low, high = matrix.intervals()["A"]["B"]
+    assert (low + high) / 2 == pytest.approx(0.75)
+    assert matrix.intervals()["B"]["A"] == pytest.approx((1 - high, 1 - low))
@@ -0,0 +1,43 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from royal_game.modules.scheduler import Scheduler, run_scheduled
+
+
+def game_indices(index: int, games: range) -> list[tuple[int, int]]:
+    return [(index, i) for i in games]
+
+
+def test_chunks_follow_cost():
+    scheduler = Scheduler([1000, 1000], num_workers=2, target_seconds=0.1)
+    # every job is probed with a single game first
+    assert scheduler.next_chunk() == (0, range(0, 1))
+    assert scheduler.next_chunk() == (1, range(0, 1))
+    assert scheduler.next_chunk() is None
+    scheduler.record(0, 1, 0.001)
+    scheduler.record(1, 1, 0.01)
+
+    # the expensive job goes first, in chunks of about target_seconds
+    assert scheduler.next_chunk() == (1, range(1, 11))
+    scheduler.jobs[1].next_game = 1000
+    assert scheduler.next_chunk() == (0, range(1, 101))
+
+
+def test_chunks_shrink_at_the_end():
+    scheduler = Scheduler([40], num_workers=4, target_seconds=1.0)
+    index, games = scheduler.next_chunk()
+    scheduler.record(index, len(games), 0.01)
+    # 39 games of 0.01 sec left, split so every worker gets at least two chunks
+    assert len(scheduler.next_chunk()[1]) == 5
+
+
+def test_run_scheduled():
+    for executor in (None, ProcessPoolExecutor(max_workers=2)):
+        scheduler = Scheduler([50, 7, 0], num_workers=2)
+        played = []
+        run_scheduled(
+            game_indices, scheduler, lambda _, __, result: played.extend(result), executor
+        )
+        if executor is not None:
+            executor.shutdown()
+        assert sorted(played) == [(0, i) for i in range(50)] + [(1, i) for i in range(7)]
+        assert scheduler.done
@@ -0,0 +1,87 @@
+import numpy as np
+
+from royal_game.modules import seed_files
+from royal_game.modules.seed_files import (
+    SeedReader,
+    SeedWriter,
+    aligned_blocks,
+    difference,
+    intersection,
+    merge,
+    sample,
+    sort_runs,
+    sorted_stream,
+    split_file,
+    union,
+)
+from royal_game.modules.state_space import Shard, shard_array
+
+SEEDS = shard_array(Shard(2, 1, 3, 2, 0, 6))
+
+
+def test_reader(tmp_path):
+    path = tmp_path / "seeds.txt"
+    path.write_text("\n".join(map(str, SEEDS.tolist())) + "\nfoo\n-3\n12\n" + str(SEEDS[0]))
+    # spans and small blocks must not split or drop any line
+    blocks = [
+        block
+        for start, stop in split_file(path, 100)
+        for block in SeedReader(path, block_size=7, start=start, stop=stop)
+    ]
+    assert np.concatenate(blocks).tolist() == [*SEEDS.tolist(), SEEDS[0]]
+
+    reader = SeedReader(path)
+    assert sum(len(block) for block in reader) == len(SEEDS) + 1
+    assert reader.invalid == 3
+    assert sum(len(block) for block in SeedReader(path, verify=False)) == len(SEEDS) + 2
+
+
+def test_writer(tmp_path):
+    for name in ("seeds.txt", "seeds.bin"):
+        with SeedWriter(tmp_path / name) as writer:
+            writer.write(SEEDS[:10])
+            writer.write(SEEDS[10:])
+        assert writer.count == len(SEEDS)
+        assert np.concatenate(list(SeedReader(tmp_path / name))).tolist() == SEEDS.tolist()
+
+
+def test_sort(tmp_path, monkeypatch):
+    rng = np.random.default_rng(0)
+    path = tmp_path / "seeds.bin"
+    with SeedWriter(path) as writer:
+        writer.write(rng.choice(SEEDS, 5000))
+    # force a merge in several passes
+    monkeypatch.setattr(seed_files, "MAX_FAN_IN", 4)
+    runs, invalid = sort_runs([path], tmp_path, run_size=100)
+    assert len(runs) == 50 and invalid == 0
+    expected = np.sort(np.fromfile(path, dtype=np.uint64))
+    merged = np.concatenate(list(merge(runs, tmp_path, block_size=64)))
+    assert merged.tolist() == expected.tolist()
+
+    stream, _ = sorted_stream(path, tmp_path, run_size=300)
+    assert np.concatenate(list(stream)).tolist() == np.unique(expected).tolist()
+
+
+def test_set_operations():
+    def streams():
+        # blocks of different sizes so steps end in different places
+        a, b, c = SEEDS[::2], SEEDS[::3], SEEDS[::5]
+        return [iter(np.array_split(s, n)) for s, n in ((a, 7), (b, 3), (c, 11))]
+
+    a, b, c = (set(SEEDS[::k].tolist()) for k in (2, 3, 5))
+    for operation, expected in (
+        (union, a | b | c),
+        (intersection, a & b & c),
+        (difference, a - b - c),
+    ):
+        result = np.concatenate(list(operation(aligned_blocks(streams())))).tolist()
+        assert result == sorted(expected)
+
+
+def test_sample():
+    blocks = np.array_split(SEEDS, 13)
+    seeds = sample(blocks, 50, np.random.default_rng(1))
+    assert len(seeds) == len(set(seeds.tolist())) == 50
+    assert np.isin(seeds, SEEDS).all()
+    assert seeds.tolist() == sorted(seeds.tolist())
+    assert sample(blocks, len(SEEDS) + 1, np.random.default_rng(1)).tolist() == SEEDS.tolist()
@@ -0,0 +1,41 @@
+import json
+
+import numpy as np
+
+from royal_game.modules.board import Board
+from royal_game.modules.selfplay import SAMPLE_DTYPE, generate, play_recorded_game, read_shards
+from royal_game.modules.symmetry import canonicalize
+from royal_game.players.greedy import Greedy
+from royal_game.players.rng import Rng
+
+
+def test_recorded_game():
+    samples = play_recorded_game(Greedy, Rng, 122138132480, "seed")
+    assert samples.dtype == SAMPLE_DTYPE
+    assert len(samples) > 0
+    assert samples[0]["state"] == canonicalize(122138132480, True)[0]
+    assert set(np.unique(samples["outcome"])) <= {-1, 1}
+    for sample in samples[:20]:
+        # the recorded move must be available on the canonical board
+        moves = Board(int(sample["state"])).get_available_moves(True, int(sample["roll"]))
+        assert int(sample["move"]) in [move.path_position for move in moves]
+
+    assert np.array_equal(samples, play_recorded_game(Greedy, Rng, 122138132480, "seed"))
+
+
+def test_reproducible_shards(tmp_path):
+    pairings = [(Greedy, Rng), (Rng, Greedy)]
+    generate(pairings, tmp_path / "a", 12, 7, shard_size=100, chunk_size=5, processes=1)
+    generate(pairings, tmp_path / "b", 12, 7, shard_size=100, chunk_size=3, processes=3)
+
+    with open(tmp_path / "a" / "manifest.json") as fin:
+        manifest = json.load(fin)
+    assert all(shard["num_samples"] == 100 for shard in manifest["shards"][:-1])
+    a = np.concatenate(list(read_shards(tmp_path / "a")))
+    b = np.concatenate(list(read_shards(tmp_path / "b")))
+    assert len(a) == manifest["num_samples"]
+    assert np.array_equal(a, b)
+    for shard in manifest["shards"]:
+        assert (tmp_path / "a" / shard["file"]).read_bytes() == (
+            tmp_path / "b" / shard["file"]
+        ).read_bytes()
@@ -0,0 +1,64 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+from royal_game.modules.policy_table import PolicyTable
+from royal_game.modules.shared_table import (
+    SharedTable,
+    get_shared,
+    install_handles,
+    publish,
+    published_handles,
+    share_player_tables,
+)
+from royal_game.players.compiled import Compiled
+
+
+def table_sum(key: str) -> int:
+    return int(get_shared(key)["values"].sum())
+
+
+def test_shared_table():
+    values = np.arange(1000, dtype=np.int64)
+    with SharedTable.create({"flags": np.ones(3, bool), "values": values}, {"a": 1}) as table:
+        assert table["values"].tolist() == values.tolist()
+        assert table.metadata == {"a": 1}
+        with pytest.raises(ValueError):
+            table["values"][0] = 1
+        # attaching in the creating process returns the same table
+        assert table.handle.attach() is table
+        name = table.handle.name
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name)
+
+
+def test_spawned_workers():
+    values = np.arange(1000, dtype=np.int64)
+    with SharedTable.create({"values": values}) as table:
+        publish("test:values", table)
+        # spawned workers do not inherit published tables and need the handles
+        with ProcessPoolExecutor(
+            max_workers=2,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=install_handles,
+            initargs=(published_handles(),),
+        ) as executor:
+            assert list(executor.map(table_sum, ["test:values"] * 2)) == [values.sum()] * 2
+
+
+def test_policy_table():
+    policy = PolicyTable(np.array([3, 8], np.uint64), np.array([1, 2], np.uint8), "greedy")
+    with policy.share() as table:
+        shared = PolicyTable.from_shared(table)
+        assert shared.player == "greedy" and not shared.symmetric
+        assert shared.lookup(1, True, 1) == 2
+        assert shared.lookup(1, True, 2) is None
+        del shared
+
+
+def test_missing_compiled_table(tmp_path, monkeypatch):
+    monkeypatch.setenv("ROYAL_GAME_COMPILED", str(tmp_path / "missing.npz"))
+    assert share_player_tables([Compiled]) == []
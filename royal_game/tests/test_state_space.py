@@ -0,0 +1,70 @@
+import numpy as np
+
+from royal_game.modules.board import Board
+from royal_game.modules.state_space import (
+    SeedError,
+    Shard,
+    all_shards,
+    iter_shard,
+    iter_states,
+    legal_mask,
+    num_states,
+    shard_array,
+    shard_of,
+    shard_size,
+    validate_batch,
+)
+
+
+def test_shard_sizes():
+    shards = all_shards()
+    assert len(shards) == 36 * 36
+    assert shards == sorted(shards)
+    assert num_states() == 137913936
+    # all pieces off the board
+    assert shard_size(Shard(0, 0, 7, 0, 7, 0)) == 1
+    # one white piece in one of 14 grids
+    assert shard_size(Shard(1, 0, 6, 0, 7, 0)) == 14
+
+
+def test_iter_shard():
+    for shard in (Shard(2, 1, 3, 2, 0, 6), Shard(3, 3, 1, 3, 2, 2)):
+        seeds = list(iter_shard(shard))
+        assert len(seeds) == shard_size(shard)
+        assert seeds == sorted(set(seeds))
+        assert seeds == shard_array(shard).tolist()
+        for seed in seeds[::97]:
+            assert shard_of(seed) == shard
+            assert int(Board(seed)) == seed
+
+
+def test_iter_states():
+    shards = [Shard(0, 0, 7, 0, 7, 0), Shard(1, 0, 6, 0, 7, 0)]
+    seeds = list(iter_states(shards))
+    assert seeds[0] == 122138132480
+    assert len(seeds) == 15
+    assert shard_of(122138132480) == Shard(0, 0, 7, 0, 7, 0)
+
+
+def test_legal_mask():
+    legal = shard_array(Shard(3, 3, 1, 3, 2, 2))[::101]
+    # an extra white piece, a public grid holding 0b11 and a bit above the seed
+    illegal = np.array(
+        [legal[0] ^ 1, legal[0] | (0b11 << 12), legal[0] | (1 << 40)], dtype=np.uint64
+    )
+    assert legal_mask(legal).all()
+    assert not legal_mask(illegal).any()
+    assert legal_mask([122138132480]).tolist() == [True]
+
+
+def test_validate_batch():
+    seed = int(shard_array(Shard(3, 3, 1, 3, 2, 2))[0])
+    seeds = [seed, seed ^ 1, seed ^ (1 << 6), seed | (0b11 << 12), (seed ^ 1) | (1 << 40)]
+    assert validate_batch(seeds).tolist() == [
+        SeedError.valid,
+        SeedError.white_pieces,
+        SeedError.black_pieces,
+        SeedError.invalid_grid,
+        SeedError.out_of_range,
+    ]
+    assert validate_batch(np.empty(0, dtype=np.uint64)).shape == (0,)
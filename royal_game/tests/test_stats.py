@@ -0,0 +1,33 @@
+from math import sqrt
+
+import pytest
+
+from royal_game.modules.stats import mean_interval, wilson_interval, z_score
+
+
+def test_z_score():
+    assert z_score(0.95) == pytest.approx(1.959964, abs=1e-6)
+    with pytest.raises(ValueError):
+        z_score(1.0)
+
+
+def test_wilson_interval():
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+    low, high = wilson_interval(50, 100)
+    assert low == pytest.approx(0.4038, abs=1e-4)
+    assert high == pytest.approx(0.5962, abs=1e-4)
+
+    # stays inside [0, 1] at the extremes
+    low, high = wilson_interval(100, 100)
+    assert 0.96 < low < 1.0
+    assert high == pytest.approx(1.0)
+    low, high = wilson_interval(0, 100)
+    assert low == pytest.approx(0.0)
+
+
+def test_mean_interval():
+    assert mean_interval([1.0]) == (0.0, 1.0)
+    low, high = mean_interval([0.0, 0.5, 0.5, 1.0])
+    assert (low + high) / 2 == pytest.approx(0.5)
+    assert high - low == pytest.approx(2 * 1.96 * sqrt(1 / 6) / 2)
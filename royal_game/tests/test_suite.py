@@ -0,0 +1,61 @@
+import pytest
+
+from royal_game.modules.suite import Suite, load_suite
+
+SUITE = """\
+# openings are weighted up
+122138132480 opening 2
+
+732828794880
+837518624784 race 0.5
+104689829892 0.5
+"""
+
+
+def test_load_suite(tmp_path):
+    path = tmp_path / "suite.txt"
+    path.write_text(SUITE)
+    suite = load_suite(path)
+    assert suite.seeds == [122138132480, 732828794880, 837518624784, 104689829892]
+    assert suite.strata == ["opening", "middlegame", "race", "opening"]
+    assert suite.weights == [2.0, 1.0, 0.5, 0.5]
+    assert suite.stratum_names == ["opening", "middlegame", "race"]
+    assert Suite.from_rows(suite.to_rows()) == suite
+
+
+@pytest.mark.parametrize(
+    "line, message",
+    [
+        ("12x", "invalid literal"),
+        ("122138132480 opening 1 2", "expected a seed"),
+        ("-1", "out of range"),
+        ("3", "invalid seed"),
+        # all white pieces at the end
+        (str((7 << 31) + (7 << 34)), "already over"),
+    ],
+)
+def test_load_suite_errors(tmp_path, line, message):
+    path = tmp_path / "suite.txt"
+    path.write_text(f"122138132480\n{line}\n")
+    with pytest.raises(ValueError, match=message):
+        load_suite(path)
+
+
+def test_position():
+    suite = Suite([1, 2, 3], ["a", "b", "a"], [2.0, 1.0, 1.0])
+    games = range(4000)
+    positions = [suite.position(7, game) for game in games]
+    # twins start from the same position
+    assert positions[::2] == positions[1::2]
+    # every stretch of games visits positions in proportion to their weights
+    for start in (0, 1000, 3000):
+        counts = [positions[start : start + 1000].count(i) for i in range(3)]
+        assert counts == pytest.approx([500, 250, 250], abs=6)
+    assert positions != [suite.position(8, game) for game in games]
+    assert suite.stratum_names == ["a", "b"]
+    assert [suite.stratum(7, game) for game in games[:8]] == [
+        "ab"[i == 1] for i in positions[:8]
+    ]
+
+    with pytest.raises(ValueError):
+        Suite([1], ["a"], [0.0])
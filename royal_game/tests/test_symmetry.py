@@ -0,0 +1,55 @@
+import numpy as np
+
+from royal_game.modules.board import Board
+from royal_game.modules.move import Move
+from royal_game.modules.symmetry import (
+    canonicalize,
+    canonicalize_batch,
+    mirror_move,
+    swap_colors,
+    swap_colors_batch,
+)
+
+SEEDS = [122138132480, 174518804524, 104689829892, 86973360148, 88852430985, 837518624784]
+
+
+def test_swap_colors():
+    assert swap_colors(122138132480) == 122138132480
+    for seed in SEEDS:
+        swapped = swap_colors(seed)
+        assert swap_colors(swapped) == seed
+        # the swapped seed must still be a valid board
+        board, mirrored = Board(seed), Board(swapped)
+        assert board.board["WS"].num_pieces == mirrored.board["BS"].num_pieces
+        assert board.board["BE"].num_pieces == mirrored.board["WE"].num_pieces
+
+
+def test_mirror_moves():
+    assert mirror_move(Move("WS", "W4", is_rosette=True, is_onboard=True)) == Move(
+        "BS", "B4", is_rosette=True, is_onboard=True
+    )
+    assert mirror_move(Move("B2", "6", is_capture=True)) == Move("W2", "6", is_capture=True)
+
+    for seed in SEEDS:
+        for dice_roll in range(1, 5):
+            canonical, swapped = canonicalize(seed, False)
+            assert swapped
+            moves = Board(seed).get_available_moves(False, dice_roll)
+            canonical_moves = Board(canonical).get_available_moves(True, dice_roll)
+            assert set(moves) == set(mirror_move(move) for move in canonical_moves)
+
+
+def test_canonicalize_batch():
+    seeds = np.array(SEEDS, dtype=np.uint64)
+    assert swap_colors_batch(seeds).tolist() == [swap_colors(seed) for seed in SEEDS]
+
+    white_turn = np.array([True, False] * 3)
+    canonical, swapped = canonicalize_batch(seeds, white_turn)
+    assert swapped.tolist() == (~white_turn).tolist()
+    assert canonical.tolist() == [
+        canonicalize(seed, turn)[0] for seed, turn in zip(SEEDS, white_turn)
+    ]
+
+    canonical, swapped = canonicalize_batch(seeds, True)
+    assert canonical.tolist() == SEEDS
+    assert not swapped.any()
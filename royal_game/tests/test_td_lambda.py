@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from royal_game.modules.board import Board
+from royal_game.modules.game import Game
+from royal_game.modules.td_training import (
+    lambda_returns,
+    play_trajectory,
+    td_update,
+    train,
+)
+from royal_game.modules.value_network import ValueNetwork
+from royal_game.players.dummy import Dummy
+from royal_game.players.td_lambda import TdLambda
+
+SEEDS = np.array([122138132480, 174518804524, 104689829892, 86973360148], dtype=np.uint64)
+
+
+def test_lambda_returns():
+    values = np.array([0.5, 0.6, 0.3])
+    # white moves twice (rosette), then black moves and loses
+    white_turns = np.array([True, True, False])
+    targets = lambda_returns(values, white_turns, True, lam=0.5)
+    assert targets[2] == 0
+    assert targets[1] == pytest.approx(1 - (0.5 * 0.3 + 0.5 * 0))
+    assert targets[0] == pytest.approx(0.5 * 0.6 + 0.5 * targets[1])
+    # lambda = 1 recovers the final outcome for every mover
+    assert lambda_returns(values, white_turns, True, lam=1).tolist() == [1, 1, 0]
+
+
+def test_backward_matches_finite_differences():
+    network = ValueNetwork(num_hidden=5, random_seed=1)
+    inputs = network.inputs(SEEDS)
+    errors = np.array([0.3, -0.2, 0.1, 0.5])
+    hidden, output = network.forward(inputs)
+    gradients = network.backward(inputs, hidden, output, errors)
+
+    for name, param in network.params.items():
+        index = (0,) * param.ndim
+        original = param[index]
+        param[index] = original + 1e-6
+        plus = errors @ network.forward(inputs)[1]
+        param[index] = original - 1e-6
+        minus = errors @ network.forward(inputs)[1]
+        param[index] = original
+        assert gradients[name][index] == pytest.approx((plus - minus) / 2e-6, rel=1e-4)
+
+
+def test_afterstate_values():
+    network = ValueNetwork()
+    # white ascending its last piece wins outright
+    board = Board(599282155520 - (1 << 31) + (1 << 5))
+    moves = board.get_available_moves(True, 1)
+    assert network.afterstate_values(board, moves, True).tolist() == [1.0]
+
+
+def test_training_round(tmp_path):
+    network = ValueNetwork(num_hidden=8)
+    trajectory = play_trajectory(network, 122138132480)
+    assert trajectory.states[0] == 122138132480
+    before = {name: param.copy() for name, param in network.params.items()}
+    td_update(network, [trajectory], lam=0.7, alpha=0.1)
+    assert any(not np.array_equal(before[name], network.params[name]) for name in before)
+
+    saved = []
+    train(network, 1, 2, eval_every=1, eval_games=2, processes=1, checkpoint=saved.append)
+    assert saved == [network]
+
+    network.save(tmp_path / "weights.npz")
+    player = TdLambda(tmp_path / "weights.npz")
+    assert Game(player, Dummy()).play() in (True, False)
+
+
+def test_weights_loaded_once(tmp_path, caplog):
+    missing = tmp_path / "missing.npz"
+    with caplog.at_level("WARNING"):
+        players = [TdLambda(missing) for _ in range(3)]
+    assert caplog.text.count("not found") == 1
+    assert all(player.network is players[0].network for player in players)
@@ -0,0 +1,47 @@
+import numpy as np
+
+from royal_game.modules.board import Board
+from royal_game.modules.symmetry import swap_colors
+from royal_game.modules.transitions import (
+    build_transitions,
+    load_transitions,
+    reachable_states,
+    successors,
+)
+
+# two pieces left each on W13/W14 and B13/B14
+ENDGAME = (1 << 4) + (1 << 5) + (1 << 10) + (1 << 11) + (5 << 31) + (5 << 37)
+
+
+def test_successors():
+    # rolls of 1 and 2 ascend W14 and W13 respectively
+    assert successors(ENDGAME, 1) == [(swap_colors(ENDGAME - (1 << 5) + (1 << 31)), False)]
+    assert successors(ENDGAME, 2) == [(swap_colors(ENDGAME - (1 << 4) + (1 << 31)), False)]
+    # no moves available, so the turn passes
+    assert successors(ENDGAME, 3) == [(swap_colors(ENDGAME), False)]
+    # end states have no successors
+    assert successors(599282155520, 1) == []
+
+    # a roll of 4 from the start claims the W4 rosette and keeps the turn
+    [(child, extra_turn)] = successors(122138132480, 4)
+    assert extra_turn
+    assert Board(child).board["WS"].num_pieces == 6
+    assert child == 122138132480 - (1 << 28) + (1 << 3)
+
+
+def test_build_transitions(tmp_path):
+    states = reachable_states([ENDGAME])
+    assert ENDGAME in states
+    build_transitions(states, tmp_path, processes=2, block_size=3)
+    graph = load_transitions(tmp_path)
+
+    assert graph.num_states == len(states)
+    assert isinstance(graph.states, np.memmap)
+    for index, seed in enumerate(states.tolist()):
+        for dice_roll in range(1, 5):
+            indices, extra_turn = graph.successors(index, dice_roll)
+            expected = successors(seed, dice_roll)
+            assert graph.states[indices].tolist() == [child for child, _ in expected]
+            assert extra_turn.tolist() == [extra for _, extra in expected]
+
+    assert graph.index_of([ENDGAME]).tolist() == [states.tolist().index(ENDGAME)]
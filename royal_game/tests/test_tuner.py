@@ -0,0 +1,75 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+from royal_game._exceptions import OpponentMismatch
+from royal_game.modules.board import Board
+from royal_game.modules.game import Game
+from royal_game.modules.tuner import (
+    TunerState,
+    candidate_fitness,
+    next_population,
+    tune,
+)
+from royal_game.players.casper import Casper
+from royal_game.players.dummy import Dummy
+from royal_game.players.parametric import DEFAULT_PARAMETERS, Parametric
+from royal_game.players.rng import Rng
+
+
+def test_default_parameters_follow_casper():
+    # both moves claim a rosette, but the center rosette is preferred
+    board = Board(122138132480 - (2 << 28) + (1 << 1) + (1 << 14))
+    moves = board.get_available_moves(True, 2)
+    assert len(moves) == 2
+    assert Parametric(DEFAULT_PARAMETERS).select_move(board, moves, True).grid2 == "8"
+    assert Casper().select_move(board, moves, True).grid2 == "8"
+
+
+def test_parameters_file(tmp_path, monkeypatch):
+    parameters_file = tmp_path / "parametric.json"
+    with open(parameters_file, "w") as fout:
+        json.dump({"parameters": {"capture": -1.0}}, fout)
+    monkeypatch.setenv("ROYAL_GAME_PARAMETRIC", str(parameters_file))
+    player = Parametric()
+    assert player.parameters["capture"] == -1.0
+    assert player.parameters["rosette"] == DEFAULT_PARAMETERS["rosette"]
+    assert Game(player, Dummy()).play() in (True, False)
+    # the file is read once and later instances reuse its parameters
+    parameters_file.unlink()
+    assert Parametric().parameters == player.parameters
+
+
+def test_common_random_numbers():
+    defaults = list(DEFAULT_PARAMETERS.values())
+    random.seed(0)
+    first = candidate_fitness(defaults, [Dummy], 122138132480, 5, "seed")
+    random.seed(1)
+    assert candidate_fitness(defaults, [Dummy], 122138132480, 5, "seed") == first
+
+
+def test_next_population_keeps_elite():
+    population = np.arange(12, dtype=float).reshape(4, 3)
+    fitnesses = np.array([0.1, 0.9, 0.5, 0.2])
+    children = next_population(population, fitnesses, np.random.default_rng(0), 2, 1.0)
+    assert children.shape == population.shape
+    assert children[:2].tolist() == [population[1].tolist(), population[2].tolist()]
+
+
+def test_resume_matches_uninterrupted_run(tmp_path):
+    settings = dict(population_size=4, num_games=2, num_elite=1, run_seed=3, processes=1)
+    full = tune([Dummy], 2, checkpoint_file=tmp_path / "full.json", **settings)
+
+    tune([Dummy], 1, checkpoint_file=tmp_path / "resumed.json", **settings)
+    assert TunerState.load(tmp_path / "resumed.json").generation == 0
+    resumed = tune(
+        [Dummy], 1, checkpoint_file=tmp_path / "resumed.json", resume=True, processes=1
+    )
+    assert resumed.generation == full.generation == 1
+    assert resumed.population == full.population
+    assert resumed.fitnesses == full.fitnesses
+
+    with pytest.raises(OpponentMismatch, match="tuned against Dummy"):
+        tune([Rng], 1, checkpoint_file=tmp_path / "resumed.json", resume=True, processes=1)
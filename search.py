@@ -0,0 +1,151 @@
+"""
+CLI for searching large position suites with batched expectimax.
+
+Roots are searched a batch at a time as documented in
+royal_game.modules.batch_search, so the per-node cost is a handful of
+array operations rather than Python calls.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
+from itertools import chain
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+import click
+import numpy as np
+
+from royal_game.modules.batch_search import expectimax
+from royal_game.modules.regret import reference_table, table_key
+from royal_game.modules.seed_files import SeedReader
+from royal_game.modules.selfplay import ordered_results
+from royal_game.modules.shared_table import install_handles, publish, published_handles
+from royal_game.modules.value_network import ValueNetwork
+
+logging.basicConfig(format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def load_evaluator(
+    weights: Optional[Path], values: Optional[Path]
+) -> Callable[[np.ndarray], np.ndarray]:
+    """Return the leaf evaluator, the value table if given and the value network otherwise."""
+    if values is not None:
+        return reference_table(values).values
+    return ValueNetwork.load(weights).evaluate
+
+
+def search_block(
+    roots: np.ndarray, depth: int, weights: Optional[Path], values: Optional[Path]
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Search a block of white-to-move roots and return them with their values and moves."""
+    root_values, moves = expectimax(roots, depth, load_evaluator(weights, values))
+    return roots, root_values, moves
+
+
+def batches(reader: SeedReader, batch_size: int) -> Iterator[np.ndarray]:
+    """Yield the seeds of a reader in arrays of batch_size seeds."""
+    pending, num_pending = [], 0
+    for block in reader:
+        pending.append(block)
+        num_pending += len(block)
+        while num_pending >= batch_size:
+            seeds = np.concatenate(pending)
+            yield seeds[:batch_size]
+            pending, num_pending = [seeds[batch_size:]], num_pending - batch_size
+    if num_pending:
+        yield np.concatenate(pending)
+
+
+@click.command()
+@click.argument("seed_file", type=click.Path(exists=True, path_type=Path))
+@click.option("-o", "--output", required=True, type=click.Path(dir_okay=False, path_type=Path))
+@click.option(
+    "-d",
+    "--depth",
+    default=2,
+    type=click.IntRange(min=0),
+    help="Number of dice rolls to search.",
+)
+@click.option(
+    "-w",
+    "--weights",
+    default="td_lambda.npz",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Value network weights written by train_td.py that score the leaves.",
+)
+@click.option(
+    "-v",
+    "--values",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Score the leaves with a value table written by regret.py solve instead.",
+)
+@click.option("--batch-size", default=1024, type=int, help="Number of roots searched at once.")
+@click.option("-j", "--processes", default=1, type=int, help="Number of worker processes.")
+def main(
+    seed_file: Path,
+    output: Path,
+    depth: int,
+    weights: Path,
+    values: Optional[Path],
+    batch_size: int,
+    processes: int,
+):
+    """
+    Search every seed in SEED_FILE with white to move and write its value and best moves.
+
+    SEED_FILE holds one decimal seed per line, or little-endian uint64 seeds
+    if its name ends in .bin or .u64, and invalid seeds are skipped. Each
+    line of the output holds a seed, the win probability of white and the
+    path position (see Move.path_position) of the best move for each dice
+    roll of 1-4, or -1 if the roll has no move.
+    """
+    logger.setLevel(logging.INFO)
+    if values is None and not weights.exists():
+        raise click.BadParameter(f"{weights} does not exist.", param_hint="--weights")
+
+    start = time.perf_counter()
+    reader = SeedReader(seed_file)
+    tasks = ((roots, depth, weights, values) for roots in batches(reader, batch_size))
+    num_roots = 0
+    processes = processes or os.cpu_count() or 1
+    with open(output, "w") as fout, ExitStack() as stack:
+        if processes == 1:
+            results = (search_block(*task) for task in tasks)
+        else:
+            if values is not None:
+                # workers attach to the table instead of each loading a copy
+                shared = stack.enter_context(reference_table(values).share())
+                publish(table_key(values), shared)
+            executor = stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers=processes,
+                    initializer=install_handles,
+                    initargs=(published_handles(),),
+                )
+            )
+            results = ordered_results(executor, search_block, tasks, 2 * processes)
+
+        for roots, root_values, moves in results:
+            for seed, value, row in zip(roots.tolist(), root_values.tolist(), moves.tolist()):
+                fout.write(" ".join(map(str, chain((seed, f"{value:.6f}"), row))) + "\n")
+            num_roots += len(roots)
+
+    if reader.invalid:
+        logger.warning("Skipped %d invalid seeds or lines.", reader.invalid)
+    logger.info(
+        "Searched %d roots %d rolls deep in %.1f sec.",
+        num_roots,
+        depth,
+        time.perf_counter() - start,
+    )
+
+
+if __name__ == "__main__":
+    main()
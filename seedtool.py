@@ -0,0 +1,234 @@
+"""
+Sort, deduplicate, combine and sample seed files larger than memory.
+
+Seed files hold one decimal seed per line, or little-endian uint64 seeds if
+their name ends in .bin or .u64, and every command reads and writes either
+format. Memory use is bounded by --run-size seeds per worker.
+"""
+
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+import click
+import numpy as np
+
+from royal_game.modules.seed_files import (
+    RUN_SIZE,
+    SeedReader,
+    SeedWriter,
+    aligned_blocks,
+    difference,
+    intersection,
+    merge,
+    sample,
+    sort_runs,
+    sorted_stream,
+    union,
+)
+
+logging.basicConfig(format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def common_options(command: Callable) -> Callable:
+    """Add the options shared by every command."""
+    for option in reversed(
+        (
+            click.option(
+                "-o", "--output", required=True, type=click.Path(dir_okay=False, path_type=Path)
+            ),
+            click.option(
+                "-j",
+                "--workers",
+                default=1,
+                type=int,
+                help="Number of worker processes to sort in, 0 for one per CPU.",
+            ),
+            click.option(
+                "-m",
+                "--run-size",
+                default=RUN_SIZE,
+                type=click.IntRange(min=1),
+                help="Number of seeds sorted in memory at a time by each worker.",
+            ),
+            click.option(
+                "--temp-dir",
+                default=None,
+                type=click.Path(file_okay=False, path_type=Path),
+                help="Directory for sorted runs, defaults to the output's directory.",
+            ),
+            click.option(
+                "--verify/--no-verify",
+                default=True,
+                help="Skip seeds the Board constructor would reject.",
+            ),
+        )
+    ):
+        command = option(command)
+    return command
+
+
+presorted_option = click.option(
+    "--presorted",
+    is_flag=True,
+    help="Inputs are already sorted and free of duplicates, stream them without sorting.",
+)
+
+
+@contextmanager
+def workspace(
+    output: Path, temp_dir: Optional[Path], workers: int
+) -> Iterator[tuple[Path, Optional[ProcessPoolExecutor]]]:
+    """Yield a temporary directory and, for more than one worker, a process pool."""
+    workers = workers or os.cpu_count() or 1
+    with ExitStack() as stack:
+        temp_path = stack.enter_context(
+            tempfile.TemporaryDirectory(dir=temp_dir or output.parent, prefix="seedtool-")
+        )
+        executor = (
+            stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            if workers > 1
+            else None
+        )
+        yield Path(temp_path), executor
+
+
+def write_output(output: Path, blocks: Iterable[np.ndarray], invalid: int) -> None:
+    """Write the blocks to the output file and report the counts."""
+    with SeedWriter(output) as writer:
+        for block in blocks:
+            writer.write(block)
+    if invalid:
+        logger.warning("Skipped %d invalid seeds or lines.", invalid)
+    logger.info("Wrote %d seeds to %s.", writer.count, output)
+
+
+def external_sort(
+    inputs: Iterable[Path],
+    output: Path,
+    unique: bool,
+    workers: int,
+    run_size: int,
+    temp_dir: Optional[Path],
+    verify: bool,
+) -> None:
+    """Sort the seeds of every input into output."""
+    with workspace(output, temp_dir, workers) as (temp_path, executor):
+        runs, invalid = sort_runs(inputs, temp_path, run_size, unique, verify, executor)
+        write_output(output, merge(runs, temp_path, unique), invalid)
+
+
+def combine(
+    operation: Callable[[Iterable[list[np.ndarray]]], Iterator[np.ndarray]],
+    inputs: Iterable[Path],
+    output: Path,
+    presorted: bool,
+    workers: int,
+    run_size: int,
+    temp_dir: Optional[Path],
+    verify: bool,
+) -> None:
+    """Apply a set operation to the distinct sorted seeds of the inputs."""
+    with workspace(output, temp_dir, workers) as (temp_path, executor):
+        streams, invalid = [], 0
+        for path in inputs:
+            stream, skipped = sorted_stream(
+                path, temp_path, presorted, run_size, verify, executor
+            )
+            streams.append(stream)
+            invalid += skipped
+        blocks = operation(aligned_blocks(streams))
+        try:
+            write_output(output, blocks, invalid)
+        except ValueError as e:
+            output.unlink()
+            raise click.ClickException(str(e)) from e
+
+
+@click.group()
+def main():
+    """Operate on seed files in bounded memory."""
+    logger.setLevel(logging.INFO)
+
+
+@main.command("sort")
+@click.argument("inputs", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
+@click.option("-u", "--unique", is_flag=True, help="Drop duplicate seeds.")
+@common_options
+def sort_command(inputs: tuple[Path, ...], unique: bool, **options):
+    """Sort the seeds of all inputs in ascending order."""
+    external_sort(inputs, unique=unique, **options)
+
+
+@main.command()
+@click.argument("inputs", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
+@common_options
+def dedupe(inputs: tuple[Path, ...], **options):
+    """Write the distinct seeds of all inputs in ascending order."""
+    external_sort(inputs, unique=True, **options)
+
+
+@main.command("union")
+@click.argument("inputs", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
+@presorted_option
+@common_options
+def union_command(inputs: tuple[Path, ...], presorted: bool, **options):
+    """Write the seeds in any of the inputs."""
+    if presorted:
+        combine(union, inputs, presorted=True, **options)
+    else:
+        # sorting all inputs together skips merging each of them separately
+        external_sort(inputs, unique=True, **options)
+
+
+@main.command()
+@click.argument("inputs", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
+@presorted_option
+@common_options
+def intersect(inputs: tuple[Path, ...], presorted: bool, **options):
+    """Write the seeds in all of the inputs."""
+    combine(intersection, inputs, presorted=presorted, **options)
+
+
+@main.command()
+@click.argument("first", type=click.Path(exists=True, path_type=Path))
+@click.argument("others", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
+@presorted_option
+@common_options
+def diff(first: Path, others: tuple[Path, ...], presorted: bool, **options):
+    """Write the seeds of FIRST that are in none of OTHERS."""
+    combine(difference, (first, *others), presorted=presorted, **options)
+
+
+@main.command("sample")
+@click.argument("input_file", type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "-n", "--num-seeds", required=True, type=click.IntRange(min=1), help="Sample size."
+)
+@click.option("-r", "--random-seed", default=None, type=int)
+@click.option("-o", "--output", required=True, type=click.Path(dir_okay=False, path_type=Path))
+@click.option(
+    "--verify/--no-verify", default=True, help="Skip seeds the Board constructor would reject."
+)
+def sample_command(
+    input_file: Path, num_seeds: int, random_seed: Optional[int], output: Path, verify: bool
+):
+    """
+    Write a uniform random sample of the seeds of INPUT_FILE in ascending order.
+
+    Duplicate seeds are sampled as often as they appear.
+    """
+    reader = SeedReader(input_file, verify=verify)
+    seeds = sample(reader, num_seeds, np.random.default_rng(random_seed))
+    if len(seeds) < num_seeds:
+        logger.warning("%s only holds %d seeds.", input_file, len(seeds))
+    write_output(output, [seeds], reader.invalid)
+
+
+if __name__ == "__main__":
+    main()
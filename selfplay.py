@@ -0,0 +1,89 @@
+"""
+CLI for generating self-play training data.
+
+Samples are written as fixed-size binary shards whose layout is documented
+in royal_game.modules.selfplay.
+"""
+
+import logging
+import random
+from itertools import permutations
+from pathlib import Path
+from typing import Iterable, Optional
+
+import click
+
+from royal_game.modules.registry import load_player
+from royal_game.modules.selfplay import generate
+
+logging.basicConfig(format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+
+@click.command()
+@click.argument("players", nargs=-1, required=True)
+@click.option(
+    "-o", "--out-dir", required=True, type=click.Path(file_okay=False, path_type=Path)
+)
+@click.option("-n", "--num-games", default=1000, type=int, help="Number of games to play.")
+@click.option(
+    "-s",
+    "--board-seed",
+    default=122138132480,
+    type=int,
+    help="Use a non-default initial board.",
+)
+@click.option(
+    "-r",
+    "--random-seed",
+    default=None,
+    type=int,
+    help="Optionally set a random seed for reproducible shards.",
+)
+@click.option(
+    "-p",
+    "--self-play",
+    is_flag=True,
+    help="Also pair every player with itself when more than one player is given.",
+)
+@click.option("--shard-size", default=1 << 20, type=int, help="Number of samples per shard.")
+@click.option("--chunk-size", default=100, type=int, help="Number of games per worker task.")
+@click.option("-j", "--processes", default=None, type=int, help="Number of worker processes.")
+def main(
+    players: Iterable[str],
+    out_dir: Path,
+    num_games: int,
+    board_seed: int,
+    random_seed: Optional[int],
+    self_play: bool,
+    shard_size: int,
+    chunk_size: int,
+    processes: Optional[int],
+):
+    """
+    Play games between PLAYERS and write one sample per selected move to OUT_DIR.
+
+    A single player plays against itself. With several players, games cycle
+    through every ordered pair of distinct players.
+    """
+    player_classes = [load_player(player) for player in players]
+    pairings = list(permutations(player_classes, 2))
+    if self_play or len(player_classes) == 1:
+        pairings += [(player, player) for player in player_classes]
+    if random_seed is None:
+        random_seed = random.randrange(2**32)
+
+    generate(
+        pairings,
+        out_dir,
+        num_games,
+        random_seed,
+        board_seed=board_seed,
+        shard_size=shard_size,
+        chunk_size=chunk_size,
+        processes=processes,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""CLI for rebuilding tournament summaries from a results file written by tournament.py."""
+
+from collections import defaultdict
+from pathlib import Path
+
+import click
+
+from royal_game.modules.results import (
+    WinMatrix,
+    output_paired_results,
+    output_results,
+    read_results,
+)
+
+
+@click.command()
+@click.argument("results_file", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--paired",
+    is_flag=True,
+    help="Also print paired intervals, for results of a tournament.py --paired run.",
+)
+def main(results_file: Path, paired: bool):
+    """Summarize the games in RESULTS_FILE, streaming it in constant memory."""
+    matrix = WinMatrix()
+    # per player: games, plies, captures, seconds
+    totals = defaultdict(lambda: [0, 0, 0, 0.0])
+    for result in read_results(results_file):
+        matrix.add(result)
+        for name in {result.white, result.black}:
+            player_totals = totals[name]
+            player_totals[0] += 1
+            player_totals[1] += result.plies
+            player_totals[2] += result.captures
+            player_totals[3] += result.duration
+
+    if not matrix.total_games:
+        click.echo(f"{results_file} contains no games.")
+        return
+
+    output_results(matrix)
+    if paired:
+        output_paired_results(matrix.intervals(), matrix.self_play)
+
+    print(f"{'GAME STATISTICS':_^120}")
+    columns = ["games", "plies/game", "captures/game", "ms/game"]
+    print("".join(f"{column:^20}" for column in [""] + columns))
+    for name in matrix.names:
+        games, plies, captures, seconds = totals[name]
+        print(
+            f"{name:^20}{games:^20}{plies / games:^20.1f}{captures / games:^20.2f}"
+            f"{1000 * seconds / games:^20.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import io
+
+import numpy as np
+
+from dev_display import UNPARSABLE, bulk_display, parse_chunk, render_seed
+from royal_game.modules.board import Board
+from royal_game.modules.state_space import SeedError, Shard, shard_array
+
+
+def test_render_seed():
+    for shard in (Shard(3, 3, 1, 3, 2, 2), Shard(0, 0, 7, 0, 7, 0), Shard(2, 1, 3, 2, 0, 6)):
+        for seed in shard_array(shard)[::97].tolist():
+            assert render_seed(seed) == repr(Board(seed))
+    # boards with the wrong number of pieces are drawn as well
+    seed = 122138132480 ^ 1
+    assert render_seed(seed) == repr(Board(seed, no_verify=True))
+
+
+def test_parse_chunk():
+    lines = ["5\n", "\n", "abc\n", "-4\n", f"{2**64}\n", " 7 \n"]
+    indices, seeds, codes = parse_chunk(lines, decimal=True)
+    assert indices.tolist() == [0, 2, 3, 4, 5]
+    assert seeds.tolist()[0] == 5 and seeds.tolist()[-1] == 7
+    assert codes.tolist() == [0, UNPARSABLE, SeedError.out_of_range, SeedError.out_of_range, 0]
+
+    indices, seeds, codes = parse_chunk(["101\n", "12\n"], decimal=False)
+    assert seeds.tolist()[0] == 5
+    assert codes.tolist() == [0, UNPARSABLE]
+
+
+def test_bulk_display():
+    seeds = shard_array(Shard(3, 3, 1, 3, 2, 2))[:1000].tolist()
+    lines = [str(seed) for seed in seeds]
+    lines[3] = str(seeds[3] ^ 1)
+    lines[5] = "abc"
+    lines[7] = str(seeds[7] | (0b11 << 12))
+    lines[9] = str(seeds[9] ^ 1)
+    fin = io.StringIO("\n".join(lines) + "\n\n")
+
+    out = io.StringIO()
+    counts = bulk_display(fin, True, "invalid", 1.0, None, 10, 4, np.random.default_rng(0), out)
+    assert counts == {"valid": 996, "invalid_grid": 1, "white_pieces": 2, "unparsable": 1}
+    text = out.getvalue()
+    # both boards with an extra white piece are drawn, the others cannot be
+    assert text.count("(line") == 2
+    assert f"{seeds[3] ^ 1} (line 4, white_pieces):\n{render_seed(seeds[3] ^ 1)}" in text
+    assert "white_pieces               2  lines 4, 10\n" in text
+    assert "unparsable                 1  lines 6\n" in text
+
+    out = io.StringIO()
+    fin.seek(0)
+    bulk_display(fin, True, "valid", 1.0, 3, 1, 64, np.random.default_rng(0), out)
+    assert out.getvalue().count("(line") == 3
+    assert "white_pieces               2  lines 4, ...\n" in out.getvalue()
@@ -6,48 +6,218 @@ against each other pairwise.
 """
 
 import logging
+import os
 import random
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
 from itertools import combinations, combinations_with_replacement
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Optional
 
 import click
 
-from royal_game.modules.game import Game
+from royal_game._exceptions import PlayerNotFound, StateLimitExceeded
+from royal_game.modules.checkpoint import CompletedGames, TournamentCheckpoint
+from royal_game.modules.game import Game, configure_game_log
+from royal_game.modules.move_cache import MoveCache
+from royal_game.modules.player import Player
+from royal_game.modules.registry import discover_players, filename_to_class_name, load_player
+from royal_game.modules.results import (
+    GameResult,
+    ResultWriter,
+    WinMatrix,
+    output_exact_results,
+    output_paired_results,
+    output_results,
+    output_stratum_results,
+    read_results,
+)
+from royal_game.modules.scheduler import Scheduler, run_scheduled
+
+# modules only some modes need are imported where they are used, which keeps
+# startup fast, and only for annotations here
+if TYPE_CHECKING:
+    from royal_game.modules.metrics import Histogram
+    from royal_game.modules.profiling import Profile, Sampler
+    from royal_game.modules.shared_table import TableHandle
+    from royal_game.modules.suite import Suite
 
 logging.basicConfig(format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
+# every process keeps one move cache shared by all the games it plays
+_move_cache: Optional[MoveCache] = None
 
-def filename_to_class_name(filename: str) -> str:
-    """Convert snake class filename to capitalized camel case class name."""
-    return "".join([word.capitalize() for word in filename.split("_")])
 
+def output_profile(profile: "Profile", top: int) -> None:
+    """Print the CPU time of every subsystem and of the functions that take the most."""
+    total = max(profile.num_samples, 1)
+    print(f"{'PROFILE BY SUBSYSTEM':_^120}")
+    print(f"{'':<40}" + "".join(f"{column:^20}" for column in ("samples", "cpu sec", "share")))
+    for name, samples in profile.subsystems.most_common():
+        print(
+            f"{name:<40}{samples:^20}{profile.seconds(samples):^20.2f}{samples / total:^20.1%}"
+        )
 
-def output_results(num_wins: defaultdict, num_games: int, self_play: bool) -> None:
-    """Format tournament results nicely."""
-    print(f"{'TOURNAMENT RESULTS':_^120}")
-    player_names = list(num_wins.keys())
+    for title, counts in (
+        ("SELF TIME", profile.self_samples()),
+        ("TOTAL TIME", profile.total_samples()),
+    ):
+        print(f"{f'TOP {top} FUNCTIONS BY {title}':_^120}")
+        for label, samples in counts.most_common(top):
+            print(f"{samples:>10}{samples / total:>10.1%}  {label}")
 
-    # list player names in the top row of the table
-    print("".join([f"{name:^20}" for name in ([""] + player_names)]))
+    if profile.peak_memory:
+        print(f"{f'TOP {top} ALLOCATION SITES HELD AFTER A CHUNK':_^120}")
+        for site, size in profile.allocations.most_common(top):
+            print(f"{size / 1024:>10.1f} KiB  {site}")
+        print(f"Peak traced memory of a chunk {profile.peak_memory / 2**20:.1f} MiB")
 
-    for name1 in player_names:
-        # list player names in the first column of the table
-        # for a scoring matrix look
-        table_row = f"{name1:^20}"
-        for name2 in player_names:
-            if name1 == name2 and not self_play:
-                table_row += f"{'/':^20}"
-            else:
-                win_percentage = f"{num_wins[name1][name2]}/{num_games}"
-                table_row += f"{win_percentage:^20}"
-        print(table_row)
+
+def init_worker(
+    move_cache_size: int,
+    full_output: bool = False,
+    tables: Optional[dict[str, "TableHandle"]] = None,
+) -> None:
+    """Set up the move cache, game log and shared tables of a process that plays games."""
+    global _move_cache
+    if tables:
+        from royal_game.modules.shared_table import install_handles
+
+        install_handles(tables)
+    _move_cache = MoveCache(move_cache_size) if move_cache_size > 0 else None
+    if full_output:
+        configure_game_log(f"games-{os.getpid()}.log")
+
+
+class ChunkResult(NamedTuple):
+    """What a worker reports about a chunk of games."""
+
+    results: list[GameResult]
+    cache_hits: int
+    cache_misses: int
+    # by player name, empty unless decision times are recorded
+    decision_seconds: dict[str, "Histogram"]
+    # None unless the run is profiled
+    profile: Optional["Profile"] = None
+
+
+def play_pairing(
+    pairings: list[tuple[type[Player], type[Player]]],
+    board_seed: int,
+    suite: Optional["Suite"],
+    run_seed: int,
+    paired: bool,
+    record_decision_times: bool,
+    sampler: Optional["Sampler"],
+    segments: list[tuple[int, range]],
+    job: int,
+    games: range,
+) -> ChunkResult:
+    """
+    Play games of one pairing.
+
+    segments[job] is the pairing index and the range of its games that the
+    scheduler job covers, and games are relative to the start of that range.
+
+    Even games have the first player of the pairing as white, and odd games
+    are their color-swapped twins. Each game is seeded from the run seed,
+    the pairing and the game index, so results do not depend on how games
+    are split across workers. With a suite, each twin pair starts from the
+    position the suite assigns to it instead of board_seed. With a sampler,
+    the chunk is profiled and the profile is reported with its results.
+    """
+    if record_decision_times:
+        from royal_game.modules.metrics import Histogram
+
+    index, segment = segments[job]
+    player1, player2 = pairings[index]
+    hits, misses = (_move_cache.hits, _move_cache.misses) if _move_cache else (0, 0)
+    results = []
+    decision_seconds: dict[str, "Histogram"] = {}
+    with sampler.record() if sampler is not None else nullcontext() as profile:
+        for i in segment[games.start : games.stop]:
+            white_player, black_player = (
+                (player1, player2) if i % 2 == 0 else (player2, player1)
+            )
+            seed = f"{run_seed}:{index}:{i}"
+            random.seed(seed)
+            # with --paired, twins in every pairing roll dice from the same seed
+            dice_rng = random.Random(f"{run_seed}:dice:{i // 2}") if paired else None
+            game = Game(
+                white_player(),
+                black_player(),
+                board_seed if suite is None else suite.board_seed(run_seed, i),
+                _move_cache,
+                dice_rng=dice_rng,
+                record_decision_times=record_decision_times,
+            )
+            start = time.perf_counter()
+            white_won = game.play()
+            if record_decision_times:
+                for player, times in zip((game.player1, game.player2), game.decision_times):
+                    decision_seconds.setdefault(str(player), Histogram()).observe(times)
+            results.append(
+                GameResult(
+                    index,
+                    i,
+                    str(game.player1),
+                    str(game.player2),
+                    seed,
+                    white_won,
+                    game.plies,
+                    game.captures,
+                    time.perf_counter() - start,
+                )
+            )
+    if _move_cache is None:
+        return ChunkResult(results, 0, 0, decision_seconds, profile)
+    return ChunkResult(
+        results, _move_cache.hits - hits, _move_cache.misses - misses, decision_seconds, profile
+    )
+
+
+def run_exact(
+    player_classes: list, board_seed: int, self_play: bool, max_states: Optional[int]
+) -> None:
+    """Solve every pairing exactly, weighting both color assignments equally."""
+    from royal_game.modules.markov import evaluate_exact
+
+    win_probability = defaultdict(dict)
+    iterator = (
+        combinations(player_classes, 2)
+        if not self_play
+        else combinations_with_replacement(player_classes, 2)
+    )
+    for player1, player2 in iterator:
+        first = evaluate_exact(player1(), player2(), board_seed, max_states)
+        name1, name2 = str(player1()), str(player2())
+        logger.info(
+            "%s vs %s: %d states, expected length %.2f rolls.",
+            name1,
+            name2,
+            first.num_states,
+            first.expected_length,
+        )
+        if player1 == player2:
+            # only report white wins in self-play
+            win_probability[name1][name2] = first.white_win_probability
+            continue
+
+        second = evaluate_exact(player2(), player1(), board_seed, max_states)
+        win_probability[name1][name2] = (
+            first.white_win_probability + 1 - second.white_win_probability
+        ) / 2
+        win_probability[name2][name1] = 1 - win_probability[name1][name2]
+
+    output_exact_results(win_probability, self_play)
 
 
 @click.command()
-@click.argument("players", nargs=-1, type=click.Path(exists=True, path_type=Path))
+@click.argument("players", nargs=-1)
 @click.option(
     "-n",
     "--num-games",
@@ -65,6 +235,16 @@ def output_results(num_wins: defaultdict, num_games: int, self_play: bool) -> No
         "Board representation layout is documented in royal_game.modules.board."
     ),
 )
+@click.option(
+    "--suite",
+    "suite_file",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help=(
+        "Start games from the positions of a suite file instead of one board and report "
+        "win rates per stratum. The layout is documented in royal_game.modules.suite."
+    ),
+)
 @click.option("-b", "--binary-seed", is_flag=True, help="Interpret the seed argument as binary")
 @click.option(
     "-r",
@@ -74,68 +254,393 @@ def output_results(num_wins: defaultdict, num_games: int, self_play: bool) -> No
     help="Optionally set a random seed for reproducibility.",
 )
 @click.option("-p", "--self-play", is_flag=True)
+@click.option(
+    "-c",
+    "--move-cache-size",
+    default=0,
+    type=int,
+    help="Memoize move generation in an LRU cache of this many entries (0 to disable).",
+)
+@click.option(
+    "-e",
+    "--exact",
+    is_flag=True,
+    help=(
+        "Solve each pairing exactly as a Markov chain instead of sampling games. "
+        "Requires players with deterministic or explicitly stochastic move selection."
+    ),
+)
+@click.option(
+    "--max-states",
+    default=200_000,
+    type=click.IntRange(min=1),
+    help=(
+        "Abort exact evaluation of a pairing once more states than this are reachable. "
+        "Full games from the initial board reach millions of states."
+    ),
+)
+@click.option(
+    "--paired",
+    is_flag=True,
+    help=(
+        "Give every game a color-swapped twin rolling the same dice, and reuse the same "
+        "dice across all pairings to reduce the variance of win rates."
+    ),
+)
 @click.option(
     "-f",
     "--full-output",
     is_flag=True,
     help="Enable saving full debug output to games.log in addition to summary statistics",
 )
+@click.option(
+    "-o",
+    "--results-file",
+    default=None,
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Append the result of every game to this CSV file as games finish.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Continue the interrupted run that was writing to --results-file.",
+)
+@click.option(
+    "--checkpoint-every",
+    default=60.0,
+    type=float,
+    help="Seconds between checkpoints of runs with a results file.",
+)
+@click.option(
+    "--metrics-port",
+    default=None,
+    type=int,
+    help="Serve live metrics in the Prometheus text format at localhost:PORT/metrics.",
+)
+@click.option(
+    "-j",
+    "--workers",
+    default=1,
+    type=int,
+    help="Number of worker processes to play games in, 0 for one per CPU.",
+)
+@click.option(
+    "--profile",
+    "profile_file",
+    default=None,
+    type=click.Path(dir_okay=False, path_type=Path),
+    help=(
+        "Profile every worker, write the merged stacks to this file in the collapsed "
+        "format of flame graph tools and print where the time went."
+    ),
+)
+@click.option(
+    "--profile-interval",
+    default=0.001,
+    type=click.FloatRange(min=1e-4),
+    help="Seconds of CPU time between profiler samples.",
+)
+@click.option(
+    "--profile-memory",
+    is_flag=True,
+    help="Also trace allocations with tracemalloc while profiling, which slows games down.",
+)
+@click.option(
+    "--profile-top",
+    default=20,
+    type=int,
+    help="Number of functions and allocation sites in the profile summary.",
+)
+@click.option("-l", "--list-players", is_flag=True, help="List the available players and exit.")
 def main(
-    players: Iterable[Path],
+    players: Iterable[str],
     num_games: int,
     board_seed: int,
+    suite_file: Optional[Path],
     binary_seed: bool,
     random_seed: int,
     self_play: bool,
+    move_cache_size: int,
+    exact: bool,
+    max_states: int,
+    paired: bool,
     full_output: bool,
+    results_file: Optional[Path],
+    resume: bool,
+    checkpoint_every: float,
+    metrics_port: Optional[int],
+    workers: int,
+    profile_file: Optional[Path],
+    profile_interval: float,
+    profile_memory: bool,
+    profile_top: int,
+    list_players: bool,
 ):
-    """Implement tournament runner."""
-    if not full_output:
-        logging.getLogger("royal_game.modules.game").setLevel(logging.INFO)
+    """
+    Implement tournament runner.
+
+    PLAYERS are player names or files in royal_game/players, or
+    module:Class for players defined elsewhere.
+    """
+    logger.setLevel(logging.INFO)
+    if list_players:
+        for name, spec in sorted(discover_players().items()):
+            print(f"{name:<20}{spec.module}:{spec.class_name}")
+        return
     if binary_seed:
         board_seed = int(str(board_seed), 2)
-    if random_seed is not None:
-        random.seed(random_seed)
+    if paired and num_games % 2:
+        raise click.BadParameter("must be even with --paired.", param_hint="--num-games")
+    if profile_memory and profile_file is None:
+        raise click.BadParameter("requires --profile.", param_hint="--profile-memory")
+    if profile_file is not None:
+        from royal_game.modules.profiling import Profile, Sampler, is_supported
+
+        if not is_supported():
+            raise click.UsageError(
+                "--profile needs signal.setitimer, which this platform lacks."
+            )
+    if exact and suite_file is not None:
+        raise click.UsageError("--suite cannot be combined with --exact.")
+    suite = None
+    if suite_file is not None:
+        from royal_game.modules.suite import load_suite
+
+        try:
+            suite = load_suite(suite_file)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--suite")
+    # every game is seeded from the run seed, see play_pairing
+    run_seed = random.randrange(2**32) if random_seed is None else random_seed
+
+    checkpoint = None
+    checkpoint_file = None
+    if results_file is not None:
+        checkpoint_file = results_file.with_name(results_file.name + ".checkpoint")
+    if resume:
+        if checkpoint_file is None or not checkpoint_file.exists():
+            raise click.BadParameter(
+                "requires --results-file of a run with a checkpoint.", param_hint="--resume"
+            )
+        checkpoint = TournamentCheckpoint.load(checkpoint_file)
+        # the interrupted run's settings take precedence over the command line
+        players, num_games, board_seed, run_seed, paired, self_play = (
+            checkpoint.settings[key]
+            for key in ("players", "num_games", "board_seed", "run_seed", "paired", "self_play")
+        )
+        # checkpoints of runs from before suites have no suite
+        suite_rows = checkpoint.settings.get("suite")
+        suite = None
+        if suite_rows:
+            from royal_game.modules.suite import Suite
+
+            suite = Suite.from_rows(suite_rows)
+    settings = {
+        "players": list(players),
+        "num_games": num_games,
+        "board_seed": board_seed,
+        "run_seed": run_seed,
+        "paired": paired,
+        "self_play": self_play,
+        "suite": suite.to_rows() if suite is not None else None,
+    }
 
     player_classes = []
     for player in players:
         try:
-            exec(
-                (
-                    f"from royal_game.players.{player.stem} import "
-                    f"{filename_to_class_name(player.stem)}"
-                )
-            )
-            player_classes.append(eval(filename_to_class_name(player.stem)))
-        except ImportError:
-            logger.critical("Unable to import from %s.", player.stem)
+            player_classes.append(load_player(player))
+        except PlayerNotFound as e:
+            logger.critical("%s", e)
             logger.info(
-                "Your player subclass should be named %s.", filename_to_class_name(player.stem)
+                "Your player subclass should be named %s.",
+                filename_to_class_name(Path(player).stem),
             )
 
-    num_wins = defaultdict(lambda: defaultdict(int))
+    # loaded once here and attached to by every worker, see Player.share_tables
+    tables = {}
+    if any(
+        player_class.share_tables.__func__ is not Player.share_tables.__func__
+        for player_class in player_classes
+    ):
+        from royal_game.modules.shared_table import published_handles, share_player_tables
+
+        share_player_tables(player_classes)
+        tables = published_handles()
+
+    if exact:
+        try:
+            run_exact(player_classes, board_seed, self_play, max_states)
+        except StateLimitExceeded as e:
+            raise click.ClickException(f"{e} Raise --max-states or start from a later board.")
+        return
+
     iterator = (
         combinations(player_classes, 2)
         if not self_play
         else combinations_with_replacement(player_classes, 2)
     )
-    for player1, player2 in iterator:
-        for i in range(num_games):
-            white_player, black_player = player1, player2
-            if i >= num_games // 2:
-                white_player, black_player = player2, player1
-
-            game = Game(white_player(), black_player(), board_seed)
-            if game.play():
-                # white wins
-                num_wins[str(game.player1)][str(game.player2)] += 1
+    pairings = list(iterator)
+    names = [str(player()) for player in player_classes]
+    matrix = WinMatrix(names)
+    # win counts from the start positions of every stratum of the suite
+    strata = {}
+    if suite is not None:
+        strata = {stratum: WinMatrix(names) for stratum in suite.stratum_names}
+        logger.info(
+            "Starting games from %d positions: %s.",
+            len(suite),
+            ", ".join(f"{suite.strata.count(name)} {name}" for name in strata),
+        )
+
+    def count(game_result: GameResult) -> None:
+        matrix.add(game_result)
+        if suite is not None:
+            strata[suite.stratum(run_seed, game_result.game)].add(game_result)
+
+    cache_lookups = [0, 0]
+    sampler = None
+    profile = None
+    if profile_file is not None:
+        sampler = Sampler(profile_interval, profile_memory)
+        profile = Profile()
+    writer = None
+    if checkpoint is not None:
+        completed = [CompletedGames(ranges) for ranges in checkpoint.completed]
+        # drop results written after the checkpoint, their games are played again
+        with open(results_file, "r+b") as fout:
+            fout.truncate(checkpoint.results_stop)
+        for game_result in read_results(
+            results_file, checkpoint.results_start, checkpoint.results_stop
+        ):
+            count(game_result)
+        logger.info(
+            "Resuming with %d of %d games completed.",
+            sum(games.count for games in completed),
+            num_games * len(pairings),
+        )
+    else:
+        completed = [CompletedGames() for _ in pairings]
+    if results_file is not None:
+        writer = ResultWriter(results_file)
+        results_start = writer.start if checkpoint is None else checkpoint.results_start
+
+    def save_checkpoint() -> None:
+        writer.flush()
+        TournamentCheckpoint(
+            settings, [games.ranges for games in completed], results_start, writer.offset
+        ).save(checkpoint_file)
+
+    last_checkpoint = time.monotonic()
+
+    def on_result(job: int, games: range, chunk: ChunkResult) -> None:
+        nonlocal last_checkpoint
+        for game_result in chunk.results:
+            count(game_result)
+            if writer is not None:
+                writer.write(game_result)
+        index, segment = segments[job]
+        completed[index].add(segment[games.start : games.stop])
+        cache_lookups[0] += chunk.cache_hits
+        cache_lookups[1] += chunk.cache_misses
+        if profile is not None:
+            profile.merge(chunk.profile)
+        if metrics is not None:
+            metrics.record(chunk.results, chunk.decision_seconds)
+        if writer is not None and time.monotonic() - last_checkpoint > checkpoint_every:
+            save_checkpoint()
+            last_checkpoint = time.monotonic()
+
+    # the games still to play, in one scheduler job per contiguous range
+    segments = [
+        (index, games)
+        for index, pairing_games in enumerate(completed)
+        for games in pairing_games.missing(num_games)
+    ]
+    workers = workers or os.cpu_count() or 1
+    scheduler = Scheduler([len(games) for _, games in segments], workers)
+    fn = partial(
+        play_pairing,
+        pairings,
+        board_seed,
+        suite,
+        run_seed,
+        paired,
+        metrics_port is not None,
+        sampler,
+        segments,
+    )
+    metrics = None
+    server = nullcontext()
+    if metrics_port is not None:
+        from royal_game.modules.metrics import MetricsServer, TournamentMetrics
+
+        metrics = TournamentMetrics(
+            [f"{player1()} vs {player2()}" for player1, player2 in pairings],
+            sum(len(games) for _, games in segments),
+            workers,
+            scheduler.remaining_seconds,
+        )
+        server = MetricsServer(metrics, metrics_port)
+        logger.info("Serving metrics at http://127.0.0.1:%d/metrics.", server.port)
+    start = time.perf_counter()
+    with server:
+        try:
+            if workers == 1:
+                init_worker(move_cache_size)
+                if full_output:
+                    configure_game_log()
+                run_scheduled(fn, scheduler, on_result)
             else:
-                if player1 != player2:
-                    # only log white wins in self-play
-                    # black wins are implied
-                    num_wins[str(game.player2)][str(game.player1)] += 1
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=init_worker,
+                    initargs=(move_cache_size, full_output, tables),
+                ) as executor:
+                    run_scheduled(fn, scheduler, on_result, executor)
+        finally:
+            if writer is not None:
+                # also records the games finished before an interruption
+                save_checkpoint()
+                writer.close()
+    wall_time = time.perf_counter() - start
+
+    for index, (player1, player2) in enumerate(pairings):
+        jobs = [job for job, (i, _) in zip(scheduler.jobs, segments) if i == index]
+        games_done = sum(job.games_done for job in jobs)
+        if games_done:
+            logger.info(
+                "%s vs %s: %.2f ms per game.",
+                player1(),
+                player2(),
+                1000 * sum(job.seconds for job in jobs) / games_done,
+            )
+    total_work = sum(job.seconds for job in scheduler.jobs)
+    logger.info(
+        "%.1f sec of games on %d workers in %.1f sec (%.0f%% of ideal speedup).",
+        total_work,
+        workers,
+        wall_time,
+        100 * total_work / (workers * wall_time) if wall_time else 100,
+    )
 
-    output_results(num_wins, num_games, self_play)
+    output_results(matrix)
+    if strata:
+        output_stratum_results(strata)
+    if paired:
+        output_paired_results(matrix.intervals(), matrix.self_play)
+    if move_cache_size > 0:
+        hits, misses = cache_lookups
+        hit_rate = hits / (hits + misses) if hits + misses else 0.0
+        print(f"Move cache hits={hits}, misses={misses}, hit rate {hit_rate:.1%}")
+    if profile is not None:
+        profile.write_collapsed(profile_file)
+        output_profile(profile, profile_top)
+        logger.info(
+            "Wrote %d samples of %d stacks to %s.",
+            profile.num_samples,
+            len(profile.stacks),
+            profile_file,
+        )
 
 
 if __name__ == "__main__":
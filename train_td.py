@@ -0,0 +1,93 @@
+"""CLI for training the TD(lambda) value network used by royal_game/players/td_lambda.py."""
+
+import logging
+import random
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from royal_game.modules.td_training import train
+from royal_game.modules.value_network import ValueNetwork
+from royal_game.players.td_lambda import DEFAULT_WEIGHTS
+
+logging.basicConfig(format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+
+@click.command()
+@click.option(
+    "-o",
+    "--out-file",
+    default=DEFAULT_WEIGHTS,
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Where to save the weights.",
+)
+@click.option(
+    "-i",
+    "--init-weights",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Continue training from saved weights.",
+)
+@click.option("-n", "--num-rounds", default=100, type=int, help="Number of training rounds.")
+@click.option(
+    "-g", "--games-per-round", default=64, type=int, help="Self-play games per round."
+)
+@click.option("--hidden", default=40, type=int, help="Number of hidden units.")
+@click.option("-l", "--lam", default=0.7, type=float, help="Trace decay parameter lambda.")
+@click.option("-a", "--alpha", default=0.1, type=float, help="Learning rate.")
+@click.option("-e", "--epsilon", default=0.0, type=float, help="Exploration rate.")
+@click.option(
+    "--eval-every", default=10, type=int, help="Rounds between evaluations and checkpoints."
+)
+@click.option("--eval-games", default=200, type=int, help="Games per evaluation opponent.")
+@click.option("-j", "--processes", default=None, type=int, help="Number of worker processes.")
+@click.option(
+    "-r",
+    "--random-seed",
+    default=None,
+    type=int,
+    help="Optionally set a random seed for reproducibility.",
+)
+def main(
+    out_file: Path,
+    init_weights: Optional[Path],
+    num_rounds: int,
+    games_per_round: int,
+    hidden: int,
+    lam: float,
+    alpha: float,
+    epsilon: float,
+    eval_every: int,
+    eval_games: int,
+    processes: Optional[int],
+    random_seed: Optional[int],
+):
+    """Train a value network by self-play and save it for the TD(lambda) player."""
+    logging.getLogger("royal_game.modules.td_training").setLevel(logging.INFO)
+    if random_seed is None:
+        random_seed = random.randrange(2**32)
+
+    if init_weights is not None:
+        network = ValueNetwork.load(init_weights)
+    else:
+        network = ValueNetwork(hidden, random_seed)
+
+    train(
+        network,
+        num_rounds,
+        games_per_round,
+        lam=lam,
+        alpha=alpha,
+        epsilon=epsilon,
+        eval_every=eval_every,
+        eval_games=eval_games,
+        run_seed=random_seed,
+        processes=processes,
+        checkpoint=lambda network: network.save(out_file),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""CLI for tuning the weights of royal_game/players/parametric.py against fixed opponents."""
+
+import json
+import logging
+import random
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from royal_game._exceptions import OpponentMismatch
+from royal_game.modules.registry import load_player
+from royal_game.modules.tuner import tune
+from royal_game.players.parametric import DEFAULT_PARAMETERS_FILE
+
+logging.basicConfig(format="%(levelname)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+
+@click.command()
+@click.argument("opponents", nargs=-1, required=True)
+@click.option(
+    "-o",
+    "--out-file",
+    default=DEFAULT_PARAMETERS_FILE,
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Where to save the best parameters.",
+)
+@click.option(
+    "-c",
+    "--checkpoint-file",
+    default=Path("tune_checkpoint.json"),
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Where to checkpoint the population after every generation.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    default=False,
+    help="Continue from the checkpoint file with the settings it was started with.",
+)
+@click.option(
+    "-g", "--num-generations", default=20, type=int, help="Number of generations to run."
+)
+@click.option(
+    "-p", "--population-size", default=24, type=int, help="Candidates per generation."
+)
+@click.option(
+    "-n",
+    "--num-games",
+    default=100,
+    type=int,
+    help="Games per candidate, opponent and color in each generation.",
+)
+@click.option("--sigma", default=2.0, type=float, help="Standard deviation of mutations.")
+@click.option(
+    "--elite", default=2, type=int, help="Fittest candidates kept unchanged each generation."
+)
+@click.option("-j", "--processes", default=None, type=int, help="Number of worker processes.")
+@click.option(
+    "-r",
+    "--random-seed",
+    default=None,
+    type=int,
+    help="Optionally set a random seed for reproducibility.",
+)
+def main(
+    opponents: tuple[str],
+    out_file: Path,
+    checkpoint_file: Path,
+    resume: bool,
+    num_generations: int,
+    population_size: int,
+    num_games: int,
+    sigma: float,
+    elite: int,
+    processes: Optional[int],
+    random_seed: Optional[int],
+):
+    """Tune the parametric player against OPPONENTS with a genetic algorithm."""
+    logging.getLogger("royal_game.modules.tuner").setLevel(logging.INFO)
+    if resume and not checkpoint_file.exists():
+        raise click.BadParameter(f"{checkpoint_file} does not exist.", param_hint="--resume")
+    if random_seed is None:
+        random_seed = random.randrange(2**32)
+
+    try:
+        state = tune(
+            [load_player(opponent) for opponent in opponents],
+            num_generations,
+            population_size=population_size,
+            num_games=num_games,
+            sigma=sigma,
+            num_elite=elite,
+            run_seed=random_seed,
+            processes=processes,
+            checkpoint_file=checkpoint_file,
+            resume=resume,
+        )
+    except OpponentMismatch as e:
+        raise click.BadParameter(str(e), param_hint="OPPONENTS")
+
+    with open(out_file, "w") as fout:
+        json.dump(
+            {
+                "parameters": state.best_parameters,
+                "win_rate": max(state.fitnesses),
+                "generation": state.generation,
+                "opponents": state.settings["opponents"],
+            },
+            fout,
+            indent=2,
+        )
+    logger.info("Saved the best parameters to %s.", out_file)
+
+
+if __name__ == "__main__":
+    main()